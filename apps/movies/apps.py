@@ -6,3 +6,6 @@ class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.movies'
     verbose_name = 'Movie Management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,193 @@
+"""
+Management command to bootstrap the catalogue from a TMDb daily ID export.
+
+TMDb publishes every movie id daily as gzip-compressed JSON lines
+(``movie_ids_MM_DD_YYYY.json.gz``), one object per line:
+``{"adult": false, "id": 3924, "original_title": "Blondie", "popularity": 2.9, "video": false}``.
+
+The file is streamed line by line — memory stays constant however large
+it is. Movies passing the popularity / adult filters are stored as stubs
+in large bulk batches (existing rows only get their popularity refreshed),
+and the most popular stubs are hydrated with full details afterwards.
+
+Usage:
+    python manage.py import_tmdb_export movie_ids_05_15_2024.json.gz
+    python manage.py import_tmdb_export export.json.gz --min-popularity 5 --hydrate 2000
+    python manage.py import_tmdb_export export.json.gz --defer-hydration   # needs a Celery worker
+    python manage.py import_tmdb_export export.json.gz --hydrate 0         # stubs only
+"""
+import gzip
+import heapq
+import importlib.util
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.movies.models import Movie
+from apps.movies.services.hydration import hydrate_movies, queue_hydration
+
+PROGRESS_EVERY = 100_000
+
+
+class Command(BaseCommand):
+    help = 'Stream a TMDb daily movie ID export into stub movies and hydrate the most popular'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Path to the export file (.json.gz, or plain JSON lines)',
+        )
+        parser.add_argument(
+            '--min-popularity',
+            type=float,
+            default=1.0,
+            help='Skip movies below this popularity (default: 1.0)',
+        )
+        parser.add_argument(
+            '--include-adult',
+            action='store_true',
+            help='Also import movies flagged adult',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk insert (default: 5000)',
+        )
+        parser.add_argument(
+            '--hydrate',
+            type=int,
+            default=1000,
+            help='Fetch full details for the N most popular imported movies (default: 1000)',
+        )
+        parser.add_argument(
+            '--defer-hydration',
+            action='store_true',
+            help='Queue hydration as Celery tasks instead of fetching now '
+                 '(needs Celery installed and a running worker)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.TMDB_FETCH_CONCURRENCY,
+            help=f'Concurrent detail fetches (default: {settings.TMDB_FETCH_CONCURRENCY})',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('🎬 TMDb export import'))
+        if options['defer_hydration'] and importlib.util.find_spec('celery') is None:
+            raise CommandError('--defer-hydration needs Celery; drop it to hydrate inline')
+
+        try:
+            stats, top = self._import(options)
+        except OSError as exc:
+            raise CommandError(f'Cannot read {options["path"]}: {exc}')
+
+        self.stdout.write(
+            f'  Lines: {stats["lines"]} read, {stats["imported"]} imported, '
+            f'{stats["filtered"]} filtered, {stats["invalid"]} invalid'
+        )
+
+        hydrate_ids = self._needs_details(top)
+        if not hydrate_ids:
+            self.stdout.write('  Hydration: nothing to do')
+        elif options['defer_hydration']:
+            tasks = queue_hydration(hydrate_ids)
+            self.stdout.write(f'  Hydration: {len(hydrate_ids)} movies queued in {tasks} tasks')
+        else:
+            stored = hydrate_movies(hydrate_ids, concurrency=options['concurrency'])
+            self.stdout.write(f'  Hydration: details stored for {stored}/{len(hydrate_ids)} movies')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Import complete! DB now has {Movie.objects.count()} movies.'
+        ))
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _import(self, options):
+        """Stream the file, bulk-writing stubs; keep a bounded heap of the most popular."""
+        min_popularity = options['min_popularity']
+        include_adult = options['include_adult']
+        batch_size = options['batch_size']
+        hydrate = options['hydrate']
+
+        stats = {'lines': 0, 'imported': 0, 'filtered': 0, 'invalid': 0}
+        batch = {}  # by tmdb_id: an upsert may touch a row only once
+        top = []  # min-heap of (popularity, tmdb_id), at most `hydrate` entries
+
+        with self._open(options['path']) as lines:
+            for line in lines:
+                stats['lines'] += 1
+                if stats['lines'] % PROGRESS_EVERY == 0:
+                    self.stdout.write(f'  … {stats["lines"]} lines')
+                movie = self._parse_line(line, stats, min_popularity, include_adult)
+                if movie is None:
+                    continue
+
+                batch[movie.tmdb_id] = movie
+                if hydrate:
+                    if len(top) < hydrate:
+                        heapq.heappush(top, (movie.popularity, movie.tmdb_id))
+                    elif movie.popularity > top[0][0]:
+                        heapq.heapreplace(top, (movie.popularity, movie.tmdb_id))
+                if len(batch) >= batch_size:
+                    stats['imported'] += self._write(batch.values())
+                    batch = {}
+
+        if batch:
+            stats['imported'] += self._write(batch.values())
+        return stats, top
+
+    @staticmethod
+    def _parse_line(line, stats, min_popularity, include_adult):
+        """A stub ``Movie`` for one export line, or None (counted invalid / filtered)."""
+        try:
+            entry = json.loads(line)
+            tmdb_id = int(entry['id'])
+            popularity = float(entry.get('popularity') or 0.0)
+        except (ValueError, KeyError, TypeError):
+            stats['invalid'] += 1
+            return None
+
+        adult = bool(entry.get('adult'))
+        if popularity < min_popularity or (adult and not include_adult):
+            stats['filtered'] += 1
+            return None
+
+        title = (entry.get('original_title') or '')[:500]
+        return Movie(
+            tmdb_id=tmdb_id, title=title, original_title=title,
+            popularity=popularity, adult=adult,
+        )
+
+    @staticmethod
+    def _open(path):
+        # A stray bad byte becomes U+FFFD; lines it breaks are counted invalid
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+        return open(path, encoding='utf-8', errors='replace')
+
+    @staticmethod
+    def _write(batch):
+        """Insert stubs; existing movies only get the export's popularity."""
+        batch = list(batch)
+        Movie.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['tmdb_id'],
+            # Clearing the hash makes the next listing payload rewrite the row
+            update_fields=['popularity', 'content_hash', 'updated_at'],
+        )
+        return len(batch)
+
+    @staticmethod
+    def _needs_details(top):
+        """Most popular first, skipping movies that already have details."""
+        ids = [tmdb_id for _, tmdb_id in sorted(top, reverse=True)]
+        hydrated = set(
+            Movie.objects.filter(tmdb_id__in=ids).exclude(status='')
+            .values_list('tmdb_id', flat=True)
+        )
+        return [tmdb_id for tmdb_id in ids if tmdb_id not in hydrated]
@@ -5,10 +5,21 @@ Usage:
     python manage.py sync_tmdb                    # default: 5 pages each
     python manage.py sync_tmdb --pages 10         # 10 pages each (~600 movies)
     python manage.py sync_tmdb --genres-only       # only sync genre list
+    python manage.py sync_tmdb --with-credits      # also store cast/crew for movies lacking it
+    python manage.py sync_tmdb --pages 500 --concurrency 16 --rate 40
+    python manage.py sync_tmdb --incremental         # only movies changed since last run
+
+Pages are fetched by a pool of workers sharing TMDbService's rate limiter
+and persisted on this thread as they arrive (see services/fetch_pipeline.py).
 """
-import time
+from collections import Counter
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from apps.movies.models import Genre
+from apps.movies.models import Genre, Movie
+from apps.movies.services.fetch_pipeline import TokenBucket, run_pipeline
+from apps.movies.services.hydration import hydrate_movies
+from apps.movies.services.incremental_sync import run_incremental_sync
 from apps.movies.services.tmdb_service import tmdb_service, TMDbService
 
 
@@ -27,10 +38,47 @@ class Command(BaseCommand):
             action='store_true',
             help='Only sync the genre list, skip movies',
         )
+        parser.add_argument(
+            '--with-credits',
+            action='store_true',
+            help='Fetch details (incl. cast/crew) for the most popular movies without credits',
+        )
+        parser.add_argument(
+            '--credits-limit',
+            type=int,
+            default=100,
+            help='Max movies to fetch credits for (default: 100)',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Refresh only local movies in the TMDb change feed since the last checkpoint',
+        )
+        parser.add_argument(
+            '--since-days',
+            type=int,
+            default=1,
+            help='With --incremental and no checkpoint yet, start this many days back (default: 1)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.TMDB_FETCH_CONCURRENCY,
+            help=f'Concurrent fetch workers (default: {settings.TMDB_FETCH_CONCURRENCY})',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=None,
+            help=f'Max TMDb requests per second (default: {settings.TMDB_RATE_LIMIT:g})',
+        )
 
     def handle(self, *args, **options):
         pages = options['pages']
         genres_only = options['genres_only']
+        self.concurrency = options['concurrency']
+        if options['rate']:
+            tmdb_service.rate_limiter = TokenBucket(options['rate'], settings.TMDB_RATE_BURST)
 
         self.stdout.write(self.style.MIGRATE_HEADING('🎬 TMDb Sync'))
         self.stdout.write('')
@@ -42,8 +90,11 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS('Done (genres only).'))
             return
 
+        if options['incremental']:
+            self._sync_incremental(options['since_days'])
+            return
+
         # ── 2. Sync movies from multiple TMDb endpoints ──────────────
-        total = 0
         categories = [
             ('Trending (day)', lambda p: tmdb_service.get_trending_movies('day', p)),
             ('Popular',        lambda p: tmdb_service.get_popular_movies(p)),
@@ -51,9 +102,10 @@ class Command(BaseCommand):
             ('Trending (week)', lambda p: tmdb_service.get_trending_movies('week', p)),
         ]
 
-        for label, fetcher in categories:
-            count = self._sync_category(label, fetcher, pages)
-            total += count
+        total = self._sync_categories(categories, pages)
+
+        if options['with_credits']:
+            self._sync_credits(options['credits_limit'])
 
         self.stdout.write('')
         self.stdout.write(self.style.SUCCESS(
@@ -82,25 +134,70 @@ class Command(BaseCommand):
             f'  Genres: {len(genres_data)} synced ({created} new)'
         )
 
-    def _sync_category(self, label, fetcher, pages):
-        """Fetch `pages` pages from a TMDb endpoint and persist."""
-        saved = 0
-        for page in range(1, pages + 1):
-            data = fetcher(page)
-            if not data or 'results' not in data:
-                self.stdout.write(
-                    self.style.WARNING(f'  {label} page {page}: no data')
-                )
-                break
+    def _sync_categories(self, categories, pages):
+        """Fetch `pages` pages from each TMDb endpoint concurrently and persist."""
+        fetchers = dict(categories)
+        saved = Counter()
+        missing = Counter()
 
+        def fetch(job):
+            label, page = job
+            return fetchers[label](page)
+
+        def persist(job, data):
+            label, page = job
+            if not data or 'results' not in data:
+                missing[label] += 1
+                return 0
             count = TMDbService.persist_tmdb_movies(data['results'])
-            saved += count
+            saved[label] += count
+            return count
 
-            # Be polite to the TMDb API
-            time.sleep(0.25)
+        jobs = [(label, page) for label, _ in categories for page in range(1, pages + 1)]
+        run_pipeline(jobs, fetch, persist, concurrency=self.concurrency)
 
-        self.stdout.write(f'  {label}: {saved} movies across {pages} pages')
-        return saved
+        for label, _ in categories:
+            self.stdout.write(f'  {label}: {saved[label]} movies across {pages} pages')
+            if missing[label]:
+                self.stdout.write(
+                    self.style.WARNING(f'  {label}: {missing[label]} pages returned no data')
+                )
+        return sum(saved.values())
+
+    def _sync_credits(self, limit):
+        """Fetch detail payloads (with credits) for popular movies that have none stored."""
+        movies = (
+            Movie.objects
+            .filter(credits__isnull=True)
+            .order_by('-popularity')
+            .values_list('tmdb_id', flat=True)[:limit]
+        )
+        stored = hydrate_movies(list(movies), concurrency=self.concurrency)
+
+        self.stdout.write(f'  Credits: stored for {stored} movies')
+        return stored
+
+    def _sync_incremental(self, since_days):
+        """Refresh movies changed on TMDb since the stored checkpoint."""
+        stats = run_incremental_sync(concurrency=self.concurrency, initial_days=since_days)
+        if stats.get('skipped') == 'locked':
+            self.stdout.write(self.style.WARNING(
+                '  Another incremental sync is running; nothing done'
+            ))
+            return
+        self.stdout.write(
+            f'  Changes: {stats.get("changed", 0)} reported, '
+            f'{stats.get("local", 0)} stored locally, '
+            f'{stats.get("refreshed", 0)} refreshed, {stats.get("failed", 0)} pending retry'
+        )
+        if not stats['completed']:
+            self.stdout.write(self.style.WARNING(
+                f'  Change feed unavailable; checkpoint left at {stats["checkpoint"]}'
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Incremental sync complete! Checkpoint now {stats["checkpoint"]}.'
+        ))
 
     @staticmethod
     def _movie_count():
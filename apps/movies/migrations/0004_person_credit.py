@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_alter_rating_unique_together_remove_rating_movie_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tmdb_id', models.IntegerField(unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('profile_path', models.CharField(blank=True, max_length=200, null=True)),
+                ('known_for_department', models.CharField(blank=True, max_length=50)),
+            ],
+            options={
+                'verbose_name': 'Person',
+                'verbose_name_plural': 'People',
+                'db_table': 'people',
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['name'], name='people_name_1a4b17_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Credit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tmdb_credit_id', models.CharField(max_length=50, unique=True)),
+                ('credit_type', models.CharField(choices=[('cast', 'Cast'), ('crew', 'Crew')], max_length=10)),
+                ('character', models.CharField(blank=True, max_length=500)),
+                ('department', models.CharField(blank=True, max_length=50)),
+                ('job', models.CharField(blank=True, max_length=100)),
+                ('order', models.PositiveSmallIntegerField(blank=True, help_text='Billing order (cast only)', null=True)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='movies.movie')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='movies.person')),
+            ],
+            options={
+                'db_table': 'credits',
+                'ordering': ['credit_type', 'order', 'id'],
+                'indexes': [models.Index(fields=['person', 'credit_type'], name='credits_person__5b4204_idx'), models.Index(fields=['person', 'job'], name='credits_person__2730b8_idx'), models.Index(fields=['movie', 'credit_type', 'order'], name='credits_movie_i_464938_idx')],
+            },
+        ),
+    ]
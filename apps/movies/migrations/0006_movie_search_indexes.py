@@ -0,0 +1,45 @@
+"""
+Full-text and trigram GIN indexes for local movie search (PostgreSQL only).
+
+The tsvector expression must stay identical to
+``apps.movies.services.search.SEARCH_VECTOR_SQL`` for the planner to use
+the index. Other databases skip this migration and search with a portable
+scan.
+"""
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(original_title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(overview, '')), 'B')"
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS movies_search_vector_gin ON movies USING GIN (({SEARCH_VECTOR_SQL}))'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS movies_title_trgm_gin ON movies USING GIN (title gin_trgm_ops)'
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS movies_search_vector_gin')
+    schema_editor.execute('DROP INDEX IF EXISTS movies_title_trgm_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_movie_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
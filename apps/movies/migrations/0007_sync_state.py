@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_movie_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('checkpoint', models.DateField(blank=True, null=True)),
+                ('pending_ids', models.JSONField(blank=True, default=list)),
+                ('last_stats', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'verbose_name': 'Sync State',
+                'verbose_name_plural': 'Sync States',
+                'db_table': 'sync_states',
+            },
+        ),
+    ]
@@ -60,6 +60,9 @@ class Movie(TimeStampedModel):
     revenue = models.BigIntegerField(null=True, blank=True)
     homepage = models.URLField(blank=True, null=True)
 
+    # Fingerprint of the last persisted TMDb listing payload (see tmdb_service)
+    content_hash = models.CharField(max_length=16, blank=True, default='')
+
     class Meta:
         db_table = 'movies'
         verbose_name = 'Movie'
@@ -91,6 +94,61 @@ class Movie(TimeStampedModel):
         return None
 
 
+class Person(TimeStampedModel):
+    """Cast or crew member, stored from TMDb credits."""
+    tmdb_id = models.IntegerField(unique=True)
+    name = models.CharField(max_length=255)
+    profile_path = models.CharField(max_length=200, blank=True, null=True)
+    known_for_department = models.CharField(max_length=50, blank=True)
+
+    class Meta:
+        db_table = 'people'
+        verbose_name = 'Person'
+        verbose_name_plural = 'People'
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['name']),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class Credit(models.Model):
+    """A person's cast or crew credit on a movie."""
+
+    CREDIT_TYPES = [
+        ('cast', 'Cast'),
+        ('crew', 'Crew'),
+    ]
+
+    tmdb_credit_id = models.CharField(max_length=50, unique=True)
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='credits')
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='credits')
+    credit_type = models.CharField(max_length=10, choices=CREDIT_TYPES)
+    character = models.CharField(max_length=500, blank=True)
+    department = models.CharField(max_length=50, blank=True)
+    job = models.CharField(max_length=100, blank=True)
+    order = models.PositiveSmallIntegerField(
+        null=True, blank=True, help_text="Billing order (cast only)"
+    )
+
+    class Meta:
+        db_table = 'credits'
+        ordering = ['credit_type', 'order', 'id']
+        indexes = [
+            # "Movies with this actor" / "movies by this director"
+            models.Index(fields=['person', 'credit_type']),
+            models.Index(fields=['person', 'job']),
+            # Billed cast of a movie
+            models.Index(fields=['movie', 'credit_type', 'order']),
+        ]
+
+    def __str__(self):
+        role = self.character if self.credit_type == 'cast' else self.job
+        return f"{self.person.name} – {role} ({self.movie.title})"
+
+
 class WatchHistory(TimeStampedModel):
     """Track user's watch history."""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='watch_history')
@@ -107,3 +165,20 @@ class WatchHistory(TimeStampedModel):
 
     def __str__(self):
         return f"{self.user.email} watched {self.movie.title}"
+
+
+class SyncState(TimeStampedModel):
+    """Checkpoint of an incremental TMDb sync (see services/incremental_sync.py)."""
+    name = models.CharField(max_length=100, unique=True)
+    checkpoint = models.DateField(null=True, blank=True)
+    # Changed movies whose details could not be fetched; retried next run
+    pending_ids = models.JSONField(default=list, blank=True)
+    last_stats = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        db_table = 'sync_states'
+        verbose_name = 'Sync State'
+        verbose_name_plural = 'Sync States'
+
+    def __str__(self):
+        return f"{self.name} @ {self.checkpoint or 'never'}"
@@ -1,6 +1,6 @@
 """Movie serializers for API endpoints."""
 from rest_framework import serializers
-from .models import Movie, Genre
+from .models import Credit, Movie, Genre
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -12,6 +12,22 @@ class GenreSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class CreditSerializer(serializers.ModelSerializer):
+    """Cast / crew credit with the person inlined."""
+    person_id = serializers.IntegerField(source='person.id', read_only=True)
+    tmdb_person_id = serializers.IntegerField(source='person.tmdb_id', read_only=True)
+    name = serializers.CharField(source='person.name', read_only=True)
+    profile_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Credit
+        fields = ['person_id', 'tmdb_person_id', 'name', 'character', 'job', 'order', 'profile_url']
+
+    def get_profile_url(self, obj):
+        from .services.tmdb_service import TMDbService
+        return TMDbService.get_poster_url(obj.person.profile_path, size='w185')
+
+
 class MovieListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for movie lists."""
     poster_url = serializers.SerializerMethodField()
@@ -34,6 +50,8 @@ class MovieDetailSerializer(serializers.ModelSerializer):
     genres = GenreSerializer(many=True, read_only=True)
     poster_url = serializers.SerializerMethodField()
     backdrop_url = serializers.SerializerMethodField()
+    cast = serializers.SerializerMethodField()
+    crew = serializers.SerializerMethodField()
 
     class Meta:
         model = Movie
@@ -41,7 +59,8 @@ class MovieDetailSerializer(serializers.ModelSerializer):
             'id', 'tmdb_id', 'imdb_id', 'title', 'original_title',
             'overview', 'tagline', 'release_date', 'runtime', 'budget',
             'revenue', 'popularity', 'vote_average', 'vote_count',
-            'status', 'poster_url', 'backdrop_url', 'genres', 'created_at'
+            'status', 'poster_url', 'backdrop_url', 'genres', 'cast', 'crew',
+            'created_at'
         ]
 
     def get_poster_url(self, obj):
@@ -52,6 +71,15 @@ class MovieDetailSerializer(serializers.ModelSerializer):
         from .services.tmdb_service import TMDbService
         return TMDbService.get_backdrop_url(obj.backdrop_path)
 
+    # Credits come from the view's prefetch — no query per movie
+    def get_cast(self, obj):
+        credits = [c for c in obj.credits.all() if c.credit_type == 'cast']
+        return CreditSerializer(credits, many=True).data
+
+    def get_crew(self, obj):
+        credits = [c for c in obj.credits.all() if c.credit_type == 'crew']
+        return CreditSerializer(credits, many=True).data
+
 
 class TMDbMovieSerializer(serializers.Serializer):
     """Serializer for TMDb API responses."""
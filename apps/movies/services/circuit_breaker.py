@@ -0,0 +1,98 @@
+"""
+Circuit breaker for the TMDb client.
+
+Calls are recorded in a sliding window of the last ``window`` outcomes.
+Once at least ``min_calls`` are recorded, the circuit opens when either
+the failure rate or the share of slow calls (longer than
+``slow_call_seconds``) reaches its threshold. While open, ``allow()``
+returns False so callers skip the upstream request entirely instead of
+waiting on its timeout.
+
+After ``open_seconds`` the circuit is half-open: a single probe call is
+let through. Success closes the circuit with a clean window; a failure
+or slow probe opens it again.
+
+State is per process, which is what matters for keeping a worker's
+threads free during an incident.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Failure-rate / slow-call circuit breaker with half-open probing."""
+
+    def __init__(self, name, window=20, min_calls=10, failure_rate=0.5,
+                 slow_call_seconds=3.0, slow_call_rate=0.5, open_seconds=30.0,
+                 clock=time.monotonic):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._calls = deque(maxlen=window)  # (failed, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self):
+        """Whether a call may go upstream now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, success, elapsed):
+        """Record the outcome of an allowed call that took ``elapsed`` seconds."""
+        slow = elapsed >= self.slow_call_seconds
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._probing = False
+                if success and not slow:
+                    self._calls.clear()
+                    self._state = CLOSED
+                    logger.info("Circuit %s closed after a successful probe", self.name)
+                else:
+                    self._trip()
+                return
+
+            self._calls.append((not success, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            failures = sum(failed for failed, _ in self._calls) / len(self._calls)
+            slow_calls = sum(s for _, s in self._calls) / len(self._calls)
+            if failures >= self.failure_rate or slow_calls >= self.slow_call_rate:
+                self._trip()
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        logger.warning(
+            "Circuit %s opened; upstream calls skipped for %ss", self.name, self.open_seconds,
+        )
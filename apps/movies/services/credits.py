@@ -0,0 +1,111 @@
+"""
+Local cast / crew store populated from TMDb ``credits`` payloads.
+
+``/movie/{id}?append_to_response=credits`` returns ``{"cast": [...],
+"crew": [...]}``; ``persist_credits`` normalises it into ``Person`` and
+``Credit`` rows with a fixed number of queries per movie, whatever the
+cast size:
+
+  * one bulk upsert of people (keyed by TMDb person id),
+  * one lookup of their local ids,
+  * one bulk upsert of credits (keyed by TMDb ``credit_id``),
+  * one delete of credits TMDb no longer lists.
+
+Only the top-billed ``MAX_CAST`` actors and crew in ``KEY_CREW_JOBS`` are
+kept — the long tail of crew credits is large and never shown.
+"""
+import logging
+
+from django.db import transaction
+
+from apps.movies.models import Credit, Person
+
+logger = logging.getLogger(__name__)
+
+MAX_CAST = 30
+KEY_CREW_JOBS = frozenset({
+    'Director', 'Screenplay', 'Writer', 'Novel', 'Story',
+    'Producer', 'Original Music Composer', 'Director of Photography',
+})
+
+
+def persist_credits(movie, credits):
+    """Upsert the cast and key crew of ``movie`` from a TMDb credits dict. Returns credits kept."""
+    if not credits:
+        return 0
+
+    cast = sorted(
+        (c for c in credits.get('cast', []) if c.get('id') and c.get('credit_id')),
+        key=lambda c: c.get('order', 0),
+    )[:MAX_CAST]
+    crew = [
+        c for c in credits.get('crew', [])
+        if c.get('id') and c.get('credit_id') and c.get('job') in KEY_CREW_JOBS
+    ]
+
+    people = {}
+    for entry in cast + crew:
+        people.setdefault(entry['id'], Person(
+            tmdb_id=entry['id'],
+            name=entry.get('name', ''),
+            profile_path=entry.get('profile_path'),
+            known_for_department=entry.get('known_for_department') or '',
+        ))
+
+    with transaction.atomic():
+        Person.objects.bulk_create(
+            people.values(),
+            update_conflicts=True,
+            unique_fields=['tmdb_id'],
+            update_fields=['name', 'profile_path', 'known_for_department', 'updated_at'],
+        )
+        person_ids = dict(
+            Person.objects.filter(tmdb_id__in=people).values_list('tmdb_id', 'id')
+        )
+
+        rows = [
+            Credit(
+                tmdb_credit_id=entry['credit_id'],
+                movie=movie,
+                person_id=person_ids[entry['id']],
+                credit_type='cast',
+                character=(entry.get('character') or '')[:500],
+                department='Acting',
+                order=entry.get('order'),
+            )
+            for entry in cast
+        ] + [
+            Credit(
+                tmdb_credit_id=entry['credit_id'],
+                movie=movie,
+                person_id=person_ids[entry['id']],
+                credit_type='crew',
+                department=entry.get('department') or '',
+                job=entry['job'],
+            )
+            for entry in crew
+        ]
+        # TMDb occasionally repeats a credit; an upsert may touch a row only once
+        rows = list({row.tmdb_credit_id: row for row in rows}.values())
+        Credit.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['tmdb_credit_id'],
+            update_fields=['person', 'character', 'department', 'job', 'order'],
+        )
+        Credit.objects.filter(movie=movie).exclude(
+            tmdb_credit_id__in=[row.tmdb_credit_id for row in rows]
+        ).delete()
+
+    logger.info("Stored %d credits (%d people) for movie %s", len(rows), len(people), movie.tmdb_id)
+    return len(rows)
+
+
+def movies_with_person(person_id, credit_type=None, job=None):
+    """Movie IDs a person is credited on, optionally as cast / crew or a given job."""
+    qs = Credit.objects.filter(person_id=person_id)
+    if credit_type:
+        qs = qs.filter(credit_type=credit_type)
+    if job:
+        qs = qs.filter(job=job)
+    return qs.values_list('movie_id', flat=True).distinct()
@@ -0,0 +1,117 @@
+"""
+Concurrent TMDb fetching with a shared rate limit.
+
+``TokenBucket`` is a thread-safe limiter: ``acquire()`` blocks until a
+token is available, refilling at ``rate`` tokens per second up to
+``capacity``. ``TMDbService`` holds one, so every request from the
+process — sync workers, views, tasks — counts against the same quota.
+
+``run_pipeline`` splits a sync into two stages:
+
+  * a thread pool of ``concurrency`` fetchers, each calling ``fetch(job)``
+    (which waits on the limiter inside ``_make_request``);
+  * a single persistence stage on the calling thread that consumes
+    ``(job, data)`` pairs from a bounded queue and calls
+    ``persist(job, data)``.
+
+Keeping persistence on one thread keeps DB writes on the caller's
+connection and in order of arrival; the bounded queue stops fetchers
+racing ahead of a slow database. With enough workers a large sync is
+bounded by the rate limit, not by per-request latency.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate`` tokens/second, bursts up to ``capacity``."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take ``tokens`` if available right now. Returns True on success."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Block until ``tokens`` are available, then take them. Returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+_DONE = object()
+
+
+def run_pipeline(jobs, fetch, persist, concurrency=8, queue_size=None):
+    """
+    Fetch every job concurrently and persist results on the calling thread.
+
+    ``fetch(job)`` returns the payload (or None); ``persist(job, data)`` is
+    called once per job, including failed fetches (``data`` is None).
+    Returns the list of ``persist`` return values, in completion order.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    results = queue.Queue(maxsize=queue_size or concurrency * 2)
+
+    def worker(job):
+        try:
+            data = fetch(job)
+        except Exception as exc:
+            logger.warning(f"Fetch failed for {job}: {exc}")
+            data = None
+        results.put((job, data))
+
+    def feed(pool):
+        for job in jobs:
+            pool.submit(worker, job)
+        pool.shutdown(wait=True)
+        results.put(_DONE)
+
+    persisted = []
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='tmdb-fetch')
+    feeder = threading.Thread(target=feed, args=(pool,), daemon=True)
+    feeder.start()
+    item = None
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            persisted.append(persist(*item))
+    finally:
+        # On a persist error, drain so blocked fetchers can finish
+        while item is not _DONE:
+            item = results.get()
+        feeder.join()
+    return persisted
@@ -0,0 +1,43 @@
+"""
+Detail hydration for movies stored from thin payloads.
+
+Listing pages and TMDb export files only carry a handful of fields.
+``hydrate_movies`` fetches ``/movie/{id}`` (with credits) for the given
+TMDb ids through the rate-limited fetch pipeline and stores the details;
+``queue_hydration`` hands the ids to Celery in chunks instead, for runs
+that should not wait on thousands of upstream calls.
+"""
+import logging
+
+from django.conf import settings
+
+from apps.movies.services.fetch_pipeline import run_pipeline
+from apps.movies.services.tmdb_service import TMDbService, tmdb_service
+
+logger = logging.getLogger(__name__)
+
+HYDRATION_CHUNK_SIZE = 100
+
+
+def hydrate_movies(tmdb_ids, concurrency=None):
+    """Fetch and store details for ``tmdb_ids``. Returns the number stored."""
+    def persist(tmdb_id, data):
+        return bool(data and TMDbService.persist_tmdb_movie_detail(data))
+
+    return sum(run_pipeline(
+        list(tmdb_ids), tmdb_service.get_movie_details, persist,
+        concurrency=concurrency or settings.TMDB_FETCH_CONCURRENCY,
+    ))
+
+
+def queue_hydration(tmdb_ids, chunk_size=HYDRATION_CHUNK_SIZE):
+    """Dispatch ``hydrate_movie_details`` tasks in chunks. Returns tasks sent."""
+    from apps.movies.tasks import hydrate_movie_details
+
+    tmdb_ids = list(tmdb_ids)
+    sent = 0
+    for start in range(0, len(tmdb_ids), chunk_size):
+        hydrate_movie_details.delay(tmdb_ids[start:start + chunk_size])
+        sent += 1
+    logger.info("Queued detail hydration for %d movies in %d tasks", len(tmdb_ids), sent)
+    return sent
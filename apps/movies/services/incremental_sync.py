@@ -0,0 +1,162 @@
+"""
+Incremental catalogue sync from TMDb's movie change feed.
+
+``/movie/changes`` lists the ids of every movie edited between two dates
+(at most 14 days apart). ``run_incremental_sync`` reads that feed from
+the last checkpoint stored in ``SyncState`` up to today and refetches
+details only for changed movies that already exist locally. Fetches go
+through the rate-limited pipeline and bypass the response cache (which
+may still hold the pre-change payload), and payloads are written with the
+bulk detail upsert path. The checkpoint and the ids whose details could
+not be fetched (retried next run) are then saved in one transaction.
+
+A run therefore costs roughly one request per changed local movie, not
+one per catalogue page. If the change feed itself cannot be read the
+checkpoint stays put, so the window is retried next time. A cache lock
+keeps overlapping runs (the beat schedule and a manual ``sync_tmdb``)
+from reading and advancing the same checkpoint.
+"""
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.movies.models import Movie, SyncState
+from apps.movies.services.fetch_pipeline import run_pipeline
+from apps.movies.services.tmdb_service import TMDbService, tmdb_service
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = 'tmdb_movie_changes'
+MAX_WINDOW_DAYS = 14
+ID_CHUNK_SIZE = 5000
+DETAIL_BATCH_SIZE = 100
+LOCK_KEY = 'tmdb_incremental_sync:lock'
+# Longer than a run catching up on 14 days of changes takes
+LOCK_TIMEOUT = 2 * 60 * 60
+
+
+def changed_movie_ids(start, end, concurrency=None):
+    """Ids TMDb reports changed in [start, end], or None if the feed could not be read."""
+    first = tmdb_service.get_movie_changes(start, end, 1)
+    if not first or 'results' not in first:
+        return None
+
+    ids = {entry['id'] for entry in first['results'] if entry.get('id')}
+    failed_pages = []
+
+    def collect(page, data):
+        if not data or 'results' not in data:
+            failed_pages.append(page)
+            return
+        ids.update(entry['id'] for entry in data['results'] if entry.get('id'))
+
+    run_pipeline(
+        range(2, (first.get('total_pages') or 1) + 1),
+        lambda page: tmdb_service.get_movie_changes(start, end, page),
+        collect,
+        concurrency=concurrency or settings.TMDB_FETCH_CONCURRENCY,
+    )
+    if failed_pages:
+        logger.warning("Change feed pages %s failed for %s..%s", failed_pages, start, end)
+        return None
+    return ids
+
+
+def local_movie_ids(tmdb_ids):
+    """The subset of ``tmdb_ids`` stored locally."""
+    tmdb_ids = sorted(tmdb_ids)
+    found = set()
+    for start in range(0, len(tmdb_ids), ID_CHUNK_SIZE):
+        found.update(
+            Movie.objects.filter(tmdb_id__in=tmdb_ids[start:start + ID_CHUNK_SIZE])
+            .values_list('tmdb_id', flat=True)
+        )
+    return found
+
+
+def refresh_details(tmdb_ids, concurrency=None):
+    """Refetch and bulk-store details. Returns ``(stored, failed_ids)``."""
+    buffer = []
+    failed = []
+    stored = 0
+
+    def persist(tmdb_id, data):
+        nonlocal stored
+        if not data:
+            failed.append(tmdb_id)
+            return
+        buffer.append(data)
+        if len(buffer) >= DETAIL_BATCH_SIZE:
+            stored += TMDbService.persist_tmdb_movie_details(buffer)
+            buffer.clear()
+
+    run_pipeline(
+        sorted(tmdb_ids), lambda tmdb_id: tmdb_service.get_movie_details(tmdb_id, fresh=True),
+        persist,
+        concurrency=concurrency or settings.TMDB_FETCH_CONCURRENCY,
+    )
+    if buffer:
+        stored += TMDbService.persist_tmdb_movie_details(buffer)
+    return stored, sorted(failed)
+
+
+def run_incremental_sync(concurrency=None, initial_days=1, today=None):
+    """
+    Sync everything changed since the checkpoint (``initial_days`` back on
+    the first run), one window of at most 14 days at a time. Returns
+    without syncing (``skipped: 'locked'``) while another run holds the lock.
+    """
+    if not cache.add(LOCK_KEY, True, LOCK_TIMEOUT):
+        logger.info("Incremental sync already running; skipping")
+        return {'completed': False, 'skipped': 'locked', 'checkpoint': None}
+    try:
+        return _sync(concurrency, initial_days, today)
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _sync(concurrency, initial_days, today):
+    today = today or timezone.now().date()
+    state, _ = SyncState.objects.get_or_create(name=STATE_NAME)
+    start = state.checkpoint or today - timedelta(days=initial_days)
+    pending = set(state.pending_ids)
+    totals = Counter()
+    completed = True
+
+    while True:
+        end = min(start + timedelta(days=MAX_WINDOW_DAYS), today)
+        changed = changed_movie_ids(start, end, concurrency)
+        if changed is None:
+            completed = False
+            break
+
+        targets = local_movie_ids(changed | pending)
+        stored, failed = refresh_details(targets, concurrency)
+        window = {
+            'start': start.isoformat(), 'end': end.isoformat(), 'changed': len(changed),
+            'local': len(targets), 'refreshed': stored, 'failed': len(failed),
+        }
+        with transaction.atomic():
+            state = SyncState.objects.select_for_update().get(pk=state.pk)
+            state.checkpoint = end
+            state.pending_ids = failed
+            state.last_stats = window
+            state.save()
+
+        pending = set(failed)
+        totals.update({key: value for key, value in window.items() if isinstance(value, int)})
+        logger.info("Incremental sync window %s..%s: %s", start, end, window)
+        if end >= today:
+            break
+        start = end
+
+    return {
+        **totals,
+        'checkpoint': state.checkpoint.isoformat() if state.checkpoint else None,
+        'completed': completed,
+    }
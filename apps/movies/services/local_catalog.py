@@ -0,0 +1,134 @@
+"""
+TMDb-shaped answers from the local ``Movie`` table.
+
+The TMDb proxy endpoints fall back to these when TMDb is unavailable (the
+circuit breaker is open or the call failed), so clients keep getting
+results in the same format and roughly the same order:
+
+  * trending — most popular, newest first among ties;
+  * popular  — by popularity;
+  * top rated — by rating, among movies with enough votes to be stable;
+  * search   — local full-text search (see ``search``);
+  * detail   — the stored movie with genres and cast / crew.
+"""
+import math
+
+from django.core.paginator import EmptyPage, Paginator
+from django.db.models import Prefetch, prefetch_related_objects
+
+from apps.movies.models import Credit, Movie
+from apps.movies.services.search import search_movies
+
+PAGE_SIZE = 20
+TOP_RATED_MIN_VOTES = 300
+
+
+def _as_listing(movie):
+    return {
+        'id': movie.tmdb_id,
+        'title': movie.title,
+        'original_title': movie.original_title,
+        'overview': movie.overview,
+        'release_date': movie.release_date.isoformat() if movie.release_date else '',
+        'poster_path': movie.poster_path,
+        'backdrop_path': movie.backdrop_path,
+        'vote_average': movie.vote_average,
+        'vote_count': movie.vote_count,
+        'popularity': movie.popularity,
+        'adult': movie.adult,
+        'original_language': movie.original_language,
+        'genre_ids': [genre.tmdb_id for genre in movie.genres.all()],
+    }
+
+
+def _page_number(page):
+    try:
+        return max(1, int(page))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _page(queryset, page):
+    page = _page_number(page)
+    paginator = Paginator(queryset.prefetch_related('genres'), PAGE_SIZE)
+    try:
+        movies = paginator.page(page).object_list
+    except EmptyPage:
+        movies = []
+    return {
+        'results': [_as_listing(movie) for movie in movies],
+        'page': page,
+        'total_pages': paginator.num_pages if paginator.count else 0,
+        'total_results': paginator.count,
+    }
+
+
+def trending(time_window='day', page=1):
+    return _page(Movie.objects.order_by('-popularity', '-release_date'), page)
+
+
+def popular(page=1):
+    return _page(Movie.objects.order_by('-popularity', 'id'), page)
+
+
+def top_rated(page=1):
+    return _page(
+        Movie.objects.filter(vote_count__gte=TOP_RATED_MIN_VOTES)
+        .order_by('-vote_average', '-vote_count'),
+        page,
+    )
+
+
+def search(query, page=1):
+    """Search page; ``strong_matches`` (not serialised) counts confident hits."""
+    page = _page_number(page)
+    movies, total, strong = search_movies(query, page=page, page_size=PAGE_SIZE)
+    prefetch_related_objects(movies, 'genres')
+    return {
+        'results': [_as_listing(movie) for movie in movies],
+        'page': page,
+        'total_pages': math.ceil(total / PAGE_SIZE),
+        'total_results': total,
+        'strong_matches': strong,
+    }
+
+
+def movie_detail(tmdb_id):
+    """Detail payload for a stored movie, or None if it is not in the catalogue."""
+    movie = (
+        Movie.objects
+        .prefetch_related('genres', Prefetch(
+            'credits',
+            queryset=Credit.objects.select_related('person').order_by('credit_type', 'order', 'id'),
+        ))
+        .filter(tmdb_id=tmdb_id)
+        .first()
+    )
+    if movie is None:
+        return None
+
+    data = _as_listing(movie)
+    data.update({
+        'imdb_id': movie.imdb_id,
+        'tagline': movie.tagline,
+        'runtime': movie.runtime,
+        'status': movie.status,
+        'budget': movie.budget,
+        'revenue': movie.revenue,
+        'homepage': movie.homepage,
+        'genres': [{'id': genre.tmdb_id, 'name': genre.name} for genre in movie.genres.all()],
+        'credits': {'cast': [], 'crew': []},
+    })
+    for credit in movie.credits.all():
+        entry = {
+            'id': credit.person.tmdb_id,
+            'credit_id': credit.tmdb_credit_id,
+            'name': credit.person.name,
+            'profile_path': credit.person.profile_path,
+        }
+        if credit.credit_type == 'cast':
+            entry.update(character=credit.character, order=credit.order)
+        else:
+            entry.update(department=credit.department, job=credit.job)
+        data['credits'][credit.credit_type].append(entry)
+    return data
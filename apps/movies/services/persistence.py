@@ -0,0 +1,183 @@
+"""
+Per-process background persistence of TMDb payloads served by the API.
+
+The TMDb proxy endpoints (trending, search, popular, top rated, detail)
+store what they return so the recommendation engine has data, but must
+not wait for the database. ``persistence_worker`` takes those payloads
+off the request thread:
+
+  * pending items are keyed by TMDb id, so the same movie arriving from
+    many requests is written once with its latest payload (coalesced);
+  * the queue is bounded by ``MOVIE_PERSIST_MAX_PENDING`` — when full, new
+    movies are dropped and counted rather than blocking the request;
+  * one worker thread wakes as soon as the queue becomes non-empty,
+    lingers ``MOVIE_PERSIST_FLUSH_INTERVAL`` so concurrent requests share
+    a batch, and writes it through the bulk upsert paths
+    (``persist_tmdb_movies`` / ``persist_tmdb_movie_details``) on a single
+    DB connection;
+  * on interpreter shutdown the queue is drained (bounded by
+    ``MOVIE_PERSIST_DRAIN_TIMEOUT``).
+
+``MOVIE_PERSIST_BACKEND = 'inline'`` writes synchronously instead (tests,
+management shells). ``stats()`` exposes the enqueue / coalesce / drop /
+persist counters.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from apps.movies.services.tmdb_service import TMDbService
+
+logger = logging.getLogger(__name__)
+
+
+class PersistenceWorker:
+    """Bounded, coalescing queue of TMDb payloads drained by one thread."""
+
+    def __init__(self, max_pending=None, batch_size=None, flush_interval=None):
+        self.max_pending = max_pending or settings.MOVIE_PERSIST_MAX_PENDING
+        self.batch_size = batch_size or settings.MOVIE_PERSIST_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.MOVIE_PERSIST_FLUSH_INTERVAL
+        self._listings = OrderedDict()
+        self._details = OrderedDict()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._counters = Counter()
+
+    # -- producers -----------------------------------------------------
+
+    def submit(self, results):
+        """Queue TMDb list results. Returns the number of movies accepted."""
+        if settings.MOVIE_PERSIST_BACKEND == 'inline':
+            return TMDbService.persist_tmdb_movies(results)
+        return self._submit(self._listings, results or [])
+
+    def submit_detail(self, data):
+        """Queue a detailed TMDb movie payload. Returns True if accepted."""
+        if not data or 'id' not in data:
+            return False
+        if settings.MOVIE_PERSIST_BACKEND == 'inline':
+            return TMDbService.persist_tmdb_movie_details([data]) == 1
+        return self._submit(self._details, [data]) == 1
+
+    def _submit(self, pending, items):
+        accepted = dropped = 0
+        with self._cond:
+            was_empty = not self._pending_count()
+            for item in items:
+                tmdb_id = item.get('id')
+                if not tmdb_id:
+                    continue
+                if tmdb_id in pending:
+                    pending[tmdb_id] = item
+                    self._counters['coalesced'] += 1
+                    accepted += 1
+                elif self._pending_count() >= self.max_pending:
+                    dropped += 1
+                else:
+                    pending[tmdb_id] = item
+                    self._counters['enqueued'] += 1
+                    accepted += 1
+            self._counters['dropped'] += dropped
+            # Wake the worker for a new batch, and again when it is full
+            if (was_empty and accepted) or self._pending_count() >= self.batch_size:
+                self._cond.notify()
+        self._ensure_started()
+
+        if dropped:
+            logger.warning(
+                "Movie persistence queue full (%d pending); dropped %d payloads",
+                self.max_pending, dropped,
+            )
+        return accepted
+
+    def _pending_count(self):
+        return len(self._listings) + len(self._details)
+
+    # -- consumer ------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name='movie-persistence', daemon=True,
+            )
+            self._thread.start()
+
+    def _take(self):
+        listings, self._listings = self._listings, OrderedDict()
+        details, self._details = self._details, OrderedDict()
+        return listings, details
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending_count() and not self._stopping:
+                    self._cond.wait()
+                # Linger briefly so concurrent requests land in one batch
+                if not self._stopping and self._pending_count() < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                listings, details = self._take()
+                if not listings and not details and self._stopping:
+                    return
+            self._write(listings, details)
+            close_old_connections()
+
+    def _write(self, listings, details):
+        for pending, persist in (
+            (listings, TMDbService.persist_tmdb_movies),
+            (details, TMDbService.persist_tmdb_movie_details),
+        ):
+            if not pending:
+                continue
+            try:
+                saved = persist(list(pending.values()), batch_size=self.batch_size)
+                self._counters['persisted'] += saved
+                self._counters['failed'] += len(pending) - saved
+            except Exception as exc:
+                self._counters['failed'] += len(pending)
+                logger.error(f"Background persistence of {len(pending)} movies failed: {str(exc)}")
+
+    # -- lifecycle -----------------------------------------------------
+
+    def flush(self):
+        """Write everything pending on the calling thread. Returns items written."""
+        with self._cond:
+            listings, details = self._take()
+        self._write(listings, details)
+        return len(listings) + len(details)
+
+    def stop(self, timeout=None):
+        """Drain the queue and stop the worker. Returns True if it finished in time."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return True
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout)
+        if thread.is_alive():
+            with self._cond:
+                lost = self._pending_count()
+            logger.warning("Movie persistence did not drain in time; %d payloads pending", lost)
+            return False
+        return True
+
+    def stats(self):
+        """Counters since start, plus the current queue depth."""
+        with self._cond:
+            return {**self._counters, 'pending': self._pending_count()}
+
+
+# Per-process singleton used by the movie views.
+persistence_worker = PersistenceWorker()
+atexit.register(lambda: persistence_worker.stop(settings.MOVIE_PERSIST_DRAIN_TIMEOUT))
@@ -0,0 +1,160 @@
+"""
+Local full-text movie search over ``title``, ``original_title`` and ``overview``.
+
+On PostgreSQL, candidates come from two GIN indexes created by migration
+0006: a weighted ``tsvector`` expression (titles weight A, overview B)
+matched with ``websearch_to_tsquery`` (every non-stopword term must
+match), and a ``pg_trgm`` index on the title so typos and partial words
+still match. Other databases use a portable ``icontains`` scan over the
+same fields, also requiring every non-stopword token, with the same
+ranking done in Python over a bounded candidate set.
+
+Both rank by a blend of text relevance, title similarity and
+popularity, so an exact title beats an overview mention and, among
+equal matches, the movie people actually look for comes first. Results
+whose title contains every term, or closely resembles the query, count
+as strong matches; callers use that count, not the raw total, to decide
+whether the local catalogue answered the query.
+"""
+import math
+import re
+from difflib import SequenceMatcher
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.movies.models import Movie
+
+# Score = TEXT * relevance + SIMILARITY * title similarity + POPULARITY * log-popularity
+TEXT_WEIGHT = 1.0
+SIMILARITY_WEIGHT = 0.6
+POPULARITY_WEIGHT = 0.15
+# log1p(popularity) / log1p(POPULARITY_SCALE) caps near 1 for blockbusters
+POPULARITY_SCALE = 1000.0
+TRIGRAM_THRESHOLD = 0.3
+# Title similarity at which a result is a strong match on its own
+STRONG_SIMILARITY = 0.5
+PORTABLE_CANDIDATES = 500
+MAX_RESULTS = 1000
+
+# Must match the index expression in migrations/0006_movie_search_indexes.py
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(original_title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(overview, '')), 'B')"
+)
+
+# Match the 'english' text search configuration closely enough for titles
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have in into is it its of on
+    or that the their this to was were will with
+""".split())
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_movies(query, page=1, page_size=20):
+    """
+    Rank local movies for ``query``. Returns ``(movies, total, strong)``
+    where ``movies`` is the requested page, best first, each with
+    ``search_score``, and ``strong`` the number of strong matches overall.
+    """
+    query = (query or '').strip()
+    if not query:
+        return [], 0, 0
+    offset = (max(1, int(page)) - 1) * page_size
+    if connection.vendor == 'postgresql':
+        ranked = _search_postgres(query)
+    else:
+        ranked = _search_portable(query)
+
+    total = len(ranked)
+    strong = sum(1 for _, _, is_strong in ranked if is_strong)
+    page_ids = ranked[offset:offset + page_size]
+    movies = Movie.objects.in_bulk([movie_id for movie_id, _, _ in page_ids])
+    results = []
+    for movie_id, score, _ in page_ids:
+        movie = movies[movie_id]
+        movie.search_score = score
+        results.append(movie)
+    return results, total, strong
+
+
+def _popularity_score(popularity):
+    return math.log1p(max(popularity or 0.0, 0.0)) / math.log1p(POPULARITY_SCALE)
+
+
+def _search_postgres(query):
+    """``[(movie_id, score, strong)]`` best first, from the GIN indexes."""
+    sql = f"""
+        SELECT id,
+               %s * ts_rank_cd({SEARCH_VECTOR_SQL}, q, 32)
+             + %s * similarity(title, %s)
+             + %s * ln(1 + greatest(popularity, 0)) / ln(1 + %s) AS score,
+               to_tsvector(
+                   'english', coalesce(title, '') || ' ' || coalesce(original_title, '')
+               ) @@ q OR similarity(title, %s) >= %s AS strong
+        FROM movies, websearch_to_tsquery('english', %s) AS q
+        WHERE ({SEARCH_VECTOR_SQL}) @@ q OR title %% %s
+        ORDER BY score DESC, id
+        LIMIT %s
+    """
+    params = [
+        TEXT_WEIGHT, SIMILARITY_WEIGHT, query, POPULARITY_WEIGHT, POPULARITY_SCALE,
+        query, STRONG_SIMILARITY, query, query, MAX_RESULTS,
+    ]
+    # `title % query` uses the trigram index with this threshold; set_config
+    # with is_local keeps it to this transaction, not the pooled session
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+            [str(TRIGRAM_THRESHOLD)],
+        )
+        cursor.execute(sql, params)
+        return [(row[0], float(row[1]), bool(row[2])) for row in cursor.fetchall()]
+
+
+def _search_portable(query):
+    """Same ranking without Postgres: an ``icontains`` scan plus Python scoring."""
+    tokens = [token.lower() for token in _TOKEN_RE.findall(query)]
+    # A query made only of stopwords ("it", "up") still searches for them
+    tokens = [token for token in tokens if token not in STOP_WORDS] or tokens
+    if not tokens:
+        return []
+
+    condition = Q()
+    for token in tokens:
+        condition &= (
+            Q(title__icontains=token) | Q(original_title__icontains=token)
+            | Q(overview__icontains=token)
+        )
+    candidates = (
+        Movie.objects.filter(condition)
+        .order_by('-popularity')
+        .values_list('id', 'title', 'original_title', 'overview', 'popularity')
+        [:PORTABLE_CANDIDATES]
+    )
+
+    needle = query.lower()
+    ranked = []
+    for movie_id, title, original_title, overview, popularity in candidates:
+        title_l, original_l, overview_l = title.lower(), original_title.lower(), overview.lower()
+        relevance = sum(
+            1.0 if token in title_l or token in original_l
+            else 0.4 if token in overview_l
+            else 0.0
+            for token in tokens
+        ) / len(tokens)
+        similarity = max(
+            SequenceMatcher(None, needle, title_l).ratio(),
+            SequenceMatcher(None, needle, original_l).ratio() if original_l else 0.0,
+        )
+        score = (
+            TEXT_WEIGHT * relevance
+            + SIMILARITY_WEIGHT * similarity
+            + POPULARITY_WEIGHT * _popularity_score(popularity)
+        )
+        strong = relevance == 1.0 or similarity >= STRONG_SIMILARITY
+        ranked.append((movie_id, round(score, 6), strong))
+    ranked.sort(key=lambda item: (-item[1], item[0]))
+    return ranked
@@ -0,0 +1,199 @@
+"""
+Response cache for TMDb API calls with stale-while-revalidate.
+
+Every ``TMDbService._make_request`` goes through here. Endpoints are
+matched against ``CACHE_POLICIES`` for a ``(ttl, stale)`` pair:
+
+  * within ``ttl`` seconds an entry is fresh and served as is;
+  * for ``stale`` seconds after that it is still served immediately, while
+    a single background refresh fetches a new copy (guarded by a
+    cache-backed flag so only one worker process refreshes a key);
+  * after that the entry is expired and the next call fetches
+    synchronously. Expired entries are kept for ``EXPIRED_GRACE`` seconds
+    more, as a last resort for callers waiting on another fetch.
+
+Keys are built from the endpoint and its sorted parameters, without the
+API key, so ``page=1`` and ``page='1'`` share an entry. Failed requests
+(``None``) are never cached.
+
+Misses are coalesced by ``single_flight``: within a process, concurrent
+callers for a key wait on the one in-flight request; across worker
+processes a cache-backed lock elects one fetcher and the others poll for
+the entry it writes. Waiters that have an expired copy serve it after
+``FOLLOWER_WAIT`` rather than hold a request thread any longer; the rest
+give up after ``WAIT_TIMEOUT``. Hot keys are refreshed before they expire using
+probabilistic early expiration (XFetch): each read treats the entry as
+stale with a probability that rises as expiry nears, scaled by how long
+the last fetch took and ``TMDB_CACHE_EARLY_REFRESH_BETA`` (0 disables).
+"""
+import hashlib
+import logging
+import math
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# (endpoint pattern, fresh ttl, extra stale window) — first match wins
+CACHE_POLICIES = [
+    (re.compile(r'^genre/'), 7 * DAY, 7 * DAY),
+    (re.compile(r'^movie/\d+$'), DAY, 7 * DAY),
+    (re.compile(r'^trending/'), HOUR, 6 * HOUR),
+    (re.compile(r'^movie/(popular|top_rated)$'), HOUR, 6 * HOUR),
+    (re.compile(r'^discover/'), 30 * 60, 3 * HOUR),
+    (re.compile(r'^search/'), 15 * 60, HOUR),
+]
+REFRESH_LOCK_TTL = 60
+EXPIRED_GRACE = HOUR
+# Longer than a TMDb request can take (10s timeout plus rate-limit wait)
+FETCH_LOCK_TTL = 30
+FOLLOWER_WAIT = 1.0
+WAIT_TIMEOUT = 5
+POLL_INTERVAL = 0.05
+
+_executor = None
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def policy_for(endpoint):
+    """``(ttl, stale)`` for an endpoint, or None if it is not cached."""
+    for pattern, ttl, stale in CACHE_POLICIES:
+        if pattern.match(endpoint):
+            return ttl, stale
+    return None
+
+
+def cache_key(endpoint, params=None):
+    """Normalised key: endpoint plus sorted params, excluding the API key."""
+    query = urlencode(sorted(
+        (name, str(value)) for name, value in (params or {}).items() if name != 'api_key'
+    ))
+    digest = hashlib.md5(f'{endpoint}?{query}'.encode()).hexdigest()
+    return f'tmdb:{digest}'
+
+
+def read(key):
+    """
+    ``(data, is_stale)`` for a cached entry, or ``(None, False)`` on a miss.
+    Entries close to expiry may be reported stale early (XFetch).
+    """
+    entry = cache.get(key)
+    if not entry or _expired(entry):
+        return None, False
+    beta = settings.TMDB_CACHE_EARLY_REFRESH_BETA
+    # -log(u) for u in (0, 1] is an exponential sample; 1 - random() avoids log(0)
+    early = entry.get('delta', 0) * beta * -math.log(1.0 - random.random())
+    return entry['data'], time.time() + early >= entry['fresh_until']
+
+
+def write(key, data, ttl, stale, delta=0.0):
+    """Store ``data``; ``delta`` is how long it took to fetch, in seconds."""
+    now = time.time()
+    entry = {
+        'data': data, 'fresh_until': now + ttl, 'expires_at': now + ttl + stale, 'delta': delta,
+    }
+    cache.set(key, entry, ttl + stale + EXPIRED_GRACE)
+
+
+def last_known(key):
+    """The cached data for ``key`` even if expired, or None."""
+    entry = cache.get(key)
+    return entry['data'] if entry else None
+
+
+def _expired(entry):
+    return time.time() >= entry.get('expires_at', entry['fresh_until'])
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+def single_flight(key, fetch):
+    """
+    Call ``fetch()`` for a missed key with at most one call in flight per key:
+    concurrent callers in this process share its result, and other processes
+    wait for the entry it writes. Waiters fall back to an expired copy, if
+    one is left, once ``FOLLOWER_WAIT`` has passed.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if flight.done.wait(FOLLOWER_WAIT):
+            return flight.result
+        stale = last_known(key)
+        if stale is not None:
+            return stale
+        flight.done.wait(WAIT_TIMEOUT - FOLLOWER_WAIT)
+        return flight.result
+
+    try:
+        flight.result = _fetch_once_across_processes(key, fetch)
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+    return flight.result
+
+
+def _fetch_once_across_processes(key, fetch):
+    lock_key = f'{key}:fetching'
+    if cache.add(lock_key, 1, FETCH_LOCK_TTL):
+        try:
+            return fetch()
+        finally:
+            cache.delete(lock_key)
+
+    # Another process is fetching this key; wait for its entry to land
+    started = time.monotonic()
+    while time.monotonic() - started < WAIT_TIMEOUT:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry and not _expired(entry):
+            return entry['data']
+        if not cache.get(lock_key):
+            return fetch()  # it failed or gave up
+        if entry and time.monotonic() - started >= FOLLOWER_WAIT:
+            return entry['data']
+    return None
+
+
+def schedule_refresh(key, refresh):
+    """Run ``refresh()`` in the background unless another one is already in flight."""
+    if not cache.add(f'{key}:refreshing', 1, REFRESH_LOCK_TTL):
+        return False
+    _get_executor().submit(_refresh, key, refresh)
+    return True
+
+
+def _refresh(key, refresh):
+    try:
+        refresh()
+    except Exception as exc:
+        logger.warning("Background TMDb refresh failed for %s: %s", key, exc)
+    finally:
+        cache.delete(f'{key}:refreshing')
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tmdb-refresh')
+    return _executor
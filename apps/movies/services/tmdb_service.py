@@ -1,14 +1,82 @@
 """
 TMDb API service for fetching movie data.
 """
+import hashlib
+import json
 import logging
+import time
 import requests
 from datetime import datetime
 from django.conf import settings
-from django.core.cache import cache
+from django.db import transaction
+
+from apps.movies.services import tmdb_cache
+from apps.movies.services.circuit_breaker import CircuitBreaker
+from apps.movies.services.fetch_pipeline import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+PERSIST_BATCH_SIZE = 500
+# Fields a list endpoint result carries; detail-only fields are left alone
+LISTING_FIELDS = [
+    'title', 'original_title', 'overview', 'release_date', 'vote_average',
+    'vote_count', 'popularity', 'poster_path', 'backdrop_path',
+    'original_language', 'adult', 'updated_at',
+]
+HASHED_FIELDS = [field for field in LISTING_FIELDS if field != 'updated_at']
+# Fields only the /movie/{id} detail payload carries
+DETAIL_ONLY_FIELDS = ['tagline', 'runtime', 'status', 'budget', 'revenue', 'homepage', 'imdb_id']
+
+# (TMDb genre id -> Genre pk, TMDb ids known to be missing), or None until
+# loaded. Replaced as a whole, never mutated: request, persistence-worker
+# and fetch-pipeline threads read it without a lock.
+_genre_cache = None
+
+
+def _genre_pk_map(tmdb_ids=()):
+    """
+    Cached TMDb genre id -> Genre pk. Reloaded when a requested id is
+    neither known nor already known to be missing locally.
+    """
+    global _genre_cache
+    cached = _genre_cache
+    wanted = set(tmdb_ids)
+    if cached is not None and not wanted - cached[0].keys() - cached[1]:
+        return cached[0]
+
+    from apps.movies.models import Genre
+
+    pks = dict(Genre.objects.values_list('tmdb_id', 'id'))
+    missing = (cached[1] if cached else frozenset()) | wanted
+    _genre_cache = (pks, frozenset(missing - pks.keys()))
+    return pks
+
+
+def reset_genre_cache():
+    """Forget cached genre pks (after genres are synced)."""
+    global _genre_cache
+    _genre_cache = None
+
+
+def content_fingerprint(movie, genre_pks=()):
+    """
+    Compact hash of a movie's listing fields and genres. Stored on the row
+    so re-persisting an unchanged TMDb payload can skip the write.
+    """
+    payload = [getattr(movie, field) for field in HASHED_FIELDS] + [sorted(genre_pks)]
+    return hashlib.blake2b(
+        json.dumps(payload, default=str).encode(), digest_size=8
+    ).hexdigest()
+
+
+def _parse_date(raw):
+    if not raw:
+        return None
+    try:
+        return datetime.strptime(raw, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return None
+
 
 class TMDbService:
     """Service class for TMDb API interactions."""
@@ -19,63 +87,98 @@ class TMDbService:
 
     def __init__(self):
         self.session = requests.Session()
+        # Pool sized for concurrent sync workers sharing this session
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=max(10, settings.TMDB_FETCH_CONCURRENCY)
+        )
+        self.session.mount('https://', adapter)
+        self.rate_limiter = TokenBucket(settings.TMDB_RATE_LIMIT, settings.TMDB_RATE_BURST)
+        self.breaker = CircuitBreaker(
+            'tmdb',
+            failure_rate=settings.TMDB_BREAKER_FAILURE_RATE,
+            slow_call_seconds=settings.TMDB_BREAKER_SLOW_CALL_SECONDS,
+            open_seconds=settings.TMDB_BREAKER_OPEN_SECONDS,
+        )
+
+    def _make_request(self, endpoint, params=None, fresh=False):
+        """
+        Make request to TMDb API, served from the response cache when the
+        endpoint has a cache policy (see ``tmdb_cache``). ``fresh`` skips the
+        cache read but still stores the new response.
+        """
+        params = dict(params or {})
+        policy = tmdb_cache.policy_for(endpoint)
+        if policy is None:
+            return self._fetch(endpoint, params)
+
+        key = tmdb_cache.cache_key(endpoint, params)
+        if fresh:
+            return self._fetch_and_store(endpoint, params, key, policy)
+        data, is_stale = tmdb_cache.read(key)
+        if data is not None:
+            if is_stale:
+                tmdb_cache.schedule_refresh(
+                    key, lambda: self._fetch_and_store(endpoint, params, key, policy)
+                )
+            return data
+        return tmdb_cache.single_flight(
+            key, lambda: self._fetch_and_store(endpoint, params, key, policy)
+        )
 
-    def _make_request(self, endpoint, params=None):
-        """Make request to TMDb API."""
-        if params is None:
-            params = {}
-        params['api_key'] = self.API_KEY
+    def _fetch_and_store(self, endpoint, params, key, policy):
+        started = time.monotonic()
+        data = self._fetch(endpoint, params)
+        if data:
+            tmdb_cache.write(key, data, *policy, delta=time.monotonic() - started)
+        return data
+
+    def _fetch(self, endpoint, params):
+        """
+        Call TMDb directly, within the shared rate limit and the circuit
+        breaker. Returns None on errors and, without waiting, while the
+        circuit is open.
+        """
+        if not self.breaker.allow():
+            logger.debug("TMDb circuit open; skipping %s", endpoint)
+            return None
+        params = {**params, 'api_key': self.API_KEY}
 
         url = f"{self.BASE_URL}/{endpoint}"
+        self.rate_limiter.acquire()
+        started = time.monotonic()
+        healthy = False
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=settings.TMDB_REQUEST_TIMEOUT)
+            # Client errors (e.g. an unknown movie id) say nothing about TMDb's health
+            healthy = response.status_code < 500 and response.status_code != 429
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"TMDb API Error: {e}")
+            logger.warning("TMDb API Error on %s: %s", endpoint, e)
             return None
+        finally:
+            self.breaker.record(healthy, time.monotonic() - started)
 
     def get_trending_movies(self, time_window='day', page=1):
         """Get trending movies."""
-        cache_key = f'tmdb_trending_{time_window}_{page}'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-
-        data = self._make_request(f'trending/movie/{time_window}', {'page': page})
-        if data:
-            cache.set(cache_key, data, 3600)  # Cache for 1 hour
-        return data
+        return self._make_request(f'trending/movie/{time_window}', {'page': page})
 
     def search_movies(self, query, page=1):
         """Search for movies."""
         return self._make_request('search/movie', {'query': query, 'page': page})
 
-    def get_movie_details(self, movie_id):
-        """Get detailed movie information."""
-        cache_key = f'tmdb_movie_{movie_id}'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-
-        data = self._make_request(
+    def get_movie_details(self, movie_id, fresh=False):
+        """Get detailed movie information (``fresh``: bypass cached copies)."""
+        return self._make_request(
             f'movie/{movie_id}',
-            {'append_to_response': 'credits,videos,recommendations'}
+            {'append_to_response': 'credits,videos,recommendations'},
+            fresh=fresh,
         )
-        if data:
-            cache.set(cache_key, data, 86400)  # Cache for 24 hours
-        return data
 
     def get_genres(self):
         """Get list of movie genres."""
-        cache_key = 'tmdb_genres'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-
         data = self._make_request('genre/movie/list')
         if data and 'genres' in data:
-            cache.set(cache_key, data['genres'], 604800)  # Cache for 1 week
             return data['genres']
         return []
 
@@ -91,6 +194,14 @@ class TMDbService:
         """Get top rated movies."""
         return self._make_request('movie/top_rated', {'page': page})
 
+    def get_movie_changes(self, start_date, end_date, page=1):
+        """Ids of movies changed between two dates (at most 14 days apart; not cached)."""
+        return self._make_request('movie/changes', {
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'page': page,
+        })
+
     @staticmethod
     def get_poster_url(poster_path, size='w500'):
         """Get full poster URL."""
@@ -110,88 +221,205 @@ class TMDbService:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def persist_tmdb_movies(results):
+    def persist_tmdb_movies(results, batch_size=PERSIST_BATCH_SIZE):
         """
         Upsert a list of TMDb movie dicts into the local Movie table.
 
         Accepts the 'results' array from any TMDb list endpoint
         (trending, popular, top_rated, search, discover).
-        Returns the number of movies created or updated.
+        Each batch is one transaction of a handful of queries: the
+        existing ids and content hashes, one bulk upsert of the movies whose
+        hash changed, the ids of new rows, and a diff of the genre through
+        table. Unchanged movies are not written at all. Returns the number
+        of movies persisted or found unchanged.
         """
-        from apps.movies.models import Movie, Genre  # local import to avoid circular
-
         if not results:
             return 0
 
-        saved = 0
+        items = {}
         for item in results:
-            tmdb_id = item.get('id')
-            if not tmdb_id:
-                continue
-
-            # Parse release_date safely
-            release_date = None
-            raw_date = item.get('release_date', '')
-            if raw_date:
-                try:
-                    release_date = datetime.strptime(raw_date, '%Y-%m-%d').date()
-                except (ValueError, TypeError):
-                    pass
-
-            defaults = {
-                'title': item.get('title', item.get('name', '')),
-                'original_title': item.get('original_title', ''),
-                'overview': item.get('overview', ''),
-                'release_date': release_date,
-                'vote_average': item.get('vote_average', 0.0),
-                'vote_count': item.get('vote_count', 0),
-                'popularity': item.get('popularity', 0.0),
-                'poster_path': item.get('poster_path'),
-                'backdrop_path': item.get('backdrop_path'),
-                'original_language': item.get('original_language', 'en'),
-                'adult': item.get('adult', False),
-            }
+            if item.get('id'):
+                items[item['id']] = item  # TMDb pages can repeat a movie; last wins
+        items = list(items.values())
 
+        saved = 0
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
             try:
-                movie, _created = Movie.objects.update_or_create(
-                    tmdb_id=tmdb_id,
-                    defaults=defaults,
-                )
+                saved += TMDbService._persist_movie_batch(batch)
+            except Exception as exc:
+                logger.warning("Failed to persist batch of %d TMDb movies: %s", len(batch), exc)
 
-                # Handle genre M2M via genre_ids from TMDb
-                genre_ids = item.get('genre_ids', [])
-                if genre_ids:
-                    genres = Genre.objects.filter(tmdb_id__in=genre_ids)
-                    if genres.exists():
-                        movie.genres.set(genres)
+        logger.info("Persisted %d/%d TMDb movies to DB", saved, len(results))
+        return saved
 
-                saved += 1
+    @staticmethod
+    def persist_tmdb_movie_details(payloads, batch_size=PERSIST_BATCH_SIZE):
+        """
+        Bulk upsert detailed TMDb movie dicts (from /movie/{id}) and their
+        appended credits, in the same batches as ``persist_tmdb_movies``.
+        Every movie is written: detail-only fields are not covered by the
+        content hash. Genres must already exist locally (sync_tmdb syncs
+        them first). Returns the number of movies persisted.
+        """
+        items = list({data['id']: data for data in payloads if data and data.get('id')}.values())
+
+        saved = 0
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            try:
+                saved += TMDbService._persist_movie_batch(batch, detail=True)
             except Exception as exc:
-                logger.warning("Failed to persist tmdb_id=%s: %s", tmdb_id, exc)
+                logger.warning(
+                    "Failed to persist batch of %d TMDb movie details: %s", len(batch), exc
+                )
 
-        logger.info("Persisted %d/%d TMDb movies to DB", saved, len(results))
+        logger.info("Persisted %d/%d TMDb movie details to DB", saved, len(items))
         return saved
 
+    @staticmethod
+    def _persist_movie_batch(items, detail=False):
+        """Bulk upsert one batch of listing (or detail) dicts and sync their genres."""
+        from apps.movies.models import Movie  # local import to avoid circular
+        from apps.movies.services.credits import persist_credits
+
+        rows = [
+            Movie(
+                tmdb_id=item['id'],
+                title=item.get('title', item.get('name', '')),
+                original_title=item.get('original_title', ''),
+                overview=item.get('overview', ''),
+                release_date=_parse_date(item.get('release_date')),
+                vote_average=item.get('vote_average', 0.0),
+                vote_count=item.get('vote_count', 0),
+                popularity=item.get('popularity', 0.0),
+                poster_path=item.get('poster_path'),
+                backdrop_path=item.get('backdrop_path'),
+                original_language=item.get('original_language', 'en'),
+                adult=item.get('adult', False),
+            )
+            for item in items
+        ]
+        if detail:
+            for row, item in zip(rows, items):
+                row.tagline = item.get('tagline') or ''
+                row.runtime = item.get('runtime')
+                row.status = item.get('status') or ''
+                row.budget = item.get('budget')
+                row.revenue = item.get('revenue')
+                row.homepage = item.get('homepage') or None
+                row.imdb_id = item.get('imdb_id')
+
+        # Listing items carry genre_ids, details genre objects; items without
+        # known genres keep theirs
+        item_genres = {
+            item['id']: item.get('genre_ids') or [g['id'] for g in item.get('genres') or []]
+            for item in items
+        }
+        genre_map = _genre_pk_map({g for ids in item_genres.values() for g in ids})
+        genre_pks = {
+            tmdb_id: {pk for pk in map(genre_map.get, ids) if pk}
+            for tmdb_id, ids in item_genres.items()
+        }
+        for row in rows:
+            row.content_hash = content_fingerprint(row, genre_pks[row.tmdb_id])
+
+        known = {
+            tmdb_id: (movie_id, fingerprint)
+            for tmdb_id, movie_id, fingerprint in Movie.objects.filter(
+                tmdb_id__in=genre_pks
+            ).values_list('tmdb_id', 'id', 'content_hash')
+        }
+        # Unchanged payloads (the common case for re-served pages) cost this one read
+        changed = rows if detail else [
+            row for row in rows
+            if row.tmdb_id not in known or known[row.tmdb_id][1] != row.content_hash
+        ]
+        if not changed:
+            return len(rows)
+
+        update_fields = LISTING_FIELDS + ['content_hash']
+        if detail:
+            update_fields += DETAIL_ONLY_FIELDS
+
+        with transaction.atomic():
+            ids = {tmdb_id: movie_id for tmdb_id, (movie_id, _) in known.items()}
+            Movie.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=['tmdb_id'],
+                update_fields=update_fields,
+            )
+            new_tmdb_ids = [row.tmdb_id for row in changed if row.tmdb_id not in ids]
+            if new_tmdb_ids:
+                ids.update(
+                    Movie.objects.filter(tmdb_id__in=new_tmdb_ids).values_list('tmdb_id', 'id')
+                )
+
+            TMDbService._sync_movie_genres(
+                {
+                    ids[row.tmdb_id]: genre_pks[row.tmdb_id]
+                    for row in changed if genre_pks[row.tmdb_id]
+                },
+                set(ids[row.tmdb_id] for row in changed if row.tmdb_id in known),
+            )
+
+            if detail:
+                for item in items:
+                    if item.get('credits'):
+                        movie = Movie(pk=ids[item['id']], tmdb_id=item['id'])
+                        persist_credits(movie, item['credits'])
+        logger.debug(
+            "Wrote %d/%d movies (%d unchanged)",
+            len(changed), len(rows), len(rows) - len(changed),
+        )
+        return len(rows)
+
+    @staticmethod
+    def _sync_movie_genres(wanted, existing_movie_ids):
+        """Apply {movie_id: {genre_pk}} to the through table as an insert/delete diff."""
+        from apps.movies.models import Movie
+
+        if not wanted:
+            return
+        Through = Movie.genres.through
+        current = {}
+        stale = []
+        lookup = [movie_id for movie_id in wanted if movie_id in existing_movie_ids]
+        if lookup:
+            for pk, movie_id, genre_id in Through.objects.filter(
+                movie_id__in=lookup
+            ).values_list('id', 'movie_id', 'genre_id'):
+                if genre_id in wanted[movie_id]:
+                    current.setdefault(movie_id, set()).add(genre_id)
+                else:
+                    stale.append(pk)
+
+        # A concurrent writer may have linked a movie this batch created
+        Through.objects.bulk_create([
+            Through(movie_id=movie_id, genre_id=genre_id)
+            for movie_id, genre_ids in wanted.items()
+            for genre_id in genre_ids - current.get(movie_id, set())
+        ], ignore_conflicts=True)
+        if stale:
+            Through.objects.filter(id__in=stale).delete()
+
     @staticmethod
     def persist_tmdb_movie_detail(data):
         """
         Upsert a single detailed TMDb movie dict (from /movie/{id}).
 
         Handles the richer payload that includes runtime, budget, revenue,
-        tagline, status, imdb_id, homepage, and nested genre objects.
+        tagline, status, imdb_id, homepage, nested genre objects and the
+        appended cast / crew credits.
         """
         from apps.movies.models import Movie, Genre
+        from apps.movies.services.credits import persist_credits
 
         if not data or 'id' not in data:
             return None
 
-        release_date = None
-        raw_date = data.get('release_date', '')
-        if raw_date:
-            try:
-                release_date = datetime.strptime(raw_date, '%Y-%m-%d').date()
-            except (ValueError, TypeError):
-                pass
+        release_date = _parse_date(data.get('release_date'))
 
         defaults = {
             'title': data.get('title', ''),
@@ -232,6 +460,17 @@ class TMDbService:
                     genre_objs.append(obj)
                 movie.genres.set(genre_objs)
 
+            # Same rule as the bulk path, so an identical listing can skip its write
+            fingerprint = content_fingerprint(
+                movie, [genre.pk for genre in genre_objs] if genre_list else ()
+            )
+            if movie.content_hash != fingerprint:
+                movie.content_hash = fingerprint
+                Movie.objects.filter(pk=movie.pk).update(content_hash=fingerprint)
+
+            if data.get('credits'):
+                persist_credits(movie, data['credits'])
+
             return movie
         except Exception as exc:
             logger.warning("Failed to persist movie detail tmdb_id=%s: %s", data['id'], exc)
@@ -0,0 +1,13 @@
+"""Movie signals and handlers."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Genre
+from .services.tmdb_service import reset_genre_cache
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    """Drop the cached genre pk map used by bulk movie persistence."""
+    reset_genre_cache()
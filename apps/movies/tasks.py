@@ -0,0 +1,31 @@
+"""Movie Celery tasks."""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='apps.movies.tasks.hydrate_movie_details')
+def hydrate_movie_details(tmdb_ids: list):
+    """Fetch and store TMDb details (incl. credits) for stub movies."""
+    from .services.hydration import hydrate_movies
+
+    try:
+        stored = hydrate_movies(tmdb_ids)
+        return {'status': 'success', 'requested': len(tmdb_ids), 'stored': stored}
+    except Exception as e:
+        logger.error(f"Detail hydration of {len(tmdb_ids)} movies failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.movies.tasks.incremental_sync')
+def incremental_sync():
+    """Refresh movies changed on TMDb since the last checkpoint (run daily)."""
+    from .services.incremental_sync import run_incremental_sync
+
+    try:
+        stats = run_incremental_sync()
+        return {'status': 'success', **stats}
+    except Exception as e:
+        logger.error(f"Incremental TMDb sync failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
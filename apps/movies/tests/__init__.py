@@ -0,0 +1 @@
+"""Movie tests."""
@@ -0,0 +1,105 @@
+"""
+Tests for the bounded background persistence worker.
+"""
+import time
+from unittest import mock
+
+import pytest
+from apps.movies.models import Movie
+from apps.movies.services.persistence import PersistenceWorker
+
+
+def listing(*ids):
+    return [
+        {
+            'id': tmdb_id, 'title': f'Movie {tmdb_id}', 'overview': '', 'release_date': '',
+            'poster_path': None, 'backdrop_path': None, 'vote_average': 7.0,
+            'vote_count': 10, 'popularity': 1.0, 'adult': False,
+        }
+        for tmdb_id in ids
+    ]
+
+
+class TestPersistenceWorker:
+    """Test coalescing, bounds and draining."""
+
+    @pytest.fixture(autouse=True)
+    def _threaded(self, settings):
+        settings.MOVIE_PERSIST_BACKEND = 'thread'
+
+    def test_duplicate_ids_coalesce_and_full_queue_drops(self):
+        """Test the same movie is queued once and overflow is dropped and counted."""
+        worker = PersistenceWorker(max_pending=3, batch_size=100, flush_interval=60)
+        with mock.patch.object(worker, '_ensure_started'):
+            worker.submit(listing(1, 2))
+            worker.submit(listing(2, 3, 4, 5))
+
+        stats = worker.stats()
+        assert stats['pending'] == 3
+        assert stats['enqueued'] == 3
+        assert stats['coalesced'] == 1
+        assert stats['dropped'] == 2
+
+    def test_stop_drains_pending_batches(self):
+        """Test shutdown writes everything queued in one batch."""
+        worker = PersistenceWorker(max_pending=100, batch_size=100, flush_interval=60)
+        with mock.patch(
+            'apps.movies.services.persistence.TMDbService.persist_tmdb_movies',
+            side_effect=lambda items, batch_size: len(items),
+        ) as persist:
+            worker.submit(listing(1, 2))
+            worker.submit(listing(2, 3))
+            assert worker.stop(timeout=5)
+
+        persist.assert_called_once()
+        assert [item['id'] for item in persist.call_args.args[0]] == [1, 2, 3]
+        assert worker.stats()['persisted'] == 3
+
+    def test_small_batches_are_written_after_the_first_drain(self):
+        """Test the running worker wakes for each new submission, not only full batches."""
+        worker = PersistenceWorker(max_pending=100, batch_size=100, flush_interval=0.01)
+        written = []
+
+        def wait_for(count):
+            deadline = time.monotonic() + 5
+            while len(written) < count and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        with mock.patch(
+            'apps.movies.services.persistence.TMDbService.persist_tmdb_movies',
+            side_effect=lambda items, batch_size: written.extend(items) or len(items),
+        ), mock.patch(
+            'apps.movies.services.persistence.TMDbService.persist_tmdb_movie_details',
+            side_effect=lambda items, batch_size: written.extend(items) or len(items),
+        ):
+            try:
+                worker.submit(listing(1, 2))
+                wait_for(2)
+                worker.submit(listing(3))
+                worker.submit_detail({'id': 4, 'title': 'Detail'})
+                wait_for(4)
+                stats = worker.stats()
+            finally:
+                worker.stop(timeout=5)
+
+        assert [item['id'] for item in written] == [1, 2, 3, 4]
+        assert stats['pending'] == 0
+        assert stats['persisted'] == 4
+
+
+@pytest.mark.django_db
+class TestMovieViewsPersist:
+    """Test the TMDb proxy endpoints hand results to the worker."""
+
+    def test_trending_persists_results(self, client, settings):
+        """Test trending results reach the database (inline backend)."""
+        settings.MOVIE_PERSIST_BACKEND = 'inline'
+        data = {'results': listing(10, 11), 'page': 1, 'total_pages': 1, 'total_results': 2}
+
+        with mock.patch(
+            'apps.movies.views.tmdb_service.get_trending_movies', return_value=data,
+        ):
+            response = client.get('/api/v1/movies/trending/')
+
+        assert response.status_code == 200
+        assert set(Movie.objects.values_list('tmdb_id', flat=True)) == {10, 11}
@@ -0,0 +1,113 @@
+"""
+Tests for the TMDb circuit breaker and local-catalogue fallback.
+"""
+from unittest import mock
+
+import pytest
+import requests
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.movies.models import Genre, Movie
+from apps.movies.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from apps.movies.services.tmdb_service import tmdb_service
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test opening on failures / slow calls and half-open probing."""
+
+    def setup_method(self):
+        """Create a breaker on a controllable clock."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            'test', window=10, min_calls=4, failure_rate=0.5,
+            slow_call_seconds=2.0, open_seconds=30, clock=self.clock,
+        )
+
+    def test_opens_on_failure_rate_and_probes_once(self):
+        """Test the circuit opens, then lets a single probe through."""
+        for success in (True, False, True, False):
+            self.breaker.record(success, 0.1)
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow()
+
+        self.clock.now = 31
+        assert self.breaker.state == HALF_OPEN
+        assert self.breaker.allow()
+        assert not self.breaker.allow()
+
+        self.breaker.record(True, 0.1)
+        assert self.breaker.state == CLOSED
+
+    def test_slow_calls_open_and_failed_probe_reopens(self):
+        """Test latency alone trips the breaker; a bad probe re-opens it."""
+        for _ in range(4):
+            self.breaker.record(True, 5.0)
+        assert self.breaker.state == OPEN
+
+        self.clock.now = 31
+        assert self.breaker.allow()
+        self.breaker.record(False, 0.1)
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow()
+
+
+@pytest.mark.django_db
+class TestLocalFallback:
+    """Test proxy endpoints answer from the local catalogue while TMDb is down."""
+
+    @pytest.fixture(autouse=True)
+    def _tmdb_down(self):
+        breaker = CircuitBreaker('tmdb', min_calls=1)
+        breaker.record(False, 0.0)
+        session = mock.Mock()
+        session.get.side_effect = requests.exceptions.ConnectionError('down')
+        with mock.patch.object(tmdb_service, 'breaker', breaker), \
+                mock.patch.object(tmdb_service, 'session', session):
+            yield
+        session.get.assert_not_called()
+
+    def setup_method(self):
+        """Create a small local catalogue."""
+        self.client = APIClient()
+        action = Genre.objects.create(tmdb_id=28, name='Action')
+        for i, (title, popularity, rating, votes) in enumerate([
+            ('Alien', 50.0, 8.4, 9000),
+            ('Aliens', 80.0, 8.0, 8000),
+            ('Obscure', 1.0, 9.5, 12),
+        ]):
+            movie = Movie.objects.create(
+                tmdb_id=100 + i, title=title, popularity=popularity,
+                vote_average=rating, vote_count=votes,
+            )
+            movie.genres.add(action)
+
+    def test_listings_come_from_local_catalogue(self):
+        """Test popular / top rated / search keep their TMDb-like ordering."""
+        popular = self.client.get(reverse('api_v1:movies:movie-popular')).data
+        top_rated = self.client.get(reverse('api_v1:movies:movie-top-rated')).data
+        search = self.client.get(reverse('api_v1:movies:movie-search'), {'q': 'alien'}).data
+
+        assert [m['title'] for m in popular['results']] == ['Aliens', 'Alien', 'Obscure']
+        assert [m['title'] for m in top_rated['results']] == ['Alien', 'Aliens']
+        assert [m['title'] for m in search['results']] == ['Alien', 'Aliens']  # exact title first
+        assert popular['total_results'] == 3
+
+    def test_detail_comes_from_local_catalogue(self):
+        """Test the detail endpoint serves stored movies and 404s others."""
+        url = reverse('api_v1:movies:movie-tmdb-detail', args=[100])
+
+        response = self.client.get(url)
+        missing = self.client.get(reverse('api_v1:movies:movie-tmdb-detail', args=[999]))
+
+        assert response.status_code == 200
+        assert response.data['title'] == 'Alien'
+        assert response.data['genres'] == [{'id': 28, 'name': 'Action'}]
+        assert missing.status_code == 404
@@ -0,0 +1,78 @@
+"""
+Tests for the local cast / crew store.
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.movies.models import Credit, Person
+from apps.movies.services.credits import movies_with_person
+from apps.movies.services.tmdb_service import TMDbService
+
+
+def credits_payload(character='Hero'):
+    return {
+        'cast': [
+            {'id': 1, 'credit_id': 'c1', 'name': 'Lead Actor', 'character': character, 'order': 0},
+            {'id': 2, 'credit_id': 'c2', 'name': 'Support', 'character': 'Friend', 'order': 1},
+        ],
+        'crew': [
+            {'id': 3, 'credit_id': 'c3', 'name': 'The Director', 'job': 'Director',
+             'department': 'Directing'},
+            {'id': 4, 'credit_id': 'c4', 'name': 'Grip', 'job': 'Key Grip', 'department': 'Crew'},
+        ],
+    }
+
+
+@pytest.mark.django_db
+class TestCredits:
+    """Test credits are stored from TMDb details and served locally."""
+
+    def setup_method(self):
+        """Persist a detail payload that carries credits."""
+        self.client = APIClient()
+        self.movie = TMDbService.persist_tmdb_movie_detail(
+            {'id': 550, 'title': 'Fight Club', 'credits': credits_payload()}
+        )
+
+    def test_detail_payload_populates_people_and_credits(self):
+        """Test cast and key crew are stored; minor crew is skipped."""
+        assert Person.objects.count() == 3
+        assert set(Credit.objects.values_list('tmdb_credit_id', flat=True)) == {'c1', 'c2', 'c3'}
+
+    def test_repersist_updates_in_place(self, django_assert_max_num_queries):
+        """Test re-persisting upserts credits with a bounded number of queries."""
+        with django_assert_max_num_queries(12):
+            TMDbService.persist_tmdb_movie_detail(
+                {'id': 550, 'title': 'Fight Club', 'credits': credits_payload('Narrator')}
+            )
+
+        assert Credit.objects.count() == 3
+        assert Credit.objects.get(tmdb_credit_id='c1').character == 'Narrator'
+
+    def test_person_lookups(self):
+        """Test "movies with this actor / director" queries and endpoint."""
+        other = TMDbService.persist_tmdb_movie_detail({
+            'id': 551, 'title': 'Other',
+            'credits': {'cast': [], 'crew': [
+                {'id': 3, 'credit_id': 'c9', 'name': 'The Director', 'job': 'Director'},
+            ]},
+        })
+        director = Person.objects.get(tmdb_id=3)
+
+        assert set(movies_with_person(director.id, job='Director')) == {self.movie.id, other.id}
+        assert list(movies_with_person(director.id, credit_type='cast')) == []
+
+        url = reverse('api_v1:movies:movie-person', args=[director.id])
+        response = self.client.get(url, {'job': 'Director'})
+        assert response.status_code == status.HTTP_200_OK
+        assert {m['id'] for m in response.data} == {self.movie.id, other.id}
+
+    def test_movie_detail_serves_cast_locally(self):
+        """Test the detail endpoint includes billed cast and crew."""
+        url = reverse('api_v1:movies:movie-detail', args=[self.movie.id])
+
+        response = self.client.get(url)
+
+        assert [c['name'] for c in response.data['cast']] == ['Lead Actor', 'Support']
+        assert [c['job'] for c in response.data['crew']] == ['Director']
@@ -0,0 +1,90 @@
+"""
+Tests for the concurrent TMDb fetch pipeline and rate limiter.
+"""
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from apps.movies.models import Genre, Movie
+from apps.movies.services.fetch_pipeline import TokenBucket, run_pipeline
+from apps.movies.services.tmdb_service import tmdb_service
+
+
+class TestTokenBucket:
+    """Test the shared limiter bounds throughput."""
+
+    def test_burst_then_refill_rate(self):
+        """Test a burst is served immediately and the rest at the refill rate."""
+        bucket = TokenBucket(rate=100, capacity=5)
+
+        started = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        elapsed = time.monotonic() - started
+
+        assert 0.08 <= elapsed < 0.5
+        assert not bucket.try_acquire()
+
+
+class TestRunPipeline:
+    """Test fetching fans out while persistence stays on the caller."""
+
+    def test_fetches_concurrently_and_persists_on_calling_thread(self):
+        """Test every job is persisted once, on the calling thread."""
+        caller = threading.get_ident()
+        persist_threads = set()
+        active = {'now': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def fetch(job):
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+            time.sleep(0.02)
+            with lock:
+                active['now'] -= 1
+            return None if job == 3 else {'job': job}
+
+        def persist(job, data):
+            persist_threads.add(threading.get_ident())
+            return job if data else None
+
+        results = run_pipeline(range(20), fetch, persist, concurrency=5)
+
+        assert sorted(r for r in results if r is not None) == [j for j in range(20) if j != 3]
+        assert persist_threads == {caller}
+        assert active['max'] > 1
+
+    def test_persist_error_does_not_deadlock(self):
+        """Test a failing persist drains the queue and re-raises."""
+        def persist(job, data):
+            raise RuntimeError('db down')
+
+        with pytest.raises(RuntimeError):
+            run_pipeline(range(50), lambda job: job, persist, concurrency=4, queue_size=1)
+
+
+@pytest.mark.django_db
+class TestSyncCommand:
+    """Test sync_tmdb persists every fetched page."""
+
+    def test_sync_pages_concurrently(self):
+        """Test all categories and pages are fetched and stored."""
+        def page(p):
+            return {'results': [{'id': p * 100 + i, 'title': f'M{p}-{i}'} for i in range(3)]}
+
+        popular = mock.Mock(side_effect=page)
+        with mock.patch.multiple(
+            tmdb_service,
+            get_genres=mock.Mock(return_value=[{'id': 1, 'name': 'Drama'}]),
+            get_trending_movies=mock.Mock(side_effect=lambda window, p: page(p)),
+            get_popular_movies=popular,
+            get_top_rated_movies=mock.Mock(side_effect=page),
+        ):
+            call_command('sync_tmdb', pages=4, concurrency=4, rate=1000, stdout=mock.MagicMock())
+
+        assert popular.call_count == 4
+        assert Genre.objects.count() == 1
+        assert Movie.objects.count() == 12
@@ -0,0 +1,88 @@
+"""
+Tests for the streaming TMDb export importer.
+"""
+import gzip
+import json
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from apps.movies.models import Movie
+from apps.movies.services.tmdb_service import tmdb_service
+
+
+@pytest.mark.django_db
+class TestImportTMDbExport:
+    """Test stubs are bulk-imported and the most popular hydrated."""
+
+    @pytest.fixture(autouse=True)
+    def _export(self, tmp_path):
+        lines = [
+            json.dumps({
+                'id': i, 'original_title': f'Film {i}', 'popularity': float(i), 'adult': False,
+            })
+            for i in range(1, 51)
+        ] + [
+            json.dumps({'id': 900, 'original_title': 'Adult', 'popularity': 99.0, 'adult': True}),
+            'not json',
+        ]
+        self.path = tmp_path / 'movie_ids.json.gz'
+        with gzip.open(self.path, 'wt', encoding='utf-8') as handle:
+            handle.write('\n'.join(lines) + '\n')
+
+    def test_imports_filtered_stubs_in_batches_and_hydrates_top(self):
+        """Test filters, batching, popularity refresh and top-N hydration."""
+        Movie.objects.create(tmdb_id=20, title='Known', overview='Kept', popularity=1.0)
+
+        def details(tmdb_id):
+            return {'id': tmdb_id, 'title': f'Full {tmdb_id}', 'status': 'Released'}
+
+        with mock.patch.object(tmdb_service, 'get_movie_details', side_effect=details) as fetch:
+            call_command(
+                'import_tmdb_export', str(self.path),
+                min_popularity=10, batch_size=7, hydrate=3, stdout=StringIO(),
+            )
+
+        assert Movie.objects.count() == 41  # ids 10..50
+        assert not Movie.objects.filter(tmdb_id=900).exists()
+        known = Movie.objects.get(tmdb_id=20)
+        assert (known.title, known.overview, known.popularity) == ('Known', 'Kept', 20.0)
+        assert sorted(call.args[0] for call in fetch.call_args_list) == [48, 49, 50]
+        assert Movie.objects.get(tmdb_id=49).title == 'Full 49'
+        assert Movie.objects.get(tmdb_id=21).title == 'Film 21'
+
+    def test_already_hydrated_movies_are_skipped(self):
+        """Test movies with stored details are not fetched again."""
+        Movie.objects.create(tmdb_id=50, title='Known', status='Released')
+
+        with mock.patch.object(tmdb_service, 'get_movie_details', return_value=None) as fetch:
+            call_command('import_tmdb_export', str(self.path), hydrate=1, stdout=StringIO())
+
+        fetch.assert_not_called()
+
+    def test_deferred_hydration_needs_celery(self):
+        """Test --defer-hydration fails up front, before importing, when Celery is missing."""
+        with mock.patch('importlib.util.find_spec', return_value=None), \
+                pytest.raises(CommandError, match='needs Celery'):
+            call_command(
+                'import_tmdb_export', str(self.path), defer_hydration=True, stdout=StringIO(),
+            )
+
+        assert not Movie.objects.exists()
+
+    def test_undecodable_bytes_do_not_abort_the_import(self, tmp_path):
+        """Test invalid UTF-8 is replaced, and a line it breaks is counted invalid."""
+        path = tmp_path / 'broken.json'
+        path.write_bytes(
+            b'{"id": 1, "original_title": "Caf\xe9", "popularity": 5.0}\n'
+            b'{"id": 2, "popularity": \xff}\n'
+            b'{"id": 3, "original_title": "Fine", "popularity": 5.0}\n'
+        )
+        out = StringIO()
+
+        call_command('import_tmdb_export', str(path), hydrate=0, stdout=out)
+
+        assert sorted(Movie.objects.values_list('tmdb_id', flat=True)) == [1, 3]
+        assert Movie.objects.get(tmdb_id=1).title == 'Caf\ufffd'
+        assert '2 imported, 0 filtered, 1 invalid' in out.getvalue()
@@ -0,0 +1,182 @@
+"""
+Tests for the incremental sync from TMDb's change feed.
+"""
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from apps.movies.models import Credit, Genre, Movie, SyncState
+from apps.movies.services.incremental_sync import LOCK_KEY, STATE_NAME, run_incremental_sync
+from apps.movies.services import tmdb_cache
+from apps.movies.services.tmdb_service import TMDbService, tmdb_service
+
+TODAY = date(2024, 5, 31)
+
+
+def _changes(pages):
+    """Fake get_movie_changes serving ``pages`` (lists of ids) for any window."""
+    def fetch(start_date, end_date, page=1):
+        return {
+            'results': [{'id': tmdb_id, 'adult': False} for tmdb_id in pages[page - 1]],
+            'page': page,
+            'total_pages': len(pages),
+        }
+    return fetch
+
+
+def _details(tmdb_id, fresh=False):
+    return {
+        'id': tmdb_id, 'title': f'Updated {tmdb_id}', 'runtime': 100 + tmdb_id,
+        'status': 'Released', 'genres': [{'id': 28, 'name': 'Action'}],
+    }
+
+
+@pytest.mark.django_db
+class TestPersistMovieDetails:
+    """Test detail payloads are bulk upserted with their credits."""
+
+    def test_updates_detail_fields_genres_and_credits(self):
+        """Test detail-only fields, genre objects and credits are stored."""
+        action = Genre.objects.create(tmdb_id=28, name='Action')
+        Movie.objects.create(tmdb_id=1, title='Old', overview='Kept listing')
+        payload = dict(_details(1), credits={
+            'cast': [{'id': 7, 'credit_id': 'c1', 'name': 'Lead', 'character': 'Hero', 'order': 0}],
+            'crew': [],
+        })
+
+        assert TMDbService.persist_tmdb_movie_details([payload, None]) == 1
+
+        movie = Movie.objects.get(tmdb_id=1)
+        assert (movie.title, movie.runtime, movie.status) == ('Updated 1', 101, 'Released')
+        assert list(movie.genres.all()) == [action]
+        assert Credit.objects.get(movie=movie).person.name == 'Lead'
+
+
+@pytest.mark.django_db
+class TestIncrementalSync:
+    """Test only changed local movies are refetched and the checkpoint advances."""
+
+    def setup_method(self):
+        Genre.objects.create(tmdb_id=28, name='Action')
+        for tmdb_id in (1, 2, 3):
+            Movie.objects.create(tmdb_id=tmdb_id, title=f'Movie {tmdb_id}')
+
+    def test_refetches_changed_local_movies_and_advances_checkpoint(self):
+        """Test ids unknown locally are skipped and every feed page is read."""
+        feed = _changes([[1, 99], [3]])
+        with mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=feed), \
+                mock.patch.object(tmdb_service, 'get_movie_details', side_effect=_details) as fetch:
+            stats = run_incremental_sync(concurrency=2, today=TODAY)
+
+        assert sorted(call.args[0] for call in fetch.call_args_list) == [1, 3]
+        assert Movie.objects.get(tmdb_id=3).title == 'Updated 3'
+        assert Movie.objects.get(tmdb_id=2).title == 'Movie 2'
+        assert not Movie.objects.filter(tmdb_id=99).exists()
+        assert (stats['changed'], stats['local'], stats['refreshed']) == (3, 2, 2)
+        state = SyncState.objects.get(name=STATE_NAME)
+        assert state.checkpoint == TODAY
+        assert state.pending_ids == []
+
+    def test_cached_details_are_not_reused(self):
+        """Test a changed movie is refetched even while its detail payload is cached."""
+        key = tmdb_cache.cache_key(
+            'movie/1', {'append_to_response': 'credits,videos,recommendations'}
+        )
+        tmdb_cache.write(key, {'id': 1, 'title': 'Cached 1'}, ttl=3600, stale=3600)
+        upstream = mock.Mock(status_code=200)
+        upstream.json.return_value = _details(1)
+
+        with mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=_changes([[1]])), \
+                mock.patch.object(tmdb_service, 'session') as session:
+            session.get.return_value = upstream
+            run_incremental_sync(today=TODAY)
+
+        assert Movie.objects.get(tmdb_id=1).title == 'Updated 1'
+        assert tmdb_cache.read(key)[0]['title'] == 'Updated 1'
+
+    def test_catches_up_in_fourteen_day_windows(self):
+        """Test a stale checkpoint is replayed window by window."""
+        SyncState.objects.create(name=STATE_NAME, checkpoint=date(2024, 5, 1))
+
+        empty = _changes([[]])
+        with mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=empty) as feed, \
+                mock.patch.object(tmdb_service, 'get_movie_details', side_effect=_details):
+            run_incremental_sync(today=TODAY)
+
+        windows = [(call.args[0], call.args[1]) for call in feed.call_args_list]
+        assert windows == [
+            (date(2024, 5, 1), date(2024, 5, 15)),
+            (date(2024, 5, 15), date(2024, 5, 29)),
+            (date(2024, 5, 29), TODAY),
+        ]
+        assert SyncState.objects.get(name=STATE_NAME).checkpoint == TODAY
+
+    def test_failed_details_are_retried_next_run(self):
+        """Test ids whose details fail stay pending and are fetched again."""
+        def flaky(tmdb_id, fresh=False):
+            return None if tmdb_id == 2 else _details(tmdb_id)
+
+        with mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=_changes([[1, 2]])), \
+                mock.patch.object(tmdb_service, 'get_movie_details', side_effect=flaky):
+            run_incremental_sync(today=TODAY)
+        assert SyncState.objects.get(name=STATE_NAME).pending_ids == [2]
+
+        with mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=_changes([[]])), \
+                mock.patch.object(tmdb_service, 'get_movie_details', side_effect=_details) as fetch:
+            run_incremental_sync(today=TODAY)
+
+        assert [call.args[0] for call in fetch.call_args_list] == [2]
+        assert Movie.objects.get(tmdb_id=2).title == 'Updated 2'
+        assert SyncState.objects.get(name=STATE_NAME).pending_ids == []
+
+    def test_checkpoint_kept_when_change_feed_fails(self):
+        """Test a failed feed page leaves the checkpoint for the next run."""
+        SyncState.objects.create(name=STATE_NAME, checkpoint=date(2024, 5, 30))
+
+        def feed(start_date, end_date, page=1):
+            return None if page == 2 else _changes([[1], [2]])(start_date, end_date, page)
+
+        with mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=feed), \
+                mock.patch.object(tmdb_service, 'get_movie_details', side_effect=_details) as fetch:
+            stats = run_incremental_sync(today=TODAY)
+
+        fetch.assert_not_called()
+        assert stats['completed'] is False
+        assert SyncState.objects.get(name=STATE_NAME).checkpoint == date(2024, 5, 30)
+
+    def test_overlapping_run_is_skipped(self):
+        """Test a run started while another holds the lock leaves the checkpoint alone."""
+        SyncState.objects.create(name=STATE_NAME, checkpoint=date(2024, 5, 30))
+        cache.add(LOCK_KEY, True, 60)
+
+        with mock.patch.object(tmdb_service, 'get_genres', return_value=[]), \
+                mock.patch.object(tmdb_service, 'get_movie_changes') as feed:
+            stats = run_incremental_sync(today=TODAY)
+            out = StringIO()
+            call_command('sync_tmdb', incremental=True, stdout=out)
+
+        feed.assert_not_called()
+        assert stats == {'completed': False, 'skipped': 'locked', 'checkpoint': None}
+        assert 'Another incremental sync is running' in out.getvalue()
+        assert SyncState.objects.get(name=STATE_NAME).checkpoint == date(2024, 5, 30)
+
+        cache.delete(LOCK_KEY)
+        with mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=_changes([[]])):
+            assert run_incremental_sync(today=TODAY)['completed'] is True
+        assert cache.add(LOCK_KEY, True, 60)  # released after the run
+
+    def test_command_runs_incremental_sync(self):
+        """Test sync_tmdb --incremental skips the category pages."""
+        with mock.patch.object(tmdb_service, 'get_genres', return_value=[]), \
+                mock.patch.object(tmdb_service, 'get_movie_changes', side_effect=_changes([[1]])), \
+                mock.patch.object(tmdb_service, 'get_movie_details', side_effect=_details), \
+                mock.patch.object(tmdb_service, 'get_popular_movies') as popular:
+            out = StringIO()
+            call_command('sync_tmdb', incremental=True, stdout=out)
+
+        popular.assert_not_called()
+        assert 'Incremental sync complete' in out.getvalue()
+        assert Movie.objects.get(tmdb_id=1).title == 'Updated 1'
@@ -0,0 +1,100 @@
+"""
+Tests for bulk persistence of TMDb listing results.
+"""
+import pytest
+from apps.movies.models import Genre, Movie
+from apps.movies.services.tmdb_service import TMDbService, content_fingerprint
+
+
+def listing(start, count, genre_ids=(28,)):
+    return [
+        {
+            'id': start + i, 'title': f'Movie {start + i}', 'overview': 'A plot.',
+            'release_date': '2020-01-0%d' % (i % 9 + 1), 'vote_average': 7.0,
+            'vote_count': 100 + i, 'popularity': 50.0 - i, 'genre_ids': list(genre_ids),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkPersist:
+    """Test persist_tmdb_movies upserts pages with a fixed number of queries."""
+
+    def setup_method(self):
+        """Create the genres TMDb listings refer to."""
+        self.action = Genre.objects.create(tmdb_id=28, name='Action')
+        self.drama = Genre.objects.create(tmdb_id=18, name='Drama')
+
+    def test_page_persists_in_a_handful_of_queries(self, django_assert_max_num_queries):
+        """Test a 20-movie page costs a constant number of queries."""
+        TMDbService.persist_tmdb_movies(listing(1, 1))  # warm the genre map
+
+        with django_assert_max_num_queries(10):
+            saved = TMDbService.persist_tmdb_movies(listing(100, 20))
+
+        assert saved == 20
+        assert Movie.objects.filter(genres=self.action).count() == 21
+
+    def test_unknown_genre_does_not_reload_the_genre_map(self, django_assert_max_num_queries):
+        """Test a genre id missing locally is remembered instead of reloaded every batch."""
+        TMDbService.persist_tmdb_movies(listing(1, 1, genre_ids=(28, 99)))
+
+        with django_assert_max_num_queries(1):
+            TMDbService.persist_tmdb_movies(listing(1, 1, genre_ids=(28, 99)))
+
+        Genre.objects.create(tmdb_id=99, name='Mystery')
+        TMDbService.persist_tmdb_movies(listing(2, 1, genre_ids=(99,)))
+        assert Movie.objects.get(tmdb_id=2).genres.get().tmdb_id == 99
+
+    def test_upsert_updates_fields_and_diffs_genres(self):
+        """Test re-persisting updates listing fields and the genre through table."""
+        TMDbService.persist_tmdb_movies(listing(1, 3))
+        Movie.objects.filter(tmdb_id=1).update(runtime=120)
+        items = listing(1, 3, genre_ids=(18,))
+        items[0]['vote_count'] = 999
+        items[1]['genre_ids'] = []
+
+        TMDbService.persist_tmdb_movies(items)
+
+        movie = Movie.objects.get(tmdb_id=1)
+        assert Movie.objects.count() == 3
+        assert movie.vote_count == 999
+        assert movie.runtime == 120  # detail-only fields are left alone
+        assert list(movie.genres.all()) == [self.drama]
+        assert list(Movie.objects.get(tmdb_id=2).genres.all()) == [self.action]
+
+    def test_concurrently_linked_genres_do_not_fail_the_batch(self):
+        """Test genre links another writer already inserted are skipped, not raised."""
+        TMDbService.persist_tmdb_movies(listing(1, 1))
+        movie = Movie.objects.get(tmdb_id=1)
+
+        # As seen by a batch that created the movie: no existing links looked up
+        TMDbService._sync_movie_genres({movie.pk: {self.action.pk, self.drama.pk}}, set())
+
+        assert set(movie.genres.all()) == {self.action, self.drama}
+
+    def test_unchanged_payload_is_not_written(self, django_assert_num_queries):
+        """Test re-persisting an identical page only reads hashes."""
+        TMDbService.persist_tmdb_movies(listing(1, 20))
+        before = dict(Movie.objects.values_list('tmdb_id', 'updated_at'))
+
+        with django_assert_num_queries(1):
+            TMDbService.persist_tmdb_movies(listing(1, 20))
+
+        assert dict(Movie.objects.values_list('tmdb_id', 'updated_at')) == before
+
+    def test_detail_write_stores_listing_fingerprint(self):
+        """Test a detail persist hashes like the bulk path and a changed listing still writes."""
+        TMDbService.persist_tmdb_movies(listing(1, 1))
+        movie = TMDbService.persist_tmdb_movie_detail(
+            {'id': 1, 'title': 'Renamed', 'genres': [{'id': 28, 'name': 'Action'}]}
+        )
+        assert movie.content_hash == content_fingerprint(movie, [self.action.pk])
+        assert Movie.objects.get(tmdb_id=1).content_hash == movie.content_hash
+
+        TMDbService.persist_tmdb_movies(listing(1, 1))
+
+        movie = Movie.objects.get(tmdb_id=1)
+        assert movie.title == 'Movie 1'
+        assert movie.content_hash
@@ -0,0 +1,101 @@
+"""
+Tests for local full-text movie search.
+"""
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.movies.models import Movie
+from apps.movies.services.search import search_movies
+from apps.movies.services.tmdb_service import tmdb_service
+
+
+@pytest.mark.django_db
+class TestLocalSearch:
+    """Test ranking blends text relevance, title similarity and popularity."""
+
+    def setup_method(self):
+        """Create movies matching 'matrix' in different ways."""
+        self.client = APIClient()
+        for tmdb_id, title, overview, popularity in [
+            (1, 'The Matrix', 'A hacker learns the truth.', 60.0),
+            (2, 'The Matrix Reloaded', 'Neo returns.', 40.0),
+            (3, 'Hackers', 'Teenagers escape the matrix of school.', 90.0),
+            (4, 'Matrix Reloaded Fan Cut', '', 1.0),
+            (5, 'Unrelated', 'Nothing to see.', 500.0),
+        ]:
+            Movie.objects.create(
+                tmdb_id=tmdb_id, title=title, overview=overview, popularity=popularity,
+            )
+
+    def test_ranking(self):
+        """Test title matches outrank overview mentions; popularity breaks ties."""
+        movies, total, strong = search_movies('the matrix')
+
+        assert total == 4
+        assert strong == 3  # the overview-only mention is not a strong match
+        assert [m.tmdb_id for m in movies][:2] == [1, 2]
+        assert movies[0].search_score > movies[-1].search_score
+        assert 5 not in [m.tmdb_id for m in movies]
+
+    def test_pagination_and_blank_query(self):
+        """Test pages slice the ranked list; a blank query finds nothing."""
+        first, total, _ = search_movies('matrix', page=1, page_size=2)
+        second, _, _ = search_movies('matrix', page=2, page_size=2)
+
+        assert total == 4
+        assert not {m.id for m in first} & {m.id for m in second}
+        assert search_movies('  ') == ([], 0, 0)
+
+    def test_every_term_must_match(self):
+        """Test stopwords are ignored and the remaining terms are all required."""
+        _, total, _ = search_movies('the matrix truth')
+        assert total == 1
+
+        _, total, _ = search_movies('the truth about nothing')
+        assert total == 0
+
+    def test_endpoint_answers_locally_when_results_are_plentiful(self, settings):
+        """Test TMDb is not called when the catalogue has enough matches."""
+        settings.LOCAL_SEARCH_MIN_RESULTS = 3
+        url = reverse('api_v1:movies:movie-search')
+
+        with mock.patch.object(tmdb_service, 'search_movies') as upstream:
+            response = self.client.get(url, {'q': 'matrix'})
+
+        upstream.assert_not_called()
+        assert response.data['total_results'] == 4
+        assert response.data['results'][0]['title'] == 'The Matrix'
+
+    def test_endpoint_asks_tmdb_when_results_are_thin(self, settings):
+        """Test thin local results fall through to TMDb."""
+        settings.LOCAL_SEARCH_MIN_RESULTS = 3
+        settings.MOVIE_PERSIST_BACKEND = 'inline'
+        url = reverse('api_v1:movies:movie-search')
+        upstream_page = {'results': [{
+            'id': 77, 'title': 'Obscura', 'overview': '', 'release_date': '',
+            'poster_path': None, 'backdrop_path': None, 'vote_average': 6.0,
+            'vote_count': 5, 'popularity': 2.0, 'adult': False,
+        }], 'page': 1, 'total_pages': 1, 'total_results': 1}
+
+        with mock.patch.object(tmdb_service, 'search_movies', return_value=upstream_page):
+            response = self.client.get(url, {'q': 'obscura'})
+
+        assert [m['title'] for m in response.data['results']] == ['Obscura']
+        assert Movie.objects.filter(tmdb_id=77).exists()
+
+    def test_loose_overview_matches_do_not_count_as_local_answers(self, settings):
+        """Test plenty of weak matches still fall through to TMDb."""
+        settings.LOCAL_SEARCH_MIN_RESULTS = 3
+        for tmdb_id in range(10, 15):
+            Movie.objects.create(
+                tmdb_id=tmdb_id, title=f'Drama {tmdb_id}', overview='A city at night.',
+            )
+        url = reverse('api_v1:movies:movie-search')
+
+        with mock.patch.object(tmdb_service, 'search_movies', return_value=None) as upstream:
+            response = self.client.get(url, {'q': 'city'})
+
+        upstream.assert_called_once()
+        assert response.data['total_results'] == 5  # local fallback when TMDb is down
@@ -0,0 +1,159 @@
+"""
+Tests for TMDb response caching with stale-while-revalidate.
+"""
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from apps.movies.services import tmdb_cache
+from apps.movies.services.tmdb_service import TMDbService
+
+
+class InlineExecutor:
+    def submit(self, func, *args):
+        func(*args)
+
+
+def response(payload):
+    resp = mock.Mock(status_code=200)
+    resp.json.return_value = payload
+    return resp
+
+
+class TestTMDbCache:
+    """Test every cached endpoint shares one policy-driven layer."""
+
+    def setup_method(self):
+        """Create a service whose HTTP session is mocked."""
+        self.service = TMDbService()
+        self.service.session = mock.Mock()
+        self.service.session.get.return_value = response({'results': [1], 'page': 1})
+
+    def test_keys_ignore_api_key_param_order_and_types(self):
+        """Test equivalent parameter sets share a cache entry."""
+        assert tmdb_cache.cache_key('search/movie', {'query': 'x', 'page': 1}) == \
+            tmdb_cache.cache_key('search/movie', {'page': '1', 'query': 'x', 'api_key': 'k'})
+        assert tmdb_cache.cache_key('search/movie', {'query': 'x'}) != \
+            tmdb_cache.cache_key('search/movie', {'query': 'y'})
+
+    @pytest.mark.parametrize('call', [
+        lambda s: s.search_movies('alien', 1),
+        lambda s: s.get_popular_movies(2),
+        lambda s: s.get_top_rated_movies(1),
+        lambda s: s.discover_movies(with_genres=28),
+    ])
+    def test_previously_uncached_endpoints_are_cached(self, call):
+        """Test repeat calls are served without hitting TMDb."""
+        assert call(self.service) == call(self.service)
+        assert self.service.session.get.call_count == 1
+
+    def test_stale_entry_served_while_one_refresh_runs(self):
+        """Test an expired entry is returned immediately and refreshed once."""
+        self.service.get_popular_movies(1)
+        key = tmdb_cache.cache_key('movie/popular', {'page': 1})
+        tmdb_cache.write(key, {'results': ['old']}, ttl=-1, stale=60)
+        self.service.session.get.return_value = response({'results': ['new']})
+
+        with mock.patch.object(tmdb_cache, '_get_executor', return_value=InlineExecutor()):
+            stale = self.service.get_popular_movies(1)
+        fresh = self.service.get_popular_movies(1)
+
+        assert stale == {'results': ['old']}
+        assert fresh == {'results': ['new']}
+        assert self.service.session.get.call_count == 2
+
+    def test_failures_are_not_cached(self):
+        """Test a failed upstream call is retried next time."""
+        import requests
+
+        self.service.session.get.side_effect = [requests.exceptions.ConnectionError('down'),
+                                                response({'page': 1})]
+
+        assert self.service.search_movies('x') is None
+        assert self.service.search_movies('x') == {'page': 1}
+
+
+class TestStampedeProtection:
+    """Test concurrent misses are coalesced and hot keys refresh early."""
+
+    def setup_method(self):
+        """Create a service whose HTTP session is slow and mocked."""
+        self.service = TMDbService()
+        self.service.session = mock.Mock()
+
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            return response({'results': [1]})
+
+        self.service.session.get.side_effect = slow_get
+
+    def test_concurrent_misses_make_one_upstream_call(self):
+        """Test threads missing the same key share one request."""
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.service.get_trending_movies()))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self.service.session.get.call_count == 1
+        assert results == [{'results': [1]}] * 10
+
+    def test_waits_for_fetch_in_another_process(self):
+        """Test a held cache lock makes this process wait for the entry."""
+        key = tmdb_cache.cache_key('trending/movie/day', {'page': 1})
+        cache.add(f'{key}:fetching', 1, 30)
+        threading.Timer(
+            0.1, tmdb_cache.write, args=(key, {'results': ['other']}, 60, 60),
+        ).start()
+
+        assert self.service.get_trending_movies() == {'results': ['other']}
+        assert self.service.session.get.call_count == 0
+
+    def test_waiters_serve_expired_copy_instead_of_blocking(self):
+        """Test a follower returns the expired entry while the leader is still fetching."""
+        key = tmdb_cache.cache_key('trending/movie/day', {'page': 1})
+        tmdb_cache.write(key, {'results': ['old']}, ttl=-2, stale=1)
+        self.service.session.get.side_effect = lambda *args, **kwargs: (
+            time.sleep(0.5), response({'results': ['new']}))[1]
+        results = {}
+
+        def call(name):
+            results[name] = self.service.get_trending_movies()
+
+        leader = threading.Thread(target=call, args=('leader',))
+        leader.start()
+        time.sleep(0.05)
+        with mock.patch.object(tmdb_cache, 'FOLLOWER_WAIT', 0.1):
+            call('follower')
+        leader.join()
+
+        assert results == {'follower': {'results': ['old']}, 'leader': {'results': ['new']}}
+        assert self.service.session.get.call_count == 1
+
+    def test_other_process_waiters_serve_expired_copy(self):
+        """Test a held cache lock with an expired entry serves it without fetching."""
+        key = tmdb_cache.cache_key('trending/movie/day', {'page': 1})
+        tmdb_cache.write(key, {'results': ['old']}, ttl=-2, stale=1)
+        cache.add(f'{key}:fetching', 1, 30)
+
+        with mock.patch.object(tmdb_cache, 'FOLLOWER_WAIT', 0.1):
+            assert self.service.get_trending_movies() == {'results': ['old']}
+        assert self.service.session.get.call_count == 0
+
+    def test_early_refresh_probability_grows_near_expiry(self, settings):
+        """Test XFetch flags entries stale before expiry, scaled by fetch time."""
+        settings.TMDB_CACHE_EARLY_REFRESH_BETA = 1.0
+        tmdb_cache.write('near', {'d': 1}, ttl=1, stale=60, delta=2.0)
+        tmdb_cache.write('far', {'d': 1}, ttl=3600, stale=60, delta=2.0)
+
+        assert sum(tmdb_cache.read('near')[1] for _ in range(200)) > 100
+        assert not any(tmdb_cache.read('far')[1] for _ in range(200))
+
+        settings.TMDB_CACHE_EARLY_REFRESH_BETA = 0
+        assert not tmdb_cache.read('near')[1]
@@ -1,32 +1,47 @@
 """Movie views and viewsets."""
-import threading
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.conf import settings
 from django.core.cache import cache
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema, extend_schema_view
-from .models import Movie, Genre
+from .models import Credit, Movie, Genre, WatchHistory
 from .serializers import (
     MovieListSerializer,
     MovieDetailSerializer,
     GenreSerializer,
     TMDbMovieSerializer
 )
-from .services.tmdb_service import tmdb_service, TMDbService
+from .services import local_catalog
+from .services.credits import movies_with_person
+from .services.persistence import persistence_worker
+from .services.tmdb_service import tmdb_service
+
+
+def _tmdb_page_response(data, fallback):
+    """
+    Serialize a page of TMDb results, persisting them in the background so
+    the recommendation engine has data. When TMDb returned nothing (error,
+    or its circuit breaker is open) the page comes from ``fallback()``
+    over the local catalogue instead.
+    """
+    if data and 'results' in data:
+        persistence_worker.submit(data['results'])
+    else:
+        data = fallback()
+    return _page_response(data)
 
 
-def _persist_in_background(results, detail=False):
-    """Fire-and-forget persistence so API response isn't slowed down."""
-    if detail:
-        thread = threading.Thread(
-            target=TMDbService.persist_tmdb_movie_detail, args=(results,), daemon=True
-        )
-    else:
-        thread = threading.Thread(
-            target=TMDbService.persist_tmdb_movies, args=(results,), daemon=True
-        )
-    thread.start()
+def _page_response(data):
+    serializer = TMDbMovieSerializer(data['results'], many=True)
+    return Response({
+        'results': serializer.data,
+        'page': data.get('page', 1),
+        'total_pages': data.get('total_pages', 1),
+        'total_results': data.get('total_results', 0)
+    })
 
 
 @extend_schema_view(
@@ -38,11 +53,51 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Movie.objects.prefetch_related('genres').all()
     permission_classes = [AllowAny]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            credits = Credit.objects.select_related('person').order_by('credit_type', 'order', 'id')
+            queryset = queryset.prefetch_related(Prefetch('credits', queryset=credits))
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return MovieDetailSerializer
         return MovieListSerializer
 
+    @extend_schema(
+        tags=['Movies'],
+        summary='Movies a person is credited on',
+        responses={200: MovieListSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'], url_path=r'person/(?P<person_id>\d+)')
+    def person(self, request, person_id=None):
+        """
+        Movies with this actor / director, from the local credits store.
+
+        Optional filters: ``role=cast|crew`` and ``job`` (e.g. ``Director``).
+        """
+        movie_ids = movies_with_person(
+            person_id,
+            credit_type=request.query_params.get('role'),
+            job=request.query_params.get('job'),
+        )
+        movies = Movie.objects.filter(id__in=movie_ids).order_by('-popularity')
+        return Response(MovieListSerializer(movies, many=True).data)
+
+    @extend_schema(
+        tags=['Movies'],
+        summary='Record that the current user watched a movie',
+        request=None,
+        responses={201: {'type': 'object', 'properties': {'watched_at': {'type': 'string'}}}}
+    )
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
+    def watched(self, request, pk=None):
+        """Add the movie to the user's watch history (drives session recommendations)."""
+        movie = self.get_object()
+        entry = WatchHistory.objects.create(user=request.user, movie=movie)
+        return Response({'watched_at': entry.watched_at}, status=status.HTTP_201_CREATED)
+
     @extend_schema(
         tags=['Movies'],
         summary='Get trending movies from TMDb',
@@ -55,27 +110,19 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
         page = request.query_params.get('page', 1)
 
         data = tmdb_service.get_trending_movies(time_window, page)
-        if data and 'results' in data:
-            # Persist to DB in background so recommendation engine has data
-            _persist_in_background(data['results'])
-
-            serializer = TMDbMovieSerializer(data['results'], many=True)
-            return Response({
-                'results': serializer.data,
-                'page': data.get('page', 1),
-                'total_pages': data.get('total_pages', 1),
-                'total_results': data.get('total_results', 0)
-            })
-        return Response({'results': [], 'page': 1, 'total_pages': 0, 'total_results': 0})
+        return _tmdb_page_response(data, lambda: local_catalog.trending(time_window, page))
 
     @extend_schema(
         tags=['Movies'],
-        summary='Search movies on TMDb',
+        summary='Search movies (local catalogue, TMDb when results are thin)',
         responses={200: TMDbMovieSerializer(many=True)}
     )
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Search movies on TMDb."""
+        """
+        Search the local catalogue; only ask TMDb when fewer than
+        ``LOCAL_SEARCH_MIN_RESULTS`` local movies are strong matches.
+        """
         query = request.query_params.get('q') or request.query_params.get('query', '')
         page = request.query_params.get('page', 1)
 
@@ -83,18 +130,12 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({'error': 'Query parameter "q" or "query" is required'},
                           status=status.HTTP_400_BAD_REQUEST)
 
+        local = local_catalog.search(query, page)
+        if local['strong_matches'] >= settings.LOCAL_SEARCH_MIN_RESULTS:
+            return _page_response(local)
+
         data = tmdb_service.search_movies(query, page)
-        if data and 'results' in data:
-            _persist_in_background(data['results'])
-
-            serializer = TMDbMovieSerializer(data['results'], many=True)
-            return Response({
-                'results': serializer.data,
-                'page': data.get('page', 1),
-                'total_pages': data.get('total_pages', 1),
-                'total_results': data.get('total_results', 0)
-            })
-        return Response({'results': [], 'page': 1, 'total_pages': 0, 'total_results': 0})
+        return _tmdb_page_response(data, lambda: local)
 
     @extend_schema(
         tags=['Movies'],
@@ -106,18 +147,7 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
         """Get popular movies."""
         page = request.query_params.get('page', 1)
         data = tmdb_service.get_popular_movies(page)
-
-        if data and 'results' in data:
-            _persist_in_background(data['results'])
-
-            serializer = TMDbMovieSerializer(data['results'], many=True)
-            return Response({
-                'results': serializer.data,
-                'page': data.get('page', 1),
-                'total_pages': data.get('total_pages', 1),
-                'total_results': data.get('total_results', 0)
-            })
-        return Response({'results': [], 'page': 1, 'total_pages': 0, 'total_results': 0})
+        return _tmdb_page_response(data, lambda: local_catalog.popular(page))
 
     @extend_schema(
         tags=['Movies'],
@@ -129,18 +159,7 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
         """Get top rated movies."""
         page = request.query_params.get('page', 1)
         data = tmdb_service.get_top_rated_movies(page)
-
-        if data and 'results' in data:
-            _persist_in_background(data['results'])
-
-            serializer = TMDbMovieSerializer(data['results'], many=True)
-            return Response({
-                'results': serializer.data,
-                'page': data.get('page', 1),
-                'total_pages': data.get('total_pages', 1),
-                'total_results': data.get('total_results', 0)
-            })
-        return Response({'results': [], 'page': 1, 'total_pages': 0, 'total_results': 0})
+        return _tmdb_page_response(data, lambda: local_catalog.top_rated(page))
 
     @extend_schema(
         tags=['Movies'],
@@ -152,7 +171,11 @@ class MovieViewSet(viewsets.ReadOnlyModelViewSet):
         """Get movie details from TMDb."""
         data = tmdb_service.get_movie_details(tmdb_id)
         if data:
-            _persist_in_background(data, detail=True)
+            persistence_worker.submit_detail(data)
+            return Response(data)
+        # TMDb unavailable (or unknown id): answer from the local catalogue
+        data = local_catalog.movie_detail(tmdb_id) if str(tmdb_id).isdigit() else None
+        if data:
             return Response(data)
         return Response({'error': 'Movie not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -1,5 +1,15 @@
 from django.contrib import admin
-from .models import Recommendation, RecommendationFeedback
+from .models import (
+    EngagementCounter,
+    EngineComparison,
+    FeedbackAggregate,
+    MovieCooccurrence,
+    Recommendation,
+    RecommendationFeedback,
+    RecommendationJob,
+    SuppressedMovie,
+    UserNeighbor,
+)
 
 
 @admin.register(Recommendation)
@@ -13,7 +23,65 @@ class RecommendationAdmin(admin.ModelAdmin):
 
 @admin.register(RecommendationFeedback)
 class RecommendationFeedbackAdmin(admin.ModelAdmin):
-    list_display = ['user', 'recommendation', 'feedback_type', 'created_at']
+    list_display = ['user', 'movie', 'feedback_type', 'created_at']
     list_filter = ['feedback_type', 'created_at']
-    search_fields = ['user__email', 'recommendation__movie__title', 'comment']
+    search_fields = ['user__email', 'movie__title', 'comment']
+    raw_id_fields = ['recommendation', 'movie']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(RecommendationJob)
+class RecommendationJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'status', 'progress', 'engine', 'created_at', 'finished_at']
+    list_filter = ['status', 'engine', 'created_at']
+    search_fields = ['user__email']
+    raw_id_fields = ['user']
+    readonly_fields = ['created_at', 'updated_at', 'started_at', 'finished_at']
+
+
+@admin.register(SuppressedMovie)
+class SuppressedMovieAdmin(admin.ModelAdmin):
+    list_display = ['user', 'movie', 'created_at']
+    search_fields = ['user__email', 'movie__title']
+    raw_id_fields = ['user', 'movie']
+
+
+@admin.register(UserNeighbor)
+class UserNeighborAdmin(admin.ModelAdmin):
+    list_display = ['user', 'neighbor', 'similarity']
+    search_fields = ['user__email', 'neighbor__email']
+    raw_id_fields = ['user', 'neighbor']
+    ordering = ['user', '-similarity']
+
+
+@admin.register(MovieCooccurrence)
+class MovieCooccurrenceAdmin(admin.ModelAdmin):
+    list_display = ['movie', 'related_movie', 'count']
+    search_fields = ['movie__title', 'related_movie__title']
+    raw_id_fields = ['movie', 'related_movie']
+    ordering = ['movie', '-count']
+
+
+@admin.register(EngagementCounter)
+class EngagementCounterAdmin(admin.ModelAdmin):
+    list_display = ['day', 'recommendation_type', 'impressions', 'clicks', 'rates']
+    list_filter = ['recommendation_type', 'day']
+    ordering = ['-day', 'recommendation_type']
+
+
+@admin.register(FeedbackAggregate)
+class FeedbackAggregateAdmin(admin.ModelAdmin):
+    list_display = ['day', 'feedback_type', 'recommendation_type', 'count']
+    list_filter = ['feedback_type', 'recommendation_type', 'day']
+    ordering = ['-day', 'feedback_type']
+
+
+@admin.register(EngineComparison)
+class EngineComparisonAdmin(admin.ModelAdmin):
+    list_display = [
+        'candidate_engine', 'primary_engine', 'user', 'primary_latency_ms',
+        'candidate_latency_ms', 'overlap', 'created_at',
+    ]
+    list_filter = ['candidate_engine', 'primary_engine', 'created_at']
+    raw_id_fields = ['user']
+    ordering = ['-created_at']
@@ -0,0 +1,33 @@
+"""System checks for the recommendation engine settings."""
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_engine_settings(app_configs, **kwargs):
+    """Every engine name used for routing must be registered."""
+    engines = settings.RECOMMENDATION_ENGINES
+    errors = []
+
+    def unknown(name, setting, error_id):
+        errors.append(Error(
+            f'{setting} refers to unknown engine "{name}".',
+            hint=f'Registered engines: {", ".join(sorted(engines))}.',
+            id=error_id,
+        ))
+
+    default = settings.RECOMMENDATION_ENGINE_DEFAULT
+    if default not in engines:
+        unknown(default, 'RECOMMENDATION_ENGINE_DEFAULT', 'recommendations.E001')
+    for name in settings.RECOMMENDATION_ENGINE_COHORTS:
+        if name not in engines:
+            unknown(name, 'RECOMMENDATION_ENGINE_COHORTS', 'recommendations.E002')
+    shadow = settings.RECOMMENDATION_SHADOW_ENGINE
+    if shadow and shadow not in engines:
+        unknown(shadow, 'RECOMMENDATION_SHADOW_ENGINE', 'recommendations.E003')
+    if sum(settings.RECOMMENDATION_ENGINE_COHORTS.values()) > 100:
+        errors.append(Error(
+            'RECOMMENDATION_ENGINE_COHORTS percentages add up to more than 100.',
+            id='recommendations.E004',
+        ))
+    return errors
@@ -0,0 +1,64 @@
+"""
+Management command to apply recommendation data retention.
+
+Usage:
+    python manage.py apply_retention                          # settings defaults
+    python manage.py apply_retention --max-per-type 30 --inactive-days 90
+    python manage.py apply_retention --batch-size 500 --pause 0.5
+
+Deletes in small, throttled batches; safe to run while the site is live.
+Schedule it periodically (cron / Celery beat).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recommendations.services.retention import apply_retention
+
+
+class Command(BaseCommand):
+    help = 'Cap, purge and archive recommendation and feedback rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-per-type',
+            type=int,
+            help='Rows kept per user and recommendation type (default: settings)',
+        )
+        parser.add_argument(
+            '--inactive-days',
+            type=int,
+            help='Purge recommendations of users away this long (default: settings)',
+        )
+        parser.add_argument(
+            '--feedback-days',
+            type=int,
+            help='Archive feedback older than this (default: settings)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Rows deleted per batch (default: settings)',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            help='Seconds to sleep between batches (default: settings)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        stats = apply_retention(
+            max_per_type=options['max_per_type'],
+            inactive_days=options['inactive_days'],
+            feedback_days=options['feedback_days'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+        )
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stats["capped"]} over-cap and {stats["inactive_purged"]} inactive-user '
+            f'recommendations removed, {stats["feedback_archived"]} feedback rows archived '
+            f'in {elapsed:.1f}s'
+        ))
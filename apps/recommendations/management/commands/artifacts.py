@@ -0,0 +1,70 @@
+"""
+Management command to inspect and roll model artifacts.
+
+Usage:
+    python manage.py artifacts                                # list all artifacts
+    python manage.py artifacts --name text_neighbors          # versions of one artifact
+    python manage.py artifacts --name text_neighbors --activate 20261019T082400000000Z
+    python manage.py artifacts --name text_neighbors --prune --keep 2
+
+Activating swaps the artifact's CURRENT pointer; running workers pick the
+version up within a few seconds without a restart.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.recommendations.services.artifacts import (
+    KEEP_VERSIONS,
+    ArtifactError,
+    registry,
+)
+
+
+class Command(BaseCommand):
+    help = 'List, activate (roll forward / back) and prune versioned model artifacts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--name',
+            help='Artifact name (default: list every artifact)',
+        )
+        parser.add_argument(
+            '--activate',
+            metavar='VERSION',
+            help='Make VERSION the active version of --name',
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete old versions of --name, keeping the newest --keep',
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=KEEP_VERSIONS,
+            help=f'Versions kept by --prune (default: {KEEP_VERSIONS})',
+        )
+
+    def handle(self, *args, **options):
+        name = options['name']
+        if (options['activate'] or options['prune']) and not name:
+            raise CommandError('--activate and --prune require --name')
+
+        if options['activate']:
+            try:
+                registry.activate(name, options['activate'])
+            except ArtifactError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(f'✅ {name} now at {options["activate"]}'))
+
+        if options['prune']:
+            removed = registry.prune(name, keep=options['keep'])
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Removed {len(removed)} old version(s) of {name}'
+            ))
+
+        for artifact_name in [name] if name else registry.names():
+            current = registry.current_version(artifact_name)
+            self.stdout.write(f'{artifact_name}:')
+            for version in registry.versions(artifact_name):
+                marker = '*' if version == current else ' '
+                self.stdout.write(f'  {marker} {version}')
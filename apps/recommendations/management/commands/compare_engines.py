@@ -0,0 +1,64 @@
+"""
+Management command to summarise shadow comparisons between engines.
+
+Usage:
+    python manage.py compare_engines                      # all recorded comparisons
+    python manage.py compare_engines --candidate fast --days 7
+    python manage.py compare_engines --json
+
+Enable shadowing with RECOMMENDATION_SHADOW_ENGINE / _SAMPLE_RATE, then
+promote a candidate (RECOMMENDATION_ENGINE_COHORTS, then
+RECOMMENDATION_ENGINE_DEFAULT) once its numbers hold up.
+"""
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.recommendations.services.engine_registry import summarize
+
+
+class Command(BaseCommand):
+    help = 'Compare shadow-run candidate engines with the primary on live traffic'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--candidate',
+            help='Only report this candidate engine',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Only include comparisons from the last N days',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the summary as JSON',
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days']) if options['days'] else None
+        rows = summarize(candidate_name=options['candidate'], since=since)
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        if not rows:
+            self.stdout.write(self.style.WARNING('No shadow comparisons recorded yet'))
+            return
+
+        for row in rows:
+            candidate, primary = row['candidate_latency_ms'], row['primary_latency_ms']
+            self.stdout.write(
+                f'  {row["candidate"]} vs {row["primary"]}: {row["runs"]} runs '
+                f'({row["errors"]} errors); '
+                f'p50 {candidate["p50"]}ms vs {primary["p50"]}ms, '
+                f'p99 {candidate["p99"]}ms vs {primary["p99"]}ms; '
+                f'queries {row["candidate_queries"]} vs {row["primary_queries"]}; '
+                f'overlap {row["overlap"]}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(rows)} engine pair(s) compared'))
@@ -0,0 +1,57 @@
+"""
+Management command to precompute user-user neighbour lists.
+
+Usage:
+    python manage.py compute_user_neighbors                   # top 20 per user
+    python manage.py compute_user_neighbors --k 50 --chunk-size 500
+
+Schedule it periodically (cron / Celery beat) — the recommendation engine
+reads whatever the last run stored.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recommendations.services.neighbors import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_K,
+    compute_user_neighbors,
+)
+
+
+class Command(BaseCommand):
+    help = 'Compute each user\'s top-K nearest neighbours by cosine similarity'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=DEFAULT_K,
+            help=f'Neighbours to keep per user (default: {DEFAULT_K})',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Users per sparse matrix product (default: {DEFAULT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--min-similarity',
+            type=float,
+            default=0.0,
+            help='Drop neighbours at or below this similarity (default: 0.0)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        stats = compute_user_neighbors(
+            k=options['k'],
+            chunk_size=options['chunk_size'],
+            min_similarity=options['min_similarity'],
+        )
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stats["neighbors"]} neighbours stored for {stats["users"]} users '
+            f'({stats["deleted_stale"]} stale rows removed) in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,128 @@
+"""
+Management command to evaluate recommendation engine configurations offline.
+
+Usage:
+    python manage.py evaluate_recommender                          # baseline weights
+    python manage.py evaluate_recommender --k 20 --holdout 3
+    python manage.py evaluate_recommender --config variants.json --output run.json
+
+The config file is a JSON list of engine configurations:
+
+    [
+        {"name": "baseline"},
+        {"name": "more-genre", "weights": {"genre": 0.6, "popularity": 0.05}},
+        {"name": "more-variety", "diversity_lambda": 0.5}
+    ]
+"""
+import json
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.recommendations.services.evaluation import DEFAULT_CONFIGS, RecommenderEvaluator
+from apps.recommendations.services.recommendation_engine import DEFAULT_WEIGHTS
+
+
+class Command(BaseCommand):
+    help = 'Evaluate recommendation engine configurations against held-out user history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--config',
+            help='Path to a JSON file listing engine configurations (default: baseline only)',
+        )
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=10,
+            help='Cut-off rank for precision/recall/NDCG (default: 10)',
+        )
+        parser.add_argument(
+            '--holdout',
+            type=int,
+            default=2,
+            help='Most recent favourites/ratings held out per user (default: 2)',
+        )
+        parser.add_argument(
+            '--max-users',
+            type=int,
+            default=None,
+            help='Only evaluate the first N eligible users',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON report to this path instead of stdout',
+        )
+
+    def handle(self, *args, **options):
+        configs = self._load_configs(options['config'])
+
+        evaluator = RecommenderEvaluator(
+            configs=configs,
+            k=options['k'],
+            holdout=options['holdout'],
+            max_users=options['max_users'],
+        )
+        report = evaluator.run()
+        report['generated_at'] = timezone.now().isoformat()
+        report['git_commit'] = self._git_commit()
+
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                fh.write(payload + '\n')
+            self._print_summary(report)
+            self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(payload)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_configs(path):
+        """Read and validate engine configurations from a JSON file."""
+        if not path:
+            return DEFAULT_CONFIGS
+
+        try:
+            with open(path, encoding='utf-8') as fh:
+                configs = json.load(fh)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Could not read config file {path}: {exc}')
+
+        if not isinstance(configs, list) or not configs:
+            raise CommandError('Config file must contain a non-empty JSON list')
+
+        for config in configs:
+            unknown = set(config.get('weights') or {}) - set(DEFAULT_WEIGHTS)
+            if unknown:
+                raise CommandError(
+                    f'Unknown weight(s) in config "{config.get("name")}": '
+                    f'{", ".join(sorted(unknown))}'
+                )
+        return configs
+
+    @staticmethod
+    def _git_commit():
+        """Current commit hash, so reports can be compared across revisions."""
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True,
+            ).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _print_summary(self, report):
+        self.stdout.write(
+            f'  {report["users"]} users, k={report["k"]}, holdout={report["holdout"]}'
+        )
+        for config in report['configs']:
+            metrics = ', '.join(f'{k}={v:.4f}' for k, v in config['metrics'].items())
+            self.stdout.write(
+                f'  {config["name"]}: {metrics}; '
+                f'p50={config["latency_ms"]["p50"]}ms p99={config["latency_ms"]["p99"]}ms; '
+                f'queries~{config["queries"]["mean"]}'
+            )
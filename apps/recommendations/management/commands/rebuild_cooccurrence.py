@@ -0,0 +1,62 @@
+"""
+Management command to rebuild or prune item co-occurrence counts.
+
+Usage:
+    python manage.py rebuild_cooccurrence                  # full rebuild, top 100 per movie
+    python manage.py rebuild_cooccurrence --top-n 50
+    python manage.py rebuild_cooccurrence --prune-only     # just trim to top-N
+
+Counts are maintained incrementally as favourites change; a rebuild
+restores exact counts after pruning or bulk data loads.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recommendations.services.cooccurrence import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_TOP_N,
+    prune_cooccurrences,
+    rebuild_cooccurrences,
+)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild "users who liked X also liked Y" co-occurrence counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-n',
+            type=int,
+            default=DEFAULT_TOP_N,
+            help=f'Related movies to keep per movie (default: {DEFAULT_TOP_N})',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Movies per sparse matrix product (default: {DEFAULT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--prune-only',
+            action='store_true',
+            help='Only prune existing rows to the top-N, skip the rebuild',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        if options['prune_only']:
+            deleted = prune_cooccurrences(top_n=options['top_n'])
+            self.stdout.write(self.style.SUCCESS(f'✅ Pruned {deleted} co-occurrence rows'))
+            return
+
+        stats = rebuild_cooccurrences(
+            top_n=options['top_n'],
+            chunk_size=options['chunk_size'],
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stats["rows"]} co-occurrence rows for {stats["movies"]} movies '
+            f'({stats["deleted_stale"]} stale rows removed) in {elapsed:.1f}s'
+        ))
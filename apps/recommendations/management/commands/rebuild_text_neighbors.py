@@ -0,0 +1,82 @@
+"""
+Management command to rebuild overview-text content neighbours.
+
+Usage:
+    python manage.py rebuild_text_neighbors                   # top 20 per movie
+    python manage.py rebuild_text_neighbors --k 50 --block-size 500
+    python manage.py rebuild_text_neighbors --incremental     # new / hydrated movies only
+
+Publishes a new ``text_neighbors`` artifact version; running workers pick
+it up without a restart. ``--incremental`` folds in movies saved since the
+last publish; run it from cron every few minutes. Full rebuilds then only
+need to run periodically (IDF drift, deletions, edited overviews).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recommendations.services.text_similarity import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_K,
+    MIN_SIMILARITY,
+    rebuild_text_neighbors,
+    update_text_neighbors,
+)
+
+
+class Command(BaseCommand):
+    help = 'Compute top-K overview-text neighbours per movie (hashed TF-IDF)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=DEFAULT_K,
+            help=f'Neighbours to keep per movie (default: {DEFAULT_K})',
+        )
+        parser.add_argument(
+            '--block-size',
+            type=int,
+            default=DEFAULT_BLOCK_SIZE,
+            help=f'Movies per sparse matrix product (default: {DEFAULT_BLOCK_SIZE})',
+        )
+        parser.add_argument(
+            '--min-similarity',
+            type=float,
+            default=MIN_SIMILARITY,
+            help=f'Drop neighbours at or below this similarity (default: {MIN_SIMILARITY})',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only fold movies saved since the last publish into the current version',
+        )
+
+    def handle(self, *args, **options):
+        if options['incremental']:
+            self._update(options['block_size'])
+            return
+
+        started = time.monotonic()
+        stats = rebuild_text_neighbors(
+            k=options['k'],
+            block_size=options['block_size'],
+            min_similarity=options['min_similarity'],
+        )
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Text neighbours for {stats["movies"]} movies published as '
+            f'{stats["version"]} in {elapsed:.1f}s'
+        ))
+
+    def _update(self, block_size):
+        stats = update_text_neighbors(block_size=block_size)
+        if stats['version'] is None:
+            self.stdout.write(self.style.WARNING(
+                'No text neighbours published yet; run a full rebuild first'
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stats["added"]} movies folded into text neighbours ({stats["version"]})'
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_alter_rating_unique_together_remove_rating_movie_and_more'),
+        ('recommendations', '0003_userneighbor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='movies.movie')),
+                ('related_movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['movie', '-count'], name='recommendat_movie_i_d0a683_idx')],
+                'unique_together': {('movie', 'related_movie')},
+            },
+        ),
+    ]
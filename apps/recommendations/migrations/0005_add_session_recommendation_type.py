@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0004_moviecooccurrence'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recommendation',
+            name='recommendation_type',
+            field=models.CharField(choices=[('collaborative', 'Collaborative Filtering'), ('content_based', 'Content-Based'), ('hybrid', 'Hybrid'), ('trending', 'Trending'), ('personalized', 'Personalized'), ('session', 'Session-Based')], default='personalized', max_length=20),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0005_add_session_recommendation_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EngagementCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('recommendation_type', models.CharField(choices=[('collaborative', 'Collaborative Filtering'), ('content_based', 'Content-Based'), ('hybrid', 'Hybrid'), ('trending', 'Trending'), ('personalized', 'Personalized'), ('session', 'Session-Based')], max_length=20)),
+                ('impressions', models.PositiveBigIntegerField(default=0)),
+                ('clicks', models.PositiveBigIntegerField(default=0)),
+                ('rates', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day', 'recommendation_type'],
+                'unique_together': {('day', 'recommendation_type')},
+            },
+        ),
+    ]
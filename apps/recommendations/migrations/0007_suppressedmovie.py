@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_feedback_and_suppressions(apps, schema_editor):
+    """Copy movie ids onto feedback rows and seed the suppression list."""
+    RecommendationFeedback = apps.get_model('recommendations', 'RecommendationFeedback')
+    SuppressedMovie = apps.get_model('recommendations', 'SuppressedMovie')
+
+    feedbacks = RecommendationFeedback.objects.filter(
+        movie__isnull=True, recommendation__isnull=False,
+    ).select_related('recommendation')
+    for feedback in feedbacks.iterator():
+        feedback.movie_id = feedback.recommendation.movie_id
+        feedback.save(update_fields=['movie'])
+
+    SuppressedMovie.objects.bulk_create(
+        [
+            SuppressedMovie(user_id=user_id, movie_id=movie_id)
+            for user_id, movie_id in (
+                RecommendationFeedback.objects
+                .filter(feedback_type__in=['dislike', 'not_interested'], movie__isnull=False)
+                .values_list('user_id', 'movie_id')
+                .distinct()
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('movies', '0003_alter_rating_unique_together_remove_rating_movie_and_more'),
+        ('recommendations', '0006_engagementcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationfeedback',
+            name='movie',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_feedbacks', to='movies.movie'),
+        ),
+        migrations.AlterField(
+            model_name='recommendationfeedback',
+            name='recommendation',
+            field=models.ForeignKey(blank=True, help_text='Cleared when the recommendation is refreshed away', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='feedbacks', to='recommendations.recommendation'),
+        ),
+        migrations.CreateModel(
+            name='SuppressedMovie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suppressed_movies', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'movie')},
+            },
+        ),
+        migrations.RunPython(backfill_feedback_and_suppressions, migrations.RunPython.noop),
+    ]
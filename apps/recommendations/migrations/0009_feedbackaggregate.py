@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0008_recommendationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('feedback_type', models.CharField(choices=[('like', 'Like'), ('dislike', 'Dislike'), ('not_interested', 'Not Interested')], max_length=20)),
+                ('recommendation_type', models.CharField(blank=True, help_text='Type of the recommendation the feedback was on (blank if unknown)', max_length=20)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day', 'feedback_type'],
+                'unique_together': {('day', 'feedback_type', 'recommendation_type')},
+            },
+        ),
+    ]
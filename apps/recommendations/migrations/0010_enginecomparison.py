@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recommendations', '0009_feedbackaggregate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationjob',
+            name='engine',
+            field=models.CharField(blank=True, help_text='Registered engine to run (blank: chosen by cohort)', max_length=50),
+        ),
+        migrations.CreateModel(
+            name='EngineComparison',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('primary_engine', models.CharField(max_length=50)),
+                ('candidate_engine', models.CharField(max_length=50)),
+                ('primary_latency_ms', models.FloatField()),
+                ('candidate_latency_ms', models.FloatField(blank=True, null=True)),
+                ('primary_queries', models.PositiveIntegerField()),
+                ('candidate_queries', models.PositiveIntegerField(blank=True, null=True)),
+                ('overlap', models.FloatField(blank=True, help_text="Share of the primary's movies the candidate also returned (0-1)", null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['candidate_engine', 'created_at'], name='recommendat_candida_349b0a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+def fail_duplicate_active_jobs(apps, schema_editor):
+    """Keep only each user's newest active job so the constraint can be added."""
+    RecommendationJob = apps.get_model('recommendations', 'RecommendationJob')
+
+    seen = set()
+    duplicates = []
+    for job_id, user_id in (
+        RecommendationJob.objects
+        .filter(status__in=['pending', 'running'])
+        .order_by('user_id', '-created_at', '-id')
+        .values_list('id', 'user_id')
+    ):
+        if user_id in seen:
+            duplicates.append(job_id)
+        seen.add(user_id)
+    RecommendationJob.objects.filter(id__in=duplicates).update(
+        status='failed', error='Superseded by a newer active job',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0010_enginecomparison'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_duplicate_active_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='recommendationjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ('pending', 'running'))), fields=('user',), name='unique_active_recommendation_job'),
+        ),
+    ]
@@ -13,6 +13,7 @@ class Recommendation(BaseModel):
         ('hybrid', 'Hybrid'),
         ('trending', 'Trending'),
         ('personalized', 'Personalized'),
+        ('session', 'Session-Based'),
     ]
 
     user = models.ForeignKey(
@@ -74,8 +75,18 @@ class RecommendationFeedback(BaseModel):
     )
     recommendation = models.ForeignKey(
         Recommendation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='feedbacks',
+        help_text="Cleared when the recommendation is refreshed away"
+    )
+    movie = models.ForeignKey(
+        Movie,
         on_delete=models.CASCADE,
-        related_name='feedbacks'
+        null=True,
+        blank=True,
+        related_name='recommendation_feedbacks'
     )
     feedback_type = models.CharField(
         max_length=20,
@@ -91,4 +102,253 @@ class RecommendationFeedback(BaseModel):
         unique_together = [['user', 'recommendation']]
 
     def __str__(self):
-        return f"{self.user.email} - {self.feedback_type} - {self.recommendation.movie.title}"
+        title = self.movie.title if self.movie_id else '(deleted)'
+        return f"{self.user.email} - {self.feedback_type} - {title}"
+
+
+class SuppressedMovie(models.Model):
+    """
+    Movies a user never wants recommended again ("not interested" / dislike).
+
+    Keyed by movie rather than by ``Recommendation`` so dismissals survive
+    recommendation refreshes. Read in one query per generation.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='suppressed_movies'
+    )
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [['user', 'movie']]
+
+    def __str__(self):
+        return f"{self.user_id} ✕ {self.movie_id}"
+
+
+class UserNeighbor(models.Model):
+    """
+    Precomputed nearest neighbours of a user.
+
+    Rebuilt periodically by ``compute_user_neighbors`` from cosine
+    similarity over favourite / rating vectors. Kept deliberately narrow
+    (no timestamps, no text) because it holds ``users × K`` rows.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='neighbors'
+    )
+    neighbor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    similarity = models.FloatField(
+        help_text="Cosine similarity between the two users (0-1)"
+    )
+
+    class Meta:
+        unique_together = [['user', 'neighbor']]
+
+    def __str__(self):
+        return f"{self.user_id} ~ {self.neighbor_id} ({self.similarity:.3f})"
+
+
+class MovieCooccurrence(models.Model):
+    """
+    "Users who liked X also liked Y" counts.
+
+    ``count`` is the number of users who favourited both movies. Rows are
+    stored in both directions so neighbours of a movie are one index scan,
+    maintained incrementally on favourite add/remove and pruned to the
+    top-N per movie.
+    """
+
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='cooccurrences'
+    )
+    related_movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [['movie', 'related_movie']]
+        indexes = [
+            models.Index(fields=['movie', '-count']),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} ↔ {self.related_movie_id} ({self.count})"
+
+
+class EngagementCounter(models.Model):
+    """
+    Daily aggregate of recommendation engagement per recommendation type.
+
+    Incremented in bulk by the engagement buffer flush, so reporting
+    never needs to scan the ``Recommendation`` table.
+    """
+
+    day = models.DateField()
+    recommendation_type = models.CharField(
+        max_length=20,
+        choices=Recommendation.RECOMMENDATION_TYPES
+    )
+    impressions = models.PositiveBigIntegerField(default=0)
+    clicks = models.PositiveBigIntegerField(default=0)
+    rates = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day', 'recommendation_type']
+        unique_together = [['day', 'recommendation_type']]
+
+    def __str__(self):
+        return f"{self.day} {self.recommendation_type}: {self.impressions} imp / {self.clicks} clk"
+
+
+class RecommendationJob(BaseModel):
+    """
+    A queued recommendation refresh.
+
+    ``POST /recommendations/refresh/`` creates one and returns immediately;
+    the work runs on a Celery worker (or the local worker pool) and
+    clients poll the job for progress and the finished result.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    ACTIVE_STATUSES = ('pending', 'running')
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendation_jobs'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Completion percentage (0-100)"
+    )
+    limit = models.PositiveSmallIntegerField(default=20)
+    engine = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Registered engine to run (blank: chosen by cohort)"
+    )
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Summary of the finished run (count, partial flag)"
+    )
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'status']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(status__in=('pending', 'running')),
+                name='unique_active_recommendation_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk} for {self.user_id} ({self.status}, {self.progress}%)"
+
+    @property
+    def is_finished(self):
+        return self.status not in self.ACTIVE_STATUSES
+
+
+class FeedbackAggregate(models.Model):
+    """
+    Daily feedback counts archived from old ``RecommendationFeedback`` rows.
+
+    Written by the retention job before it deletes the detailed rows, so
+    long-term feedback trends survive without keeping every comment.
+    Dismissals themselves live on in ``SuppressedMovie``.
+    """
+
+    day = models.DateField()
+    feedback_type = models.CharField(
+        max_length=20,
+        choices=RecommendationFeedback.FEEDBACK_TYPES
+    )
+    recommendation_type = models.CharField(
+        max_length=20,
+        blank=True,
+        help_text="Type of the recommendation the feedback was on (blank if unknown)"
+    )
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day', 'feedback_type']
+        unique_together = [['day', 'feedback_type', 'recommendation_type']]
+
+    def __str__(self):
+        return f"{self.day} {self.feedback_type} ({self.recommendation_type or '-'}): {self.count}"
+
+
+class EngineComparison(models.Model):
+    """
+    One shadow run of a candidate engine against the primary's output.
+
+    Recorded on a sample of live generations so candidate engines can be
+    promoted on measured latency, query cost and agreement with the
+    primary rather than on offline numbers alone.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    primary_engine = models.CharField(max_length=50)
+    candidate_engine = models.CharField(max_length=50)
+    primary_latency_ms = models.FloatField()
+    candidate_latency_ms = models.FloatField(null=True, blank=True)
+    primary_queries = models.PositiveIntegerField()
+    candidate_queries = models.PositiveIntegerField(null=True, blank=True)
+    overlap = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Share of the primary's movies the candidate also returned (0-1)"
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['candidate_engine', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_engine} vs {self.primary_engine} ({self.overlap})"
@@ -1,6 +1,8 @@
 """Recommendation serializers."""
 from rest_framework import serializers
-from .models import Recommendation, RecommendationFeedback
+from .models import Recommendation, RecommendationFeedback, RecommendationJob
+from .services import suppression
+from .services.engagement import EVENT_TYPES
 from apps.movies.serializers import MovieListSerializer
 
 
@@ -22,8 +24,9 @@ class RecommendationFeedbackSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = RecommendationFeedback
-        fields = ['id', 'recommendation', 'feedback_type', 'comment', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'recommendation', 'movie', 'feedback_type', 'comment', 'created_at']
+        read_only_fields = ['id', 'movie', 'created_at']
+        extra_kwargs = {'recommendation': {'allow_null': False, 'required': True}}
 
     def validate_recommendation(self, value):
         """Ensure the recommendation belongs to the requesting user."""
@@ -34,12 +37,56 @@ class RecommendationFeedbackSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
+        recommendation = validated_data['recommendation']
         feedback, _ = RecommendationFeedback.objects.update_or_create(
             user=validated_data['user'],
-            recommendation=validated_data['recommendation'],
+            recommendation=recommendation,
             defaults={
+                'movie_id': recommendation.movie_id,
                 'feedback_type': validated_data['feedback_type'],
                 'comment': validated_data.get('comment', ''),
             },
         )
+        # Dismissals must outlive the recommendation row itself.
+        suppression.apply_feedback(
+            validated_data['user'], recommendation.movie_id, validated_data['feedback_type']
+        )
         return feedback
+
+
+class RecommendationJobSerializer(serializers.ModelSerializer):
+    """Serializer for background recommendation refresh jobs."""
+
+    class Meta:
+        model = RecommendationJob
+        fields = [
+            'id', 'status', 'progress', 'result', 'error',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+
+class EngagementEventSerializer(serializers.Serializer):
+    """
+    A single impression / click / rate beacon for a recommendation.
+    Session-blended items have no stored recommendation (``id: null``);
+    their events, like unknown ids, are counted as ignored.
+    """
+    recommendation = serializers.IntegerField(allow_null=True)
+    event = serializers.ChoiceField(choices=EVENT_TYPES)
+
+
+class EngagementBatchSerializer(serializers.Serializer):
+    """A batch of engagement beacons."""
+    MAX_EVENTS = 500
+
+    events = EngagementEventSerializer(many=True)
+
+    def validate_events(self, value):
+        if not value:
+            raise serializers.ValidationError("At least one event is required.")
+        if len(value) > self.MAX_EVENTS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_EVENTS} events can be sent per batch."
+            )
+        return value
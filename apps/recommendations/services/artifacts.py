@@ -0,0 +1,215 @@
+"""
+Versioned model artifact registry.
+
+Offline jobs publish NumPy arrays (factor matrices, neighbour lists,
+feature stores) under ``settings.ML_MODELS_DIR``::
+
+    <ML_MODELS_DIR>/<name>/
+        CURRENT                  # text file holding the active version
+        20261019T082400Z/
+            metadata.json        # free-form metadata + array shapes/dtypes
+            <array>.npy
+        20261020T082400Z/
+            ...
+
+Readers open arrays with ``np.load(mmap_mode='r')``, so every gunicorn
+worker maps the same file pages through the OS page cache instead of
+holding its own copy. Publishing writes a complete version directory
+first and then swaps ``CURRENT`` with ``os.replace``; readers re-check the
+pointer at most every ``check_interval`` seconds and switch to the new
+version without a restart. Rolling back is ``activate(name, old_version)``.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = 'CURRENT'
+METADATA_FILE = 'metadata.json'
+CHECK_INTERVAL = 5.0  # seconds between CURRENT pointer checks
+KEEP_VERSIONS = 3
+
+
+class ArtifactError(Exception):
+    """Raised when an artifact cannot be published or activated."""
+
+
+class Artifact:
+    """One immutable version of a named artifact; arrays are memory-mapped on first use."""
+
+    def __init__(self, name, version, path):
+        self.name = name
+        self.version = version
+        self.path = path
+        with open(os.path.join(path, METADATA_FILE), encoding='utf-8') as fh:
+            self.metadata = json.load(fh)
+        self._arrays = {}
+
+    def __getitem__(self, key):
+        array = self._arrays.get(key)
+        if array is None:
+            file_path = os.path.join(self.path, f'{key}.npy')
+            if not os.path.exists(file_path):
+                raise KeyError(key)
+            array = np.load(file_path, mmap_mode='r', allow_pickle=False)
+            self._arrays[key] = array
+        return array
+
+    def __contains__(self, key):
+        return key in self.metadata.get('arrays', {})
+
+    def __repr__(self):
+        return f'<Artifact {self.name}@{self.version}>'
+
+
+class ArtifactRegistry:
+    """Publish, activate and load versioned artifacts under a root directory."""
+
+    def __init__(self, root=None, check_interval=CHECK_INTERVAL):
+        self._root = root
+        self.check_interval = check_interval
+        self._loaded = {}  # name -> (Artifact, checked_at)
+        self._lock = threading.Lock()
+
+    @property
+    def root(self):
+        return str(self._root or settings.ML_MODELS_DIR)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, name):
+        """
+        Return the active ``Artifact`` for ``name``, or ``None`` if nothing
+        has been published yet. Picks up newly activated versions.
+        """
+        now = time.monotonic()
+        cached = self._loaded.get(name)
+        if cached and now - cached[1] < self.check_interval:
+            return cached[0]
+
+        with self._lock:
+            cached = self._loaded.get(name)
+            version = self.current_version(name)
+            if version is None:
+                self._loaded.pop(name, None)
+                return None
+            if cached and cached[0].version == version:
+                artifact = cached[0]
+            else:
+                artifact = Artifact(name, version, self._version_path(name, version))
+                logger.info(f"Loaded artifact {name}@{version}")
+            self._loaded[name] = (artifact, now)
+            return artifact
+
+    def current_version(self, name):
+        """Version named by the ``CURRENT`` pointer, or ``None``."""
+        try:
+            with open(os.path.join(self.root, name, POINTER_FILE), encoding='utf-8') as fh:
+                return fh.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def versions(self, name):
+        """Published versions of ``name``, oldest first."""
+        base = os.path.join(self.root, name)
+        if not os.path.isdir(base):
+            return []
+        return sorted(
+            entry for entry in os.listdir(base)
+            if not entry.startswith('.')
+            and os.path.isfile(os.path.join(base, entry, METADATA_FILE))
+        )
+
+    def names(self):
+        """Names of all artifacts with at least one published version."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(entry for entry in os.listdir(self.root) if self.versions(entry))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def publish(self, name, arrays, metadata=None, version=None, activate=True):
+        """
+        Write ``arrays`` ({key: ndarray}) as a new version of ``name``.
+
+        The version directory is assembled under a temporary name and
+        renamed into place, so readers never see a half-written version.
+        Returns the new version string.
+        """
+        version = version or timezone.now().strftime('%Y%m%dT%H%M%S%fZ')
+        base = os.path.join(self.root, name)
+        final_path = os.path.join(base, version)
+        if os.path.exists(final_path):
+            raise ArtifactError(f'Artifact {name}@{version} already exists')
+        os.makedirs(base, exist_ok=True)
+
+        staging = tempfile.mkdtemp(prefix=f'.{version}-', dir=base)
+        try:
+            shapes = {}
+            for key, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                np.save(os.path.join(staging, f'{key}.npy'), array, allow_pickle=False)
+                shapes[key] = {'shape': list(array.shape), 'dtype': str(array.dtype)}
+            with open(os.path.join(staging, METADATA_FILE), 'w', encoding='utf-8') as fh:
+                json.dump({
+                    **(metadata or {}),
+                    'name': name,
+                    'version': version,
+                    'created_at': timezone.now().isoformat(),
+                    'arrays': shapes,
+                }, fh, indent=2, sort_keys=True)
+            os.rename(staging, final_path)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(name, version)
+        return version
+
+    def activate(self, name, version):
+        """Atomically point ``CURRENT`` at an existing version."""
+        if version not in self.versions(name):
+            raise ArtifactError(f'Artifact {name}@{version} does not exist')
+
+        base = os.path.join(self.root, name)
+        fd, tmp_path = tempfile.mkstemp(prefix='.CURRENT-', dir=base)
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(version + '\n')
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, os.path.join(base, POINTER_FILE))
+        logger.info(f"Activated artifact {name}@{version}")
+
+    def prune(self, name, keep=KEEP_VERSIONS):
+        """Delete all but the newest ``keep`` versions (never the active one)."""
+        current = self.current_version(name)
+        versions = self.versions(name)
+        removed = []
+        for version in versions[:max(len(versions) - keep, 0)]:
+            if version == current:
+                continue
+            # Workers still mapping the files keep their pages until they reload
+            shutil.rmtree(os.path.join(self.root, name, version))
+            removed.append(version)
+        return removed
+
+    def _version_path(self, name, version):
+        return os.path.join(self.root, name, version)
+
+
+# Process-wide registry rooted at settings.ML_MODELS_DIR
+registry = ArtifactRegistry()
@@ -0,0 +1,229 @@
+"""
+Item-item co-occurrence ("users who liked X also liked Y").
+
+The ``MovieCooccurrence`` table holds, for every pair of movies, how many
+users favourited both. It is kept up to date incrementally: adding or
+removing a favourite only touches the pairs formed with *that user's*
+other favourites, so the cost is O(user's favourites) instead of the
+O(users × favourites²) of recomputing on the fly. Each direction of a
+pair is inserted if missing and then incremented in the database, so
+concurrent adds never lose a count and a pair pruned in one direction
+is restored on its next increment.
+
+Deletes that remove several favourites at once (queryset deletes, a
+user's cascade) only send ``post_delete`` once every row is gone, so the
+favourites being deleted are registered on ``pre_delete``; each pair
+among them is then decremented exactly once.
+
+Two maintenance operations keep it bounded and exact:
+
+  * ``prune_cooccurrences`` keeps the top-N related movies per movie.
+    A pruned pair that is later incremented restarts from 1, so counts
+    in the long tail are approximate until the next rebuild (schedule
+    the rebuild periodically to correct any drift).
+  * ``rebuild_cooccurrences`` recomputes everything from ``Favorite``
+    with chunked sparse products (offline only — imports scipy lazily).
+"""
+import logging
+import threading
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Window
+from django.db.models.functions import RowNumber
+
+from apps.favorites.models import Favorite
+from apps.recommendations.models import MovieCooccurrence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_N = 100
+DEFAULT_CHUNK_SIZE = 2000
+DELETE_BATCH_SIZE = 5000
+
+# Per-thread {user_id: {'origin', 'pending': set, 'removed': set}} for the
+# delete in flight. Keyed by the delete's origin, so state left behind by a
+# delete that failed between pre_delete and post_delete is never reused.
+_deleting = threading.local()
+
+
+# ==================================================================
+# Incremental maintenance
+# ==================================================================
+
+def record_favorite_added(user_id, movie_id):
+    """Increment the pairs between ``movie_id`` and the user's other favourites."""
+    others = _other_favorites(user_id, movie_id)
+    if not others:
+        return 0
+
+    with transaction.atomic():
+        # Create missing rows (either direction) at zero, then increment all
+        MovieCooccurrence.objects.bulk_create(
+            [
+                MovieCooccurrence(movie_id=a, related_movie_id=b, count=0)
+                for other in others
+                for a, b in ((movie_id, other), (other, movie_id))
+            ],
+            ignore_conflicts=True,
+        )
+        MovieCooccurrence.objects.filter(_pairs(movie_id, others)).update(count=F('count') + 1)
+    return len(others)
+
+
+def favorite_deleting(user_id, movie_id, origin=None):
+    """Register a favourite about to be deleted (``pre_delete``)."""
+    state = _deleting.__dict__.get(user_id)
+    if state is None or state['origin'] is not origin:
+        state = _deleting.__dict__[user_id] = {
+            'origin': origin, 'pending': set(), 'removed': set(),
+        }
+    state['pending'].add(movie_id)
+
+
+def record_favorite_removed(user_id, movie_id, origin=None):
+    """
+    Decrement the pairs between ``movie_id`` and the user's other
+    favourites: those remaining, plus those already removed in the same
+    delete (each pair once).
+    """
+    state = _deleting.__dict__.get(user_id)
+    removed_with = set()
+    if state is not None and state['origin'] is origin:
+        state['pending'].discard(movie_id)
+        removed_with = set(state['removed'])
+        state['removed'].add(movie_id)
+        if not state['pending']:
+            del _deleting.__dict__[user_id]
+
+    others = list(set(_other_favorites(user_id, movie_id)) | removed_with)
+    if not others:
+        return 0
+
+    pairs = _pairs(movie_id, others)
+    with transaction.atomic():
+        MovieCooccurrence.objects.filter(pairs).update(count=F('count') - 1)
+        MovieCooccurrence.objects.filter(pairs, count__lte=0).delete()
+    return len(others)
+
+
+def _pairs(movie_id, others):
+    return (
+        Q(movie_id=movie_id, related_movie_id__in=others)
+        | Q(movie_id__in=others, related_movie_id=movie_id)
+    )
+
+
+def _other_favorites(user_id, movie_id):
+    return list(
+        Favorite.objects
+        .filter(user_id=user_id)
+        .exclude(movie_id=movie_id)
+        .values_list('movie_id', flat=True)
+    )
+
+
+# ==================================================================
+# Lookups
+# ==================================================================
+
+def related_movie_ids(movie_id, limit=10):
+    """Most co-favourited movies for ``movie_id`` as ``[(movie_id, count), ...]``."""
+    return list(
+        MovieCooccurrence.objects
+        .filter(movie_id=movie_id)
+        .order_by('-count', 'related_movie_id')
+        .values_list('related_movie_id', 'count')[:limit]
+    )
+
+
+# ==================================================================
+# Maintenance jobs
+# ==================================================================
+
+def prune_cooccurrences(top_n=DEFAULT_TOP_N):
+    """Keep only the top-N related movies per movie. Returns rows deleted."""
+    overflowing = (
+        MovieCooccurrence.objects
+        .values('movie_id')
+        .annotate(n=Count('id'))
+        .filter(n__gt=top_n)
+        .values_list('movie_id', flat=True)
+    )
+    deleted = 0
+    for movie_id in list(overflowing):
+        ids = list(
+            MovieCooccurrence.objects
+            .filter(movie_id=movie_id)
+            .annotate(rank=Window(
+                RowNumber(),
+                order_by=[F('count').desc(), F('related_movie_id').asc()],
+            ))
+            .filter(rank__gt=top_n)
+            .values_list('id', flat=True)
+        )
+        for start in range(0, len(ids), DELETE_BATCH_SIZE):
+            batch_deleted, _ = MovieCooccurrence.objects.filter(
+                id__in=ids[start:start + DELETE_BATCH_SIZE]
+            ).delete()
+            deleted += batch_deleted
+
+    logger.info("Pruned %d co-occurrence rows (top_n=%d)", deleted, top_n)
+    return deleted
+
+
+def rebuild_cooccurrences(top_n=DEFAULT_TOP_N, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Recompute all co-occurrence counts from ``Favorite``.
+
+    Builds a binary ``movies × users`` matrix and multiplies it by its
+    transpose in chunks of movies, keeping the top-N per movie.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    from .neighbors import top_k_rows
+
+    pairs = list(Favorite.objects.values_list('movie_id', 'user_id').iterator())
+    if not pairs:
+        deleted, _ = MovieCooccurrence.objects.all().delete()
+        return {'movies': 0, 'rows': 0, 'deleted_stale': deleted}
+
+    movie_ids = sorted({m for m, _ in pairs})
+    user_ids = sorted({u for _, u in pairs})
+    movie_index = {mid: i for i, mid in enumerate(movie_ids)}
+    user_index = {uid: j for j, uid in enumerate(user_ids)}
+
+    rows = np.fromiter((movie_index[m] for m, _ in pairs), dtype=np.int32, count=len(pairs))
+    cols = np.fromiter((user_index[u] for _, u in pairs), dtype=np.int32, count=len(pairs))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (rows, cols)),
+        shape=(len(movie_ids), len(user_ids)),
+    )
+    transposed = matrix.T.tocsc()
+    written = 0
+
+    for start in range(0, len(movie_ids), chunk_size):
+        block = matrix[start:start + chunk_size].dot(transposed)
+        objs = [
+            MovieCooccurrence(
+                movie_id=movie_ids[row],
+                related_movie_id=movie_ids[col],
+                count=int(round(count)),
+            )
+            for row, related in top_k_rows(block, start, top_n)
+            for col, count in related
+        ]
+        with transaction.atomic():
+            MovieCooccurrence.objects.filter(
+                movie_id__in=movie_ids[start:start + chunk_size]
+            ).delete()
+            MovieCooccurrence.objects.bulk_create(objs, batch_size=5000)
+        written += len(objs)
+
+    deleted_stale, _ = (
+        MovieCooccurrence.objects
+        .filter(~Exists(Favorite.objects.filter(movie_id=OuterRef('movie_id'))))
+        .delete()
+    )
+    logger.info("Rebuilt %d co-occurrence rows for %d movies", written, len(movie_ids))
+    return {'movies': len(movie_ids), 'rows': written, 'deleted_stale': deleted_stale}
@@ -0,0 +1,180 @@
+"""
+Buffered recommendation engagement tracking.
+
+Impression / click / rate beacons arrive in batches and at high volume.
+Writing each one straight to ``Recommendation`` would cost a row UPDATE
+per event, so events are accumulated in a per-process in-memory buffer
+and flushed together:
+
+  * one ``UPDATE ... WHERE id IN (...)`` per flag (``is_clicked``,
+    ``is_rated``) for all recommendations touched since the last flush;
+  * one upsert per ``(day, recommendation_type)`` on ``EngagementCounter``
+    for the aggregate impression / click / rate counts.
+
+A flush happens when the buffer holds ``FLUSH_MAX_EVENTS`` events, when
+``FLUSH_INTERVAL_SECONDS`` have passed since the first buffered event,
+or at interpreter shutdown — whichever comes first. Flushes run on a
+background thread so beacons never wait for the database; at most one
+size-triggered flush thread is in flight at a time. A failed flush puts
+its events back in the buffer for the next attempt, up to
+``MAX_RETAINED_EVENTS``; beyond that they are dropped, counted in
+``lost`` and logged.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.recommendations.models import EngagementCounter, Recommendation
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ('impression', 'click', 'rate')
+FLUSH_MAX_EVENTS = 1000
+FLUSH_INTERVAL_SECONDS = 10.0
+MAX_RETAINED_EVENTS = 20 * FLUSH_MAX_EVENTS
+
+_COUNTER_FIELDS = {'impression': 'impressions', 'click': 'clicks', 'rate': 'rates'}
+_FLAG_FIELDS = {'click': 'is_clicked', 'rate': 'is_rated'}
+
+
+class EngagementBuffer:
+    """Thread-safe in-memory buffer of engagement events."""
+
+    def __init__(self, max_events=FLUSH_MAX_EVENTS, interval=FLUSH_INTERVAL_SECONDS,
+                 max_retained=MAX_RETAINED_EVENTS):
+        self.max_events = max_events
+        self.interval = interval
+        self.max_retained = max_retained
+        self.lost = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._flush_thread_started = False
+        self._reset()
+
+    def _reset(self):
+        self._flags = {field: set() for field in _FLAG_FIELDS.values()}
+        self._counters = Counter()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def record(self, events):
+        """
+        Buffer ``[(recommendation_id, recommendation_type, event_type), ...]``.
+
+        Callers are expected to have checked ownership of the
+        recommendations; the buffer only aggregates.
+        """
+        day = timezone.now().date()
+        with self._lock:
+            for rec_id, rec_type, event_type in events:
+                flag = _FLAG_FIELDS.get(event_type)
+                if flag:
+                    self._flags[flag].add(rec_id)
+                self._counters[(day, rec_type, event_type)] += 1
+                self._size += 1
+
+            flush_now = self._size >= self.max_events and not self._flush_thread_started
+            if flush_now:
+                self._flush_thread_started = True
+            elif self._timer is None and self._size:
+                self._timer = threading.Timer(self.interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            threading.Thread(target=self._flush_from_size_trigger, daemon=True).start()
+
+    def flush(self):
+        """Write buffered events to the database. Returns the number flushed."""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                flags, counters, size = self._flags, self._counters, self._size
+                self._reset()
+
+            if not size:
+                return 0
+
+            try:
+                with transaction.atomic():
+                    for field, rec_ids in flags.items():
+                        if rec_ids:
+                            Recommendation.objects.filter(id__in=rec_ids).update(**{field: True})
+                    self._write_counters(counters)
+            except Exception:
+                self._requeue(flags, counters, size)
+                raise
+
+        logger.info("Flushed %d engagement events", size)
+        return size
+
+    def _requeue(self, flags, counters, size):
+        """Put the events of a failed flush back, dropping them past ``max_retained``."""
+        with self._lock:
+            if self._size + size > self.max_retained:
+                self.lost += size
+                logger.error(
+                    f"Dropped {size} engagement events after a failed flush ({self.lost} lost)"
+                )
+                return
+            for field, rec_ids in flags.items():
+                self._flags[field].update(rec_ids)
+            self._counters.update(counters)
+            self._size += size
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_from_size_trigger(self):
+        try:
+            self._flush_in_thread()
+        finally:
+            with self._lock:
+                self._flush_thread_started = False
+
+    def _flush_in_thread(self):
+        try:
+            self.flush()
+        except Exception as exc:
+            logger.warning("Engagement flush failed: %s", exc)
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def _write_counters(counters):
+        """Upsert aggregate counters, one row per (day, recommendation_type)."""
+        grouped = {}
+        for (day, rec_type, event_type), count in counters.items():
+            grouped.setdefault((day, rec_type), Counter())[_COUNTER_FIELDS[event_type]] += count
+
+        for (day, rec_type), increments in grouped.items():
+            updates = {field: F(field) + n for field, n in increments.items()}
+            existing = EngagementCounter.objects.filter(day=day, recommendation_type=rec_type)
+            if existing.update(**updates):
+                continue
+            try:
+                with transaction.atomic():
+                    EngagementCounter.objects.create(
+                        day=day, recommendation_type=rec_type, **increments
+                    )
+            except IntegrityError:
+                # Another process created the row first — just increment it.
+                EngagementCounter.objects.filter(
+                    day=day, recommendation_type=rec_type
+                ).update(**updates)
+
+
+# Per-process singleton used by the beacon endpoint.
+engagement_buffer = EngagementBuffer()
+atexit.register(engagement_buffer._flush_in_thread)
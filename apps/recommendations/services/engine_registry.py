@@ -0,0 +1,219 @@
+"""
+Pluggable recommendation engines, cohort routing and shadow comparison.
+
+Engines are registered by name in ``RECOMMENDATION_ENGINES`` as dotted
+paths to classes with the ``RecommendationEngine`` interface
+(``Engine(user)``, ``generate_recommendations(limit, persist, deadline,
+on_progress)`` and ``is_partial``). Which one serves a user is decided by:
+
+  1. an explicit per-request choice (``?engine=`` for staff, or the
+     engine recorded on a refresh job);
+  2. otherwise the user's cohort — a stable hash of the user id into
+     100 buckets, routed by ``RECOMMENDATION_ENGINE_COHORTS``
+     (``{"fast": 10}`` sends 10% of users to ``fast``);
+  3. otherwise ``RECOMMENDATION_ENGINE_DEFAULT``.
+
+With ``RECOMMENDATION_SHADOW_ENGINE`` set, a ``RECOMMENDATION_SHADOW_SAMPLE_RATE``
+share of generations also runs that engine in the background
+(``persist=False``) and stores an ``EngineComparison`` with both
+latencies, query counts and the overlap of their outputs. The
+``compare_engines`` command summarises them for promotion decisions.
+"""
+import logging
+import random
+import time
+import zlib
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from apps.recommendations.models import EngineComparison
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+COHORT_BUCKETS = 100
+
+
+class UnknownEngine(ValueError):
+    """Raised for engine names missing from ``RECOMMENDATION_ENGINES``."""
+
+
+def engine_names():
+    return list(settings.RECOMMENDATION_ENGINES)
+
+
+def get_engine_class(name):
+    try:
+        path = settings.RECOMMENDATION_ENGINES[name]
+    except KeyError:
+        raise UnknownEngine(f'Unknown recommendation engine "{name}"')
+    return import_string(path)
+
+
+class QueryCounter:
+    """``execute_wrapper`` that only counts queries (no SQL is formatted or kept)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """Count queries run on the default connection inside the block."""
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+
+
+def cohort_bucket(user_id):
+    """Stable bucket in [0, 100) for a user (same across processes and deploys)."""
+    return zlib.crc32(f'engine-cohort:{user_id}'.encode()) % COHORT_BUCKETS
+
+
+def engine_name_for(user, requested=None):
+    """Name of the engine that should serve ``user``."""
+    if requested:
+        if requested not in settings.RECOMMENDATION_ENGINES:
+            raise UnknownEngine(f'Unknown recommendation engine "{requested}"')
+        return requested
+
+    bucket = cohort_bucket(user.pk)
+    threshold = 0
+    for name, percent in settings.RECOMMENDATION_ENGINE_COHORTS.items():
+        threshold += percent
+        if bucket < threshold:
+            return name
+    return settings.RECOMMENDATION_ENGINE_DEFAULT
+
+
+def generate(user, limit=20, deadline=None, engine_name=None, on_progress=None):
+    """
+    Generate and persist recommendations with the user's engine, and
+    maybe shadow-run the candidate engine. Returns ``(engine, recs)``.
+    """
+    name = engine_name_for(user, engine_name)
+    engine = get_engine_class(name)(user)
+
+    with count_queries() as queries:
+        started = time.perf_counter()
+        recs = engine.generate_recommendations(
+            limit=limit, deadline=deadline, on_progress=on_progress,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+    maybe_shadow(user, name, recs, elapsed_ms, queries.count, limit)
+    return engine, recs
+
+
+def maybe_shadow(user, primary_name, primary_recs, primary_latency_ms, primary_queries, limit):
+    """Sample this generation for a background shadow run. Returns True if queued."""
+    candidate = settings.RECOMMENDATION_SHADOW_ENGINE
+    if not candidate or candidate == primary_name:
+        return False
+    if random.random() >= settings.RECOMMENDATION_SHADOW_SAMPLE_RATE:
+        return False
+
+    from .jobs import dispatch
+
+    dispatch(
+        'run_shadow_comparison', run_shadow, user.pk, primary_name, candidate,
+        [rec['movie'].id for rec in primary_recs], primary_latency_ms, primary_queries, limit,
+    )
+    return True
+
+
+def run_shadow(user_id, primary_name, candidate_name, primary_ids,
+               primary_latency_ms, primary_queries, limit):
+    """Run the candidate engine without persisting and record the comparison."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return None
+
+    comparison = EngineComparison(
+        user=user,
+        primary_engine=primary_name,
+        candidate_engine=candidate_name,
+        primary_latency_ms=round(primary_latency_ms, 2),
+        primary_queries=primary_queries,
+    )
+    try:
+        engine = get_engine_class(candidate_name)(user)
+        with count_queries() as queries:
+            started = time.perf_counter()
+            recs = engine.generate_recommendations(limit=limit, persist=False)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+    except Exception as exc:
+        logger.warning(f"Shadow engine {candidate_name} failed for user {user_id}: {exc}")
+        comparison.error = str(exc)
+    else:
+        candidate_ids = {rec['movie'].id for rec in recs}
+        comparison.candidate_latency_ms = round(elapsed_ms, 2)
+        comparison.candidate_queries = queries.count
+        comparison.overlap = (
+            round(len(candidate_ids.intersection(primary_ids)) / len(primary_ids), 4)
+            if primary_ids else None
+        )
+    comparison.save()
+    return comparison
+
+
+def summarize(candidate_name=None, since=None):
+    """Per (primary, candidate) pair: runs, latency percentiles, mean queries and overlap."""
+    from .evaluation import percentile
+
+    qs = EngineComparison.objects.all()
+    if candidate_name:
+        qs = qs.filter(candidate_engine=candidate_name)
+    if since:
+        qs = qs.filter(created_at__gte=since)
+
+    grouped = {}
+    for row in qs.values_list(
+        'primary_engine', 'candidate_engine', 'primary_latency_ms', 'candidate_latency_ms',
+        'primary_queries', 'candidate_queries', 'overlap', 'error',
+    ).iterator():
+        primary, candidate, p_ms, c_ms, p_q, c_q, overlap, error = row
+        stats = grouped.setdefault((primary, candidate), {
+            'primary_ms': [], 'candidate_ms': [], 'primary_queries': [],
+            'candidate_queries': [], 'overlap': [], 'errors': 0,
+        })
+        stats['primary_ms'].append(p_ms)
+        stats['primary_queries'].append(p_q)
+        if error:
+            stats['errors'] += 1
+            continue
+        stats['candidate_ms'].append(c_ms)
+        stats['candidate_queries'].append(c_q)
+        if overlap is not None:
+            stats['overlap'].append(overlap)
+
+    def mean(values):
+        return round(sum(values) / len(values), 4) if values else None
+
+    return [
+        {
+            'primary': primary,
+            'candidate': candidate,
+            'runs': len(stats['primary_ms']),
+            'errors': stats['errors'],
+            'primary_latency_ms': {
+                'p50': round(percentile(stats['primary_ms'], 50), 2),
+                'p99': round(percentile(stats['primary_ms'], 99), 2),
+            },
+            'candidate_latency_ms': {
+                'p50': round(percentile(stats['candidate_ms'], 50), 2),
+                'p99': round(percentile(stats['candidate_ms'], 99), 2),
+            },
+            'primary_queries': mean(stats['primary_queries']),
+            'candidate_queries': mean(stats['candidate_queries']),
+            'overlap': mean(stats['overlap']),
+        }
+        for (primary, candidate), stats in sorted(grouped.items())
+    ]
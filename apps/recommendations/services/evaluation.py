@@ -0,0 +1,234 @@
+"""
+Offline evaluation harness for the recommendation engine.
+
+For every eligible user the most recent favourites / ratings are held
+out, the engine is run against the remaining history, and the generated
+list is compared with what the user actually went on to like:
+
+  * **precision@k / recall@k** — hit rate of held-out likes in the top k.
+  * **NDCG@k** — rank-aware gain, rewarding hits near the top.
+  * **coverage** — share of the catalogue recommended to at least one user.
+
+Each run also records per-user latency percentiles and SQL query counts
+so that quality and cost can be compared side by side.
+
+Held-out rows are deleted inside a transaction that is always rolled
+back, so the engine sees a realistic "past" without any code changes
+and the database is left untouched. Within that transaction the user's
+``UserNeighbor`` rows are recomputed from the remaining history (against
+an in-memory snapshot of everyone's interactions), so held-out likes do
+not leak into the collaborative signal through precomputed neighbours.
+"""
+import logging
+import math
+import time
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from apps.favorites.models import Favorite, Rating
+from apps.movies.models import Movie
+from apps.users.models import User
+
+from .recommendation_engine import (
+    DEFAULT_WEIGHTS,
+    DIVERSITY_LAMBDA,
+    HIGH_RATING_THRESHOLD,
+    RecommendationEngine,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIGS = [{'name': 'baseline', 'weights': {}}]
+
+
+# ==================================================================
+# Ranking metrics
+# ==================================================================
+
+def precision_at_k(recommended, relevant, k):
+    """Fraction of the top-k recommendations that are relevant."""
+    if k <= 0:
+        return 0.0
+    hits = sum(1 for movie_id in recommended[:k] if movie_id in relevant)
+    return hits / k
+
+
+def recall_at_k(recommended, relevant, k):
+    """Fraction of the relevant items that appear in the top k."""
+    if not relevant:
+        return 0.0
+    hits = sum(1 for movie_id in recommended[:k] if movie_id in relevant)
+    return hits / len(relevant)
+
+
+def ndcg_at_k(recommended, relevant, k):
+    """Normalised discounted cumulative gain with binary relevance."""
+    if not relevant:
+        return 0.0
+    dcg = sum(
+        1.0 / math.log2(rank + 2)
+        for rank, movie_id in enumerate(recommended[:k])
+        if movie_id in relevant
+    )
+    ideal = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant), k)))
+    return dcg / ideal if ideal else 0.0
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of ``values`` (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * pct / 100.0
+    lower = math.floor(pos)
+    upper = math.ceil(pos)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+# ==================================================================
+# Evaluator
+# ==================================================================
+
+class RecommenderEvaluator:
+    """Run one or more engine configurations against held-out history."""
+
+    def __init__(self, configs=None, k=10, holdout=2, max_users=None):
+        self.configs = configs or DEFAULT_CONFIGS
+        self.k = k
+        self.holdout = holdout
+        self.max_users = max_users
+
+    def run(self):
+        """Evaluate every configuration and return a JSON-serialisable report."""
+        from .neighbors import NeighborSnapshot
+
+        users = list(self._eligible_users())
+        self._neighbors = NeighborSnapshot()
+        catalog_size = Movie.objects.count()
+        logger.info(
+            "Evaluating %d configuration(s) on %d users (k=%d, holdout=%d)",
+            len(self.configs), len(users), self.k, self.holdout,
+        )
+
+        return {
+            'k': self.k,
+            'holdout': self.holdout,
+            'users': len(users),
+            'catalog_size': catalog_size,
+            'configs': [
+                self._evaluate_config(config, users, catalog_size)
+                for config in self.configs
+            ],
+        }
+
+    def _eligible_users(self):
+        """Users with enough history to hold some of it out."""
+        min_interactions = self.holdout + 1
+        users = (
+            User.objects
+            .annotate(n_favorites=Count('favorites', distinct=True))
+            .annotate(n_ratings=Count('ratings', distinct=True))
+            .order_by('id')
+        )
+        eligible = (
+            user for user in users.iterator()
+            if user.n_favorites + user.n_ratings >= min_interactions
+        )
+        if self.max_users:
+            return (user for _, user in zip(range(self.max_users), eligible))
+        return eligible
+
+    def _select_holdout(self, user):
+        """
+        Return (favorite_ids, rating_ids, relevant_movie_ids) for the
+        user's most recent interactions.
+        """
+        favorites = [
+            ('favorite', row['id'], row['movie_id'], row['created_at'], None)
+            for row in Favorite.objects.filter(user=user)
+            .values('id', 'movie_id', 'created_at')
+        ]
+        ratings = [
+            ('rating', row['id'], row['movie_id'], row['created_at'], row['rating'])
+            for row in Rating.objects.filter(user=user)
+            .values('id', 'movie_id', 'created_at', 'rating')
+        ]
+        recent = sorted(favorites + ratings, key=lambda r: r[3], reverse=True)[:self.holdout]
+
+        favorite_ids = [r[1] for r in recent if r[0] == 'favorite']
+        rating_ids = [r[1] for r in recent if r[0] == 'rating']
+        relevant = {
+            r[2] for r in recent
+            if r[0] == 'favorite' or r[4] >= HIGH_RATING_THRESHOLD
+        }
+        return favorite_ids, rating_ids, relevant
+
+    def _evaluate_config(self, config, users, catalog_size):
+        name = config.get('name', 'unnamed')
+        weights = config.get('weights') or {}
+        diversity_lambda = config.get('diversity_lambda', DIVERSITY_LAMBDA)
+        precisions, recalls, ndcgs = [], [], []
+        latencies_ms, query_counts = [], []
+        recommended_ids = set()
+
+        for user in users:
+            favorite_ids, rating_ids, relevant = self._select_holdout(user)
+            if not relevant:
+                continue
+
+            with transaction.atomic():
+                Favorite.objects.filter(id__in=favorite_ids).delete()
+                Rating.objects.filter(id__in=rating_ids).delete()
+                self._neighbors.recompute_user(user.pk)
+
+                engine = RecommendationEngine(
+                    user, weights=weights, diversity_lambda=diversity_lambda,
+                )
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    recs = engine.generate_recommendations(limit=self.k, persist=False)
+                    elapsed = time.perf_counter() - started
+
+                # Never keep the hold-out deletions.
+                transaction.set_rollback(True)
+
+            ranked = [rec['movie'].id for rec in recs]
+            recommended_ids.update(ranked)
+            precisions.append(precision_at_k(ranked, relevant, self.k))
+            recalls.append(recall_at_k(ranked, relevant, self.k))
+            ndcgs.append(ndcg_at_k(ranked, relevant, self.k))
+            latencies_ms.append(elapsed * 1000.0)
+            query_counts.append(len(queries))
+
+        evaluated = len(precisions)
+        return {
+            'name': name,
+            'weights': {**DEFAULT_WEIGHTS, **weights},
+            'diversity_lambda': diversity_lambda,
+            'evaluated_users': evaluated,
+            'metrics': {
+                f'precision@{self.k}': _mean(precisions),
+                f'recall@{self.k}': _mean(recalls),
+                f'ndcg@{self.k}': _mean(ndcgs),
+                'coverage': len(recommended_ids) / catalog_size if catalog_size else 0.0,
+            },
+            'latency_ms': {
+                'p50': round(percentile(latencies_ms, 50), 3),
+                'p90': round(percentile(latencies_ms, 90), 3),
+                'p99': round(percentile(latencies_ms, 99), 3),
+                'max': round(max(latencies_ms, default=0.0), 3),
+            },
+            'queries': {
+                'mean': _mean(query_counts),
+                'p90': percentile(query_counts, 90),
+                'max': max(query_counts, default=0),
+            },
+        }
+
+
+def _mean(values):
+    return round(sum(values) / len(values), 6) if values else 0.0
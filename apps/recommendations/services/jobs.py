@@ -0,0 +1,150 @@
+"""
+Asynchronous recommendation refresh jobs.
+
+Generating recommendations scores a large part of the catalogue, which
+is too slow to do inside a web request. ``enqueue_refresh`` records a
+``RecommendationJob`` and hands it to a background runner; the request
+returns the job id straight away and clients poll the job for progress.
+
+The runner is chosen by ``RECOMMENDATION_JOB_BACKEND``:
+
+  * ``celery`` — dispatch ``apps.recommendations.tasks.run_recommendation_job``
+    so heavy work can be scaled on dedicated worker nodes.
+  * ``thread`` — a small in-process worker pool (default; needs no broker).
+  * ``inline`` — run synchronously (tests, management shells).
+
+Only one active job is kept per user (a partial unique constraint):
+enqueueing while a job is pending or running returns the existing job.
+Active jobs heartbeat through ``updated_at`` as they progress; one not
+touched for ``RECOMMENDATION_JOB_STALE_AFTER`` seconds (e.g. lost with a
+restarted worker) is marked failed so it no longer blocks new refreshes.
+Runners claim a job atomically, so a job dispatched twice runs once.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from apps.recommendations.models import RecommendationJob
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def enqueue_refresh(user, limit=20, engine=''):
+    """
+    Queue a recommendation refresh for ``user`` and return its job.
+    ``engine`` pins a registered engine; blank lets the cohort decide.
+    """
+    expire_stale_jobs(user)
+    active = RecommendationJob.objects.filter(
+        user=user, status__in=RecommendationJob.ACTIVE_STATUSES,
+    )
+    job = active.first()
+    if job is not None:
+        return job
+    try:
+        with transaction.atomic():
+            job = RecommendationJob.objects.create(user=user, limit=limit, engine=engine)
+    except IntegrityError:
+        # A concurrent request created the user's active job first
+        return active.first()
+
+    # Dispatch after commit so the worker is guaranteed to see the row
+    transaction.on_commit(lambda: dispatch('run_recommendation_job', run_job, job.pk))
+    return job
+
+
+def run_job(job_id):
+    """Execute a queued job, recording progress and the outcome on the row."""
+    from . import engine_registry
+    from .warmup import cache_payload
+
+    now = timezone.now()
+    claimed = RecommendationJob.objects.filter(pk=job_id, status='pending').update(
+        status='running', started_at=now, updated_at=now,
+    )
+    job = RecommendationJob.objects.select_related('user').filter(pk=job_id).first()
+    if not claimed:
+        return job  # missing, finished, or already claimed by another runner
+
+    def on_progress(fraction):
+        RecommendationJob.objects.filter(pk=job.pk).update(
+            progress=int(fraction * 100), updated_at=timezone.now(),
+        )
+
+    try:
+        engine, recs = engine_registry.generate(
+            job.user, limit=job.limit, engine_name=job.engine or None, on_progress=on_progress,
+        )
+    except Exception as exc:
+        logger.error(f"Recommendation job {job.pk} failed: {str(exc)}")
+        job.status = 'failed'
+        job.error = str(exc)
+    else:
+        job.status = 'succeeded'
+        job.result = {'count': len(recs), 'partial': engine.is_partial}
+    job.progress = 100
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'progress', 'result', 'error', 'finished_at', 'updated_at'])
+
+    if job.status == 'succeeded':
+        # Leave the fresh feed ready for the client's next poll / list call
+        cache_payload(job.user)
+    return job
+
+
+def expire_stale_jobs(user=None):
+    """Fail active jobs with no heartbeat for the stale period. Returns the count."""
+    now = timezone.now()
+    stale = RecommendationJob.objects.filter(
+        status__in=RecommendationJob.ACTIVE_STATUSES,
+        updated_at__lt=now - timedelta(seconds=settings.RECOMMENDATION_JOB_STALE_AFTER),
+    )
+    if user is not None:
+        stale = stale.filter(user=user)
+    expired = stale.update(
+        status='failed', error='Abandoned: no progress reported', finished_at=now, updated_at=now,
+    )
+    if expired:
+        logger.warning(f"Expired {expired} stale recommendation jobs")
+    return expired
+
+
+def dispatch(task_name, func, *args):
+    """
+    Run ``func(*args)`` on the configured backend. With Celery, the task
+    ``apps.recommendations.tasks.<task_name>`` is sent instead.
+    """
+    backend = settings.RECOMMENDATION_JOB_BACKEND
+    if backend == 'celery':
+        from apps.recommendations import tasks
+
+        getattr(tasks, task_name).delay(*args)
+    elif backend == 'inline':
+        func(*args)
+    else:
+        _get_executor().submit(_run_in_thread, func, *args)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.RECOMMENDATION_JOB_WORKERS,
+            thread_name_prefix='recommendation-job',
+        )
+    return _executor
+
+
+def _run_in_thread(func, *args):
+    try:
+        func(*args)
+    except Exception as exc:
+        logger.error(f"Background {func.__name__}{args} crashed: {str(exc)}")
+    finally:
+        close_old_connections()
@@ -0,0 +1,209 @@
+"""
+User-user nearest neighbour computation.
+
+Builds a sparse ``users × movies`` interaction matrix from favourites and
+ratings, L2-normalises the rows and computes cosine similarity with
+chunked sparse matrix products (``X[chunk] @ X.T``), so memory stays
+bounded by ``chunk_size × users`` non-zeros rather than ``users²``.
+
+Only the top-K positive neighbours per user are kept and written to the
+``UserNeighbor`` table, which the engine reads in a single lookup.
+
+This runs offline (management command / periodic task) — numpy and scipy
+are never imported on the request path.
+"""
+import logging
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from apps.favorites.models import Favorite, Rating
+from apps.recommendations.models import UserNeighbor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_K = 20
+DEFAULT_CHUNK_SIZE = 1000
+
+FAVORITE_VALUE = 1.0
+RATING_MIDPOINT = 5.5  # centre of the 1-10 scale
+RATING_SPREAD = 4.5
+
+
+def rating_value(rating):
+    """Map a 1-10 rating to [-1, 1] so dislikes pull users apart."""
+    return (rating - RATING_MIDPOINT) / RATING_SPREAD
+
+
+def interaction_values(favorites=None, ratings=None):
+    """
+    ``{(user_id, movie_id): value}`` from favourites and ratings.
+
+    A favourite counts as 1.0; a rating contributes its centred value.
+    When a user both favourited and rated a movie the stronger signal wins.
+    """
+    favorites = Favorite.objects.all() if favorites is None else favorites
+    ratings = Rating.objects.all() if ratings is None else ratings
+    values = {}
+    for user_id, movie_id in favorites.values_list('user_id', 'movie_id').iterator():
+        values[(user_id, movie_id)] = FAVORITE_VALUE
+    for user_id, movie_id, rating in (
+        ratings.values_list('user_id', 'movie_id', 'rating').iterator()
+    ):
+        value = rating_value(rating)
+        key = (user_id, movie_id)
+        if key not in values or abs(value) > abs(values[key]):
+            values[key] = value
+    return values
+
+
+def build_interaction_matrix():
+    """
+    Return ``(matrix, user_ids)`` where ``matrix`` is a row-normalised
+    CSR matrix with one row per user in ``user_ids``.
+    """
+    matrix, user_ids, _ = _interaction_matrix(interaction_values())
+    return matrix, user_ids
+
+
+def _interaction_matrix(values):
+    if not values:
+        return sparse.csr_matrix((0, 0), dtype=np.float32), [], {}
+
+    user_ids = sorted({user_id for user_id, _ in values})
+    movie_ids = sorted({movie_id for _, movie_id in values})
+    user_index = {uid: i for i, uid in enumerate(user_ids)}
+    movie_index = {mid: j for j, mid in enumerate(movie_ids)}
+
+    rows = np.fromiter((user_index[u] for u, _ in values), dtype=np.int32, count=len(values))
+    cols = np.fromiter((movie_index[m] for _, m in values), dtype=np.int32, count=len(values))
+    data = np.fromiter(values.values(), dtype=np.float32, count=len(values))
+
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(user_ids), len(movie_ids)))
+    return normalize_rows(matrix), user_ids, movie_index
+
+
+def normalize_rows(matrix):
+    """L2-normalise the rows of a CSR matrix (zero rows stay zero)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+def top_k_rows(similarities, row_offset, k, min_similarity=0.0):
+    """
+    Yield ``(row, [(col, score), ...])`` for each row of a sparse
+    similarity block, keeping the top ``k`` entries above
+    ``min_similarity`` and skipping the diagonal.
+    """
+    similarities = similarities.tocsr()
+    for local_row in range(similarities.shape[0]):
+        row = row_offset + local_row
+        start, end = similarities.indptr[local_row], similarities.indptr[local_row + 1]
+        cols = similarities.indices[start:end]
+        scores = similarities.data[start:end]
+
+        mask = (cols != row) & (scores > min_similarity)
+        cols, scores = cols[mask], scores[mask]
+        if len(scores) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            cols, scores = cols[keep], scores[keep]
+
+        # Deterministic order: best first, ties broken by column.
+        order = np.lexsort((cols, -scores))
+        yield row, [(int(cols[i]), float(scores[i])) for i in order]
+
+
+def compute_user_neighbors(k=DEFAULT_K, chunk_size=DEFAULT_CHUNK_SIZE, min_similarity=0.0):
+    """
+    Recompute every user's top-K neighbours and store them.
+
+    Returns a dict of counters for logging / task results.
+    """
+    matrix, user_ids = build_interaction_matrix()
+    if not user_ids:
+        deleted, _ = UserNeighbor.objects.all().delete()
+        return {'users': 0, 'neighbors': 0, 'deleted_stale': deleted}
+
+    transposed = matrix.T.tocsc()
+    written = 0
+
+    for start in range(0, len(user_ids), chunk_size):
+        block = matrix[start:start + chunk_size].dot(transposed)
+        objs = []
+        chunk_user_ids = user_ids[start:start + chunk_size]
+        for row, neighbors in top_k_rows(block, start, k, min_similarity):
+            objs.extend(
+                UserNeighbor(
+                    user_id=user_ids[row],
+                    neighbor_id=user_ids[col],
+                    similarity=round(score, 6),
+                )
+                for col, score in neighbors
+            )
+
+        with transaction.atomic():
+            UserNeighbor.objects.filter(user_id__in=chunk_user_ids).delete()
+            UserNeighbor.objects.bulk_create(objs, batch_size=5000)
+        written += len(objs)
+
+    # Users who no longer have any interactions keep no neighbours.
+    deleted_stale, _ = (
+        UserNeighbor.objects
+        .filter(~Exists(Favorite.objects.filter(user_id=OuterRef('user_id'))))
+        .filter(~Exists(Rating.objects.filter(user_id=OuterRef('user_id'))))
+        .delete()
+    )
+
+    logger.info(
+        "Computed %d neighbours for %d users (k=%d)", written, len(user_ids), k,
+    )
+    return {'users': len(user_ids), 'neighbors': written, 'deleted_stale': deleted_stale}
+
+
+class NeighborSnapshot:
+    """
+    The interaction matrix held in memory so single users' neighbours can
+    be recomputed from their current history, e.g. after the evaluation
+    harness has hidden their held-out likes.
+    """
+
+    def __init__(self):
+        self.matrix, self.user_ids, self.movie_index = _interaction_matrix(interaction_values())
+        self._user_index = {uid: i for i, uid in enumerate(self.user_ids)}
+        self._transposed = self.matrix.T.tocsc()
+
+    def recompute_user(self, user_id, k=DEFAULT_K, min_similarity=0.0):
+        """Replace the user's ``UserNeighbor`` rows from their history in the DB now."""
+        values = interaction_values(
+            Favorite.objects.filter(user_id=user_id), Rating.objects.filter(user_id=user_id),
+        )
+        known = [
+            (self.movie_index[movie_id], value)
+            for (_, movie_id), value in values.items() if movie_id in self.movie_index
+        ]
+        cols = [col for col, _ in known]
+        data = [value for _, value in known]
+        row = normalize_rows(sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), ([0] * len(cols), cols)),
+            shape=(1, len(self.movie_index)),
+        ))
+
+        UserNeighbor.objects.filter(user_id=user_id).delete()
+        if not cols:
+            return 0
+        # Offset the row to the user's own position so top_k_rows skips it
+        position = self._user_index.get(user_id, -1)
+        similarities = row.dot(self._transposed)
+        objs = [
+            UserNeighbor(
+                user_id=user_id, neighbor_id=self.user_ids[col], similarity=round(score, 6),
+            )
+            for _, neighbors in top_k_rows(similarities, position, k, min_similarity)
+            for col, score in neighbors
+        ]
+        UserNeighbor.objects.bulk_create(objs)
+        return len(objs)
@@ -0,0 +1,145 @@
+"""
+Session-aware real-time recommendations.
+
+Reacts to what the user is watching *right now* without regenerating
+the stored feed: the last few ``WatchHistory`` entries are expanded
+into their precomputed co-occurrence neighbours, and those candidates
+are blended into the already-serialised stored recommendations at read
+time.
+
+Cost is a handful of indexed lookups (recent history, neighbour lists,
+candidate movies, already-liked / dismissed filters) — no scoring pass
+over the catalogue — so it adds only a couple of milliseconds to the feed.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.favorites.models import Favorite
+from apps.movies.models import Movie, WatchHistory
+from apps.recommendations.models import MovieCooccurrence, Recommendation
+
+from . import suppression
+
+logger = logging.getLogger(__name__)
+
+SESSION_HISTORY_SIZE = 5          # last N watched movies that drive the session
+SESSION_WINDOW = timedelta(hours=6)
+SESSION_NEIGHBORS_PER_MOVIE = 10
+SESSION_MAX_ITEMS = 5             # session items injected into the feed
+SESSION_POSITION_DECAY = 0.7      # most recent view weighs the most
+SESSION_BOOST = 0.25              # extra score for stored recs the session agrees with
+
+
+class SessionRecommender:
+    """Blend short-term viewing activity into stored recommendations."""
+
+    def __init__(self, user, history_size=SESSION_HISTORY_SIZE, window=SESSION_WINDOW):
+        self.user = user
+        self.history_size = history_size
+        self.window = window
+
+    def recent_movie_ids(self):
+        """Distinct movies from the user's current viewing session, newest first."""
+        rows = (
+            WatchHistory.objects
+            .filter(user=self.user, watched_at__gte=timezone.now() - self.window)
+            .order_by('-watched_at')
+            .values_list('movie_id', flat=True)[:self.history_size * 2]
+        )
+        recent = []
+        for movie_id in rows:
+            if movie_id not in recent:
+                recent.append(movie_id)
+        return recent[:self.history_size]
+
+    def session_scores(self, recent_ids):
+        """
+        Return {movie_id: strength in [0, 1]} for neighbours of the
+        recently watched movies, weighting recent views more heavily.
+        """
+        if not recent_ids:
+            return {}
+
+        position = {movie_id: i for i, movie_id in enumerate(recent_ids)}
+        per_source = defaultdict(list)
+        for source_id, related_id, count in (
+            MovieCooccurrence.objects
+            .filter(movie_id__in=recent_ids)
+            .values_list('movie_id', 'related_movie_id', 'count')
+        ):
+            per_source[source_id].append((related_id, count))
+
+        scores = defaultdict(float)
+        for source_id, related in per_source.items():
+            related.sort(key=lambda x: (-x[1], x[0]))
+            related = related[:SESSION_NEIGHBORS_PER_MOVIE]
+            max_count = related[0][1]
+            decay = SESSION_POSITION_DECAY ** position[source_id]
+            for related_id, count in related:
+                scores[related_id] += decay * count / max_count
+
+        for movie_id in recent_ids:
+            scores.pop(movie_id, None)
+        if not scores:
+            return {}
+
+        top = max(scores.values())
+        return {movie_id: score / top for movie_id, score in scores.items()}
+
+    def blend(self, stored_items, limit=None):
+        """
+        Merge session candidates into serialised stored recommendations.
+
+        ``stored_items`` are ``RecommendationSerializer`` dicts. Stored
+        items the session agrees with get a score bump; up to
+        ``SESSION_MAX_ITEMS`` new session items are added with scores
+        relative to the best stored item. Returns a new list sorted by
+        score, truncated to ``limit`` (default: the stored length).
+        """
+        limit = limit or len(stored_items) or SESSION_MAX_ITEMS
+        scores = self.session_scores(self.recent_movie_ids())
+        if not scores:
+            return list(stored_items)[:limit]
+
+        blended = []
+        for item in stored_items:
+            strength = scores.pop(item['movie'], 0.0)
+            if strength:
+                item = {**item, 'score': round(item['score'] + SESSION_BOOST * strength, 4)}
+            blended.append(item)
+
+        blended.extend(self._session_items(scores, stored_items))
+        blended.sort(key=lambda item: item['score'], reverse=True)
+        return blended[:limit]
+
+    def _session_items(self, scores, stored_items):
+        """Serialise the strongest new session candidates as unsaved recommendations."""
+        from apps.recommendations.serializers import RecommendationSerializer
+
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        candidate_ids = [movie_id for movie_id, _ in ranked[:SESSION_MAX_ITEMS * 2]]
+        excluded = set(
+            Favorite.objects
+            .filter(user=self.user, movie_id__in=candidate_ids)
+            .values_list('movie_id', flat=True)
+        )
+        excluded |= suppression.suppressed_movie_ids(self.user, candidate_ids)
+        candidate_ids = [mid for mid in candidate_ids if mid not in excluded][:SESSION_MAX_ITEMS]
+        movies = Movie.objects.in_bulk(candidate_ids)
+
+        top_stored = max((item['score'] for item in stored_items), default=1.0)
+        recs = [
+            Recommendation(
+                user=self.user,
+                movie=movies[movie_id],
+                recommendation_type='session',
+                score=round(top_stored * scores[movie_id], 4),
+                reason='Because of what you just watched',
+            )
+            for movie_id in candidate_ids
+            if movie_id in movies
+        ]
+        return RecommendationSerializer(recs, many=True).data
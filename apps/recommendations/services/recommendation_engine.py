@@ -11,43 +11,82 @@ content-based approach:
   3. **Quality signal** — TMDb vote_average normalized to [0, 1].
   4. **Recency boost** — movies released in the last 2 years get a small
      bonus to keep the feed fresh.
-  5. **Collaborative signal** — if other users with similar genre taste
-     also liked a movie, it gets an extra boost.
-  6. **Diversity pass** — after scoring, the final list is re-ranked to
-     avoid genre monotony (no more than 3 consecutive same-top-genre).
-
-All computation uses plain Python / Django ORM — no numpy or scikit-learn
-required, so it works on the free Render tier without heavy deps.
+  5. **Collaborative signal** — movies liked by the user's precomputed
+     nearest neighbours get a similarity-weighted boost (falls back to
+     fans of the same genres until neighbours have been computed), and
+     movies often co-favourited with the user's likes get an item-based
+     boost; the stronger of the two is used.
+  6. **Content signal** — movies whose overview text is close to the
+     user's liked movies (hashed TF-IDF neighbours precomputed offline
+     and memory-mapped from the artifact registry).
+  7. **Diversity pass** — after scoring, the final list is re-ranked with
+     maximal marginal relevance over the candidates' genre vectors, with a
+     tunable relevance/diversity trade-off (``DIVERSITY_LAMBDA``).
+
+Request-time computation uses plain Python / Django ORM plus lookups in
+memory-mapped artifacts — no model training or scikit-learn, so it works
+on the free Render tier. Heavier work (neighbour lists, text vectors) is
+precomputed offline.
 """
 import logging
 import math
+import time
 from collections import Counter, defaultdict
 from datetime import date
 
+from django.db import transaction
 from django.db.models import Count, Q
 
 from apps.favorites.models import Favorite, Rating
 from apps.movies.models import Movie
-from apps.recommendations.models import Recommendation, RecommendationFeedback
+from apps.recommendations.models import (
+    MovieCooccurrence,
+    Recommendation,
+    UserNeighbor,
+)
+
+from . import cooccurrence, suppression, text_similarity, warmup
 
 logger = logging.getLogger(__name__)
 
 # ── Tunable weights ──────────────────────────────────────────────────
-WEIGHT_GENRE = 0.45
+WEIGHT_GENRE = 0.35
 WEIGHT_POPULARITY = 0.15
 WEIGHT_QUALITY = 0.20
 WEIGHT_RECENCY = 0.10
 WEIGHT_COLLABORATIVE = 0.10
+WEIGHT_CONTENT = 0.10
+
+DEFAULT_WEIGHTS = {
+    'genre': WEIGHT_GENRE,
+    'popularity': WEIGHT_POPULARITY,
+    'quality': WEIGHT_QUALITY,
+    'recency': WEIGHT_RECENCY,
+    'collaborative': WEIGHT_COLLABORATIVE,
+    'content': WEIGHT_CONTENT,
+}
 
 HIGH_RATING_THRESHOLD = 7  # on a 1-10 scale
 RECENCY_WINDOW_DAYS = 730  # 2 years
+COLLABORATIVE_MAX_MOVIES = 200
+PRIORITY_POOL_SIZE = 500  # candidates per priority source under a deadline
+PROGRESS_EVERY = 1000     # candidates scored between progress reports
+
+DIVERSITY_LAMBDA = 0.7  # MMR relevance/diversity trade-off (1.0 = relevance only)
+MMR_POOL_FACTOR = 5     # re-rank the top limit × factor candidates
 
 
 class RecommendationEngine:
     """Service for generating movie recommendations."""
 
-    def __init__(self, user):
+    def __init__(self, user, weights=None, diversity_lambda=DIVERSITY_LAMBDA):
         self.user = user
+        # Per-instance overrides of the module-level WEIGHT_* constants,
+        # e.g. {'genre': 0.5} — used by the offline evaluation harness.
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.diversity_lambda = diversity_lambda
+        # Set by generate_recommendations() when a deadline cut it short
+        self.is_partial = False
         # Lazily computed
         self._liked_movie_ids = None
         self._genre_profile = None  # {genre_id: weight}
@@ -56,8 +95,29 @@ class RecommendationEngine:
     # Public API
     # ==================================================================
 
-    def generate_recommendations(self, limit=20):
-        """Generate personalised recommendations and persist them."""
+    def generate_recommendations(self, limit=20, persist=True, deadline=None, on_progress=None):
+        """
+        Generate personalised recommendations and persist them.
+
+        Pass ``persist=False`` to score without touching the stored
+        recommendations (offline evaluation, dry runs).
+
+        ``deadline`` is an optional time budget in seconds for candidate
+        scoring, the part that grows with the catalogue. With a budget,
+        candidates are scored in priority order (liked genres, then
+        collaborative picks, then trending, then the long tail) and when
+        it runs out the best results found so far are returned,
+        ``self.is_partial`` is set and a full regeneration is queued. The
+        boost maps before scoring and the filler and save after it are
+        bounded queries and always run.
+
+        ``on_progress`` is an optional callable receiving the completed
+        fraction (0-1) at each stage; background jobs use it for polling.
+        """
+        report = on_progress or (lambda fraction: None)
+        expires_at = time.monotonic() + deadline if deadline else None
+        self.is_partial = False
+
         liked_ids = self._get_liked_movie_ids()
 
         # Build the user's genre taste profile
@@ -67,32 +127,23 @@ class RecommendationEngine:
         dismissed_ids = self._get_dismissed_movie_ids()
         exclude_ids = liked_ids | dismissed_ids
 
-        # Score every candidate movie
-        candidates = (
-            Movie.objects
-            .exclude(id__in=exclude_ids)
-            .prefetch_related('genres')
-            .filter(vote_count__gte=10)  # skip very obscure entries
-        )
-
-        scored = []
         collab_boost = self._collaborative_boost_map(genre_profile)
-
-        for movie in candidates.iterator(chunk_size=500):
-            score, reason = self._score_movie(movie, genre_profile, collab_boost)
-            if score > 0:
-                scored.append({
-                    'movie': movie,
-                    'score': score,
-                    'reason': reason,
-                    'rec_type': 'content_based' if genre_profile else 'trending',
-                })
+        for movie_id, score in self._cooccurrence_boost_map(liked_ids).items():
+            collab_boost[movie_id] = max(score, collab_boost.get(movie_id, 0.0))
+        content_boost = self._content_boost_map(liked_ids)
+        report(0.1)
+
+        # Score candidate movies, most promising sources first
+        scored, candidate_count = self._score_candidates(
+            exclude_ids, genre_profile, collab_boost, content_boost, expires_at, report,
+        )
+        report(0.7)
 
         # Sort descending by score
         scored.sort(key=lambda x: x['score'], reverse=True)
 
-        # Diversity re-ranking: limit genre repetition in the top N
-        final = self._diversify(scored, limit)
+        # Diversity re-ranking: trade relevance against genre redundancy
+        final = self._diversify(scored, limit, self.diversity_lambda)
 
         # If not enough personalised recs, pad with popular movies
         if len(final) < limit:
@@ -102,49 +153,152 @@ class RecommendationEngine:
             )
             final.extend(filler)
 
-        # Persist
-        self._save_recommendations(final)
+        report(0.8)
+
+        if persist:
+            self._save_recommendations(final)
+        report(1.0)
+
+        if self.is_partial:
+            logger.info(
+                "Deadline hit after scoring %d candidates for user %s; queueing full run",
+                candidate_count, self.user.email,
+            )
+            queue_full_regeneration(self.user, limit)
 
         return final[:limit]
 
+    def _score_candidates(self, exclude_ids, genre_profile, collab_boost, content_boost,
+                          expires_at=None, report=None):
+        """
+        Score candidate movies, most promising sources first. Stops at
+        ``expires_at`` (a ``time.monotonic()`` value), setting
+        ``self.is_partial``. Calls ``report`` every ``PROGRESS_EVERY``
+        candidates so long runs keep heartbeating. Returns
+        ``(scored, candidates_seen)``.
+        """
+        scored = []
+        seen = set()
+        rec_type = 'content_based' if genre_profile else 'trending'
+        for candidates in self._candidate_sources(
+            exclude_ids, genre_profile, {**content_boost, **collab_boost},
+            prioritise=expires_at is not None,
+        ):
+            for movie in candidates.iterator(chunk_size=500):
+                if expires_at is not None and time.monotonic() >= expires_at:
+                    self.is_partial = True
+                    return scored, len(seen)
+                if movie.id in seen:
+                    continue
+                seen.add(movie.id)
+                if report and len(seen) % PROGRESS_EVERY == 0:
+                    # The candidate total is not known up front; creep towards 0.7
+                    report(0.1 + 0.6 * len(seen) / (len(seen) + 10 * PROGRESS_EVERY))
+
+                # Genres come from the prefetch cache — no query per movie
+                genre_ids = frozenset(g.id for g in movie.genres.all())
+                score, reason = self._score_movie(
+                    movie, genre_ids, genre_profile, collab_boost, content_boost,
+                )
+                if score > 0:
+                    scored.append({
+                        'movie': movie,
+                        'score': score,
+                        'reason': reason,
+                        'rec_type': rec_type,
+                        'genre_ids': genre_ids,
+                    })
+        return scored, len(seen)
+
     def get_similar_movies(self, movie_id, limit=10):
-        """Content-based similarity to a single movie."""
+        """
+        Movies similar to a single movie.
+
+        Co-favourited movies ("users who liked X also liked Y") come first,
+        then movies with a similar overview, and the remaining slots are
+        filled by genre overlap.
+        """
         try:
             movie = Movie.objects.prefetch_related('genres').get(id=movie_id)
-        except Movie.DoesNotExist:
-            return Movie.objects.none()
+        except (Movie.DoesNotExist, ValueError):
+            return []
+
+        related_ids = [mid for mid, _count in cooccurrence.related_movie_ids(movie.id, limit)]
+        if len(related_ids) < limit:
+            related_ids.extend(
+                mid for mid, _sim in text_similarity.similar_movie_ids(movie.id, limit)
+                if mid not in related_ids
+            )
+            related_ids = related_ids[:limit]
+        related = Movie.objects.prefetch_related('genres').in_bulk(related_ids)
+        similar = [related[mid] for mid in related_ids if mid in related]
+
+        genre_ids = {g.id for g in movie.genres.all()}
+        if len(similar) < limit and genre_ids:
+            similar.extend(
+                Movie.objects
+                .filter(genres__id__in=genre_ids)
+                .exclude(id=movie.id)
+                .exclude(id__in=related_ids)
+                .prefetch_related('genres')
+                .distinct()
+                .annotate(
+                    genre_match=Count('genres', filter=Q(genres__id__in=genre_ids))
+                )
+                .order_by('-genre_match', '-vote_average', '-popularity')[:limit - len(similar)]
+            )
+
+        return similar
 
-        genre_ids = set(movie.genres.values_list('id', flat=True))
-        if not genre_ids:
-            return Movie.objects.none()
+    # ==================================================================
+    # Candidate generation
+    # ==================================================================
+
+    def _candidate_sources(self, exclude_ids, genre_profile, boosted, prioritise):
+        """
+        Yield candidate querysets to score.
 
-        similar = (
+        Without a deadline there is a single pass over the catalogue. With
+        one, cheap and promising sources come first so a truncated run
+        still sees the best candidates; later sources overlap earlier
+        ones and are de-duplicated by the caller.
+        """
+        base = (
             Movie.objects
-            .filter(genres__id__in=genre_ids)
-            .exclude(id=movie_id)
+            .exclude(id__in=exclude_ids)
             .prefetch_related('genres')
-            .distinct()
-            .annotate(
-                genre_match=Count('genres', filter=Q(genres__id__in=genre_ids))
-            )
-            .order_by('-genre_match', '-vote_average', '-popularity')
-        )[:limit]
+            .filter(vote_count__gte=10)  # skip very obscure entries
+        )
+        if not prioritise:
+            yield base
+            return
 
-        return similar
+        top_genre_ids = [
+            gid for gid, _ in sorted(genre_profile.items(), key=lambda x: -x[1])
+        ][:3]
+        if top_genre_ids:
+            yield (
+                base.filter(genres__id__in=top_genre_ids)
+                .distinct()
+                .order_by('-popularity')[:PRIORITY_POOL_SIZE]
+            )
+        if boosted:
+            yield base.filter(id__in=list(boosted))
+        yield base.order_by('-popularity')[:PRIORITY_POOL_SIZE]
+        yield base
 
     # ==================================================================
     # Scoring
     # ==================================================================
 
-    def _score_movie(self, movie, genre_profile, collab_boost):
+    def _score_movie(self, movie, genre_ids, genre_profile, collab_boost, content_boost):
         """Return (score, reason) for a single candidate movie."""
         reasons = []
 
         # 1. Genre affinity
         genre_score = 0.0
         if genre_profile:
-            movie_genre_ids = set(movie.genres.values_list('id', flat=True))
-            overlap = movie_genre_ids & set(genre_profile.keys())
+            overlap = genre_ids & genre_profile.keys()
             if overlap:
                 genre_score = sum(genre_profile[gid] for gid in overlap) / sum(genre_profile.values())
                 reasons.append('Matches your favourite genres')
@@ -169,13 +323,20 @@ class RecommendationEngine:
         if collab_score > 0.3:
             reasons.append('Liked by users with similar taste')
 
+        # 6. Content (overview text) similarity
+        content_score = content_boost.get(movie.id, 0.0)
+        if content_score > 0.25:
+            reasons.append('Similar story to movies you liked')
+
         # Weighted sum
+        weights = self.weights
         total = (
-            WEIGHT_GENRE * genre_score
-            + WEIGHT_POPULARITY * pop_score
-            + WEIGHT_QUALITY * quality_score
-            + WEIGHT_RECENCY * recency_score
-            + WEIGHT_COLLABORATIVE * collab_score
+            weights['genre'] * genre_score
+            + weights['popularity'] * pop_score
+            + weights['quality'] * quality_score
+            + weights['recency'] * recency_score
+            + weights['collaborative'] * collab_score
+            + weights['content'] * content_score
         )
 
         reason = '; '.join(reasons) if reasons else 'Popular movie you might enjoy'
@@ -238,7 +399,46 @@ class RecommendationEngine:
 
     def _collaborative_boost_map(self, genre_profile):
         """
-        Simple collaborative signal: find other users who share the
+        Collaborative signal from the user's precomputed nearest
+        neighbours (see ``services/neighbors.py``): every movie a
+        neighbour liked is boosted by that neighbour's similarity, then
+        the totals are normalised to [0, 1].  Return {movie_id: score}.
+
+        Falls back to the genre-overlap heuristic when no neighbour list
+        has been computed for this user yet.
+        """
+        neighbors = dict(
+            UserNeighbor.objects
+            .filter(user=self.user)
+            .values_list('neighbor_id', 'similarity')
+        )
+        if not neighbors:
+            return self._genre_fan_boost_map(genre_profile)
+
+        boost = defaultdict(float)
+        liked_by = set(
+            Favorite.objects
+            .filter(user_id__in=neighbors)
+            .values_list('user_id', 'movie_id')
+        )
+        liked_by.update(
+            Rating.objects
+            .filter(user_id__in=neighbors, rating__gte=HIGH_RATING_THRESHOLD)
+            .values_list('user_id', 'movie_id')
+        )
+        for user_id, movie_id in liked_by:
+            boost[movie_id] += neighbors[user_id]
+
+        if not boost:
+            return {}
+
+        top = sorted(boost.items(), key=lambda x: (-x[1], x[0]))[:COLLABORATIVE_MAX_MOVIES]
+        max_boost = top[0][1]
+        return {movie_id: min(score / max_boost, 1.0) for movie_id, score in top}
+
+    def _genre_fan_boost_map(self, genre_profile):
+        """
+        Fallback collaborative signal: find other users who share the
         current user's top genres, then find movies *they* liked that
         this user hasn't seen.  Return {movie_id: score}.
         """
@@ -258,6 +458,7 @@ class RecommendationEngine:
             .filter(movie__genres__id__in=top_genre_ids)
             .exclude(user=self.user)
             .values_list('user_id', flat=True)
+            .order_by('user_id')
             .distinct()
         )[:50]  # cap for performance
 
@@ -270,8 +471,8 @@ class RecommendationEngine:
             .filter(user_id__in=similar_users)
             .values('movie_id')
             .annotate(fan_count=Count('id'))
-            .order_by('-fan_count')
-        )[:200]
+            .order_by('-fan_count', 'movie_id')
+        )[:COLLABORATIVE_MAX_MOVIES]
 
         max_fans = max((r['fan_count'] for r in boost_qs), default=1)
         return {
@@ -279,16 +480,46 @@ class RecommendationEngine:
             for r in boost_qs
         }
 
+    def _cooccurrence_boost_map(self, liked_movie_ids):
+        """
+        Item-based collaborative signal: movies frequently co-favourited
+        with the user's liked movies, from the precomputed co-occurrence
+        table.  Return {movie_id: score} normalised to [0, 1].
+        """
+        if not liked_movie_ids:
+            return {}
+
+        totals = defaultdict(int)
+        for related_id, count in (
+            MovieCooccurrence.objects
+            .filter(movie_id__in=liked_movie_ids)
+            .values_list('related_movie_id', 'count')
+        ):
+            totals[related_id] += count
+
+        if not totals:
+            return {}
+
+        top = sorted(totals.items(), key=lambda x: (-x[1], x[0]))[:COLLABORATIVE_MAX_MOVIES]
+        max_count = top[0][1]
+        return {movie_id: count / max_count for movie_id, count in top}
+
+    def _content_boost_map(self, liked_movie_ids):
+        """
+        Content signal: movies whose overview is close to any liked movie,
+        from the precomputed text neighbour artifact. Return
+        {movie_id: best cosine similarity} (empty until it is built).
+        """
+        boost = {}
+        for neighbors in text_similarity.neighbors_of(liked_movie_ids).values():
+            for movie_id, similarity in neighbors:
+                if similarity > boost.get(movie_id, 0.0):
+                    boost[movie_id] = similarity
+        return boost
+
     def _get_dismissed_movie_ids(self):
         """Movies the user has explicitly dismissed / disliked."""
-        dismissed = set(
-            RecommendationFeedback.objects
-            .filter(
-                user=self.user,
-                feedback_type__in=['dislike', 'not_interested'],
-            )
-            .values_list('recommendation__movie_id', flat=True)
-        )
+        dismissed = suppression.suppressed_movie_ids(self.user)
         # Also exclude low-rated movies
         low_rated = set(
             Rating.objects.filter(
@@ -302,36 +533,45 @@ class RecommendationEngine:
     # ==================================================================
 
     @staticmethod
-    def _diversify(scored, limit):
+    def _diversify(scored, limit, diversity_lambda=DIVERSITY_LAMBDA):
         """
-        Re-rank to avoid genre monotony.
-        Allow at most 3 consecutive movies with the same top genre.
+        Maximal-marginal-relevance re-ranking.
+
+        Greedily picks the item maximising
+        ``λ · relevance − (1 − λ) · max genre similarity to already-picked items``
+        from the top ``limit × MMR_POOL_FACTOR`` candidates (``scored`` is
+        sorted by score). Genre vectors were loaded with the candidates, so
+        this is O(limit × pool) in memory with no queries. λ = 1 is a pure
+        relevance ranking; lower values favour variety.
         """
         if not scored:
             return []
 
+        pool = scored[:limit * MMR_POOL_FACTOR]
+        top_score = pool[0]['score'] or 1.0
+        relevance = [item['score'] / top_score for item in pool]
+        genres = [item.get('genre_ids', frozenset()) for item in pool]
+        max_similarity = [0.0] * len(pool)
+        remaining = set(range(len(pool)))
         result = []
-        recent_genre = None
-        streak_count = 0
-
-        for item in scored:
-            movie = item['movie']
-            top_genre = None
-            genre_ids = list(movie.genres.values_list('id', flat=True))
-            if genre_ids:
-                top_genre = genre_ids[0]
-
-            if top_genre == recent_genre:
-                streak_count += 1
-                if streak_count > 3:
-                    continue  # skip to break the streak
-            else:
-                streak_count = 1
-                recent_genre = top_genre
-
-            result.append(item)
-            if len(result) >= limit:
-                break
+
+        while remaining and len(result) < limit:
+            best = max(
+                remaining,
+                key=lambda i: (
+                    diversity_lambda * relevance[i]
+                    - (1 - diversity_lambda) * max_similarity[i],
+                    -i,  # ties: keep the original (score) order
+                ),
+            )
+            remaining.remove(best)
+            result.append(pool[best])
+
+            picked = genres[best]
+            for i in remaining:
+                sim = _genre_similarity(genres[i], picked)
+                if sim > max_similarity[i]:
+                    max_similarity[i] = sim
 
         return result
 
@@ -359,9 +599,13 @@ class RecommendationEngine:
     # ==================================================================
 
     def _save_recommendations(self, recommendations):
-        """Replace old recommendations with the new batch."""
-        Recommendation.objects.filter(user=self.user).delete()
+        """
+        Upsert the new batch in place and drop only the rows that fell out.
 
+        Rows that survive a refresh keep their id, ``is_clicked`` /
+        ``is_rated`` flags and any feedback attached to them, and a
+        refresh no longer deletes (and cascades over) the whole set.
+        """
         objs = [
             Recommendation(
                 user=self.user,
@@ -372,9 +616,43 @@ class RecommendationEngine:
             )
             for rec in recommendations
         ]
+        keep = {(obj.movie.id, obj.recommendation_type) for obj in objs}
+
+        with transaction.atomic():
+            Recommendation.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=['user', 'movie', 'recommendation_type'],
+                update_fields=['score', 'reason', 'updated_at'],
+            )
+            stale_ids = [
+                rec_id
+                for rec_id, movie_id, rec_type in (
+                    Recommendation.objects
+                    .filter(user=self.user)
+                    .values_list('id', 'movie_id', 'recommendation_type')
+                )
+                if (movie_id, rec_type) not in keep
+            ]
+            if stale_ids:
+                Recommendation.objects.filter(id__in=stale_ids).delete()
+            warmup.invalidate_payload(self.user.pk)
 
-        Recommendation.objects.bulk_create(objs, ignore_conflicts=True)
         logger.info(
-            "Saved %d recommendations for user %s",
-            len(objs), self.user.email,
+            "Saved %d recommendations for user %s (%d stale removed)",
+            len(objs), self.user.email, len(stale_ids),
         )
+
+
+def _genre_similarity(a, b):
+    """Cosine similarity of two binary genre vectors given as ID sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / math.sqrt(len(a) * len(b))
+
+
+def queue_full_regeneration(user, limit=20):
+    """Queue an unbounded regeneration as a background job (one active job per user)."""
+    from .jobs import enqueue_refresh
+
+    return enqueue_refresh(user, limit)
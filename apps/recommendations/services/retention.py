@@ -0,0 +1,178 @@
+"""
+Retention and compaction for recommendation data.
+
+Three passes keep the hot tables small:
+
+  1. **Per-type cap** — at most ``RECOMMENDATION_MAX_PER_TYPE`` rows per
+     ``(user, recommendation_type)``; the lowest-scored extras go.
+  2. **Inactive users** — stored recommendations of users who have not
+     logged in for ``RECOMMENDATION_INACTIVE_DAYS`` are purged (they are
+     regenerated on their next visit).
+  3. **Feedback archive** — feedback older than ``FEEDBACK_ARCHIVE_DAYS``
+     is rolled up into ``FeedbackAggregate`` daily counts and deleted.
+
+Every pass deletes by primary key in batches of ``RETENTION_BATCH_SIZE``,
+each in its own short transaction, sleeping ``RETENTION_BATCH_PAUSE``
+seconds between batches so the job never holds long locks on tables the
+request path is writing to. Users whose stored recommendations were
+trimmed or purged have their cached feed payload evicted.
+"""
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber, TruncDate
+from django.utils import timezone
+
+from apps.recommendations.models import FeedbackAggregate, Recommendation, RecommendationFeedback
+from apps.users.models import User
+
+from .warmup import invalidate_payloads
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionPolicy:
+    """Retention limits and throttling, read from settings unless overridden."""
+
+    def __init__(self, max_per_type=None, inactive_days=None, feedback_days=None,
+                 batch_size=None, pause=None):
+        def setting(value, name):
+            return getattr(settings, name) if value is None else value
+
+        self.max_per_type = setting(max_per_type, 'RECOMMENDATION_MAX_PER_TYPE')
+        self.inactive_days = setting(inactive_days, 'RECOMMENDATION_INACTIVE_DAYS')
+        self.feedback_days = setting(feedback_days, 'FEEDBACK_ARCHIVE_DAYS')
+        self.batch_size = setting(batch_size, 'RETENTION_BATCH_SIZE')
+        self.pause = setting(pause, 'RETENTION_BATCH_PAUSE')
+
+    def run(self):
+        """Apply all retention passes. Returns counters per pass."""
+        stats = {
+            'capped': self.cap_recommendations(),
+            'inactive_purged': self.purge_inactive_users(),
+            'feedback_archived': self.archive_feedback(),
+        }
+        logger.info(f"Recommendation retention finished: {stats}")
+        return stats
+
+    # ------------------------------------------------------------------
+    # Passes
+    # ------------------------------------------------------------------
+
+    def cap_recommendations(self):
+        """Trim each (user, type) to the best ``max_per_type`` rows."""
+        overflowing = (
+            Recommendation.objects
+            .values('user_id', 'recommendation_type')
+            .annotate(n=Count('id'))
+            .filter(n__gt=self.max_per_type)
+            .values_list('user_id', 'recommendation_type')
+        )
+        deleted = 0
+        trimmed_users = set()
+        for user_id, rec_type in list(overflowing):
+            ids = list(
+                Recommendation.objects
+                .filter(user_id=user_id, recommendation_type=rec_type)
+                .annotate(rank=Window(
+                    RowNumber(),
+                    order_by=[F('score').desc(), F('created_at').desc(), F('id').desc()],
+                ))
+                .filter(rank__gt=self.max_per_type)
+                .values_list('id', flat=True)
+            )
+            deleted += self._delete_ids(Recommendation, ids)
+            trimmed_users.add(user_id)
+        invalidate_payloads(trimmed_users)
+        return deleted
+
+    def purge_inactive_users(self):
+        """Delete stored recommendations of users who have been away too long."""
+        cutoff = timezone.now() - timedelta(days=self.inactive_days)
+        inactive = User.objects.filter(
+            Q(last_login__lt=cutoff) | Q(last_login__isnull=True, date_joined__lt=cutoff)
+        ).values('id')
+        stored = Recommendation.objects.filter(user_id__in=inactive)
+        purged_users = set(stored.values_list('user_id', flat=True).distinct())
+        deleted = self._delete_in_batches(stored)
+        invalidate_payloads(purged_users)
+        return deleted
+
+    def archive_feedback(self):
+        """Roll old feedback up into daily aggregates, then delete it."""
+        cutoff = timezone.now() - timedelta(days=self.feedback_days)
+        old = (
+            RecommendationFeedback.objects
+            .filter(created_at__lt=cutoff)
+            .order_by('id')
+            .annotate(day=TruncDate('created_at'))
+        )
+        archived = 0
+        while True:
+            rows = list(
+                old.values_list('id', 'day', 'feedback_type', 'recommendation__recommendation_type')
+                [:self.batch_size]
+            )
+            if not rows:
+                break
+            counts = Counter(
+                (day, feedback_type, rec_type or '')
+                for _id, day, feedback_type, rec_type in rows
+            )
+            # Count and delete together so a crash never double-counts
+            with transaction.atomic():
+                self._add_to_aggregates(counts)
+                RecommendationFeedback.objects.filter(id__in=[row[0] for row in rows]).delete()
+            archived += len(rows)
+            self._throttle()
+        return archived
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _delete_in_batches(self, queryset):
+        deleted = 0
+        while True:
+            ids = list(queryset.order_by('id').values_list('id', flat=True)[:self.batch_size])
+            if not ids:
+                return deleted
+            batch_deleted, _ = queryset.model.objects.filter(id__in=ids).delete()
+            deleted += batch_deleted
+            self._throttle()
+
+    def _delete_ids(self, model, ids):
+        deleted = 0
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start:start + self.batch_size]
+            batch_deleted, _ = model.objects.filter(id__in=batch).delete()
+            deleted += batch_deleted
+            self._throttle()
+        return deleted
+
+    def _throttle(self):
+        if self.pause:
+            time.sleep(self.pause)
+
+    @staticmethod
+    def _add_to_aggregates(counts):
+        for (day, feedback_type, rec_type), count in counts.items():
+            lookup = {'day': day, 'feedback_type': feedback_type, 'recommendation_type': rec_type}
+            if FeedbackAggregate.objects.filter(**lookup).update(count=F('count') + count):
+                continue
+            try:
+                with transaction.atomic():
+                    FeedbackAggregate.objects.create(count=count, **lookup)
+            except IntegrityError:
+                # Another run created the row first — just increment it.
+                FeedbackAggregate.objects.filter(**lookup).update(count=F('count') + count)
+
+
+def apply_retention(**overrides):
+    """Run every retention pass with the configured policy."""
+    return RetentionPolicy(**overrides).run()
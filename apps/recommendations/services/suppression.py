@@ -0,0 +1,31 @@
+"""
+Per-user suppression list ("never recommend this movie again").
+
+Dismissals used to live only on ``RecommendationFeedback`` rows hanging
+off a ``Recommendation``; once the recommendation was refreshed away the
+dismissal went with it. The ``SuppressedMovie`` table is keyed by
+``(user, movie)`` instead, is read in a single query and applied as an
+in-memory exclusion set.
+"""
+from apps.recommendations.models import SuppressedMovie
+
+from .warmup import invalidate_payload
+
+SUPPRESSING_FEEDBACK = ('dislike', 'not_interested')
+
+
+def suppressed_movie_ids(user, movie_ids=None):
+    """Set of movie IDs the user has dismissed (optionally restricted to ``movie_ids``)."""
+    qs = SuppressedMovie.objects.filter(user=user)
+    if movie_ids is not None:
+        qs = qs.filter(movie_id__in=movie_ids)
+    return set(qs.values_list('movie_id', flat=True))
+
+
+def apply_feedback(user, movie_id, feedback_type):
+    """Add or lift a suppression to match the user's latest feedback on a movie."""
+    if feedback_type in SUPPRESSING_FEEDBACK:
+        SuppressedMovie.objects.get_or_create(user=user, movie_id=movie_id)
+    else:
+        SuppressedMovie.objects.filter(user=user, movie_id=movie_id).delete()
+    invalidate_payload(user.pk)
@@ -0,0 +1,379 @@
+"""
+Overview-text content similarity.
+
+Each movie's ``overview`` and ``tagline`` are tokenised and hashed into a
+fixed ``2**18``-dimensional space (the hashing trick — no vocabulary to
+store and no model downloads), weighted with sublinear TF-IDF and
+L2-normalised. Cosine similarity between movies is then a sparse dot
+product; the top-K neighbours per movie are found with blocked products
+(``X[block] @ X.T``) so memory stays bounded by ``block × movies``.
+
+The result is published to the artifact registry as ``text_neighbors``:
+
+  * ``movie_ids`` — sorted movie IDs (row index via binary search)
+  * ``neighbor_ids`` / ``neighbor_scores`` — ``movies × K`` top-K lists,
+    padded with 0 / 0.0
+  * ``idf`` and the CSR parts of the TF-IDF matrix, so new movies can be
+    added incrementally without re-reading the whole catalogue.
+
+The engine reads neighbour rows straight from the memory-mapped arrays.
+Full rebuilds run offline (``rebuild_text_neighbors`` command / task).
+In between, ``update_text_neighbors`` (``rebuild_text_neighbors
+--incremental`` from cron, or the task of the same name) folds in movies
+saved since the artifact's ``indexed_through`` watermark, new rows and
+hydrated stubs alike. Activation is serialised by a cache lock and only
+happens if the version an update started from is still current, so
+concurrent publishers never drop each other's movies. Old versions are
+pruned after every publish.
+"""
+import logging
+import re
+import time
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.movies.models import Movie
+
+from .artifacts import registry
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_NAME = 'text_neighbors'
+N_FEATURES = 2 ** 18
+DEFAULT_K = 20
+DEFAULT_BLOCK_SIZE = 1000
+MIN_SIMILARITY = 0.05
+PUBLISH_LOCK_KEY = 'text_neighbors:publish_lock'
+PUBLISH_LOCK_TIMEOUT = 600  # seconds; longer than any incremental update
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOP_WORDS = frozenset("""
+    a about after again against all an and any are as at be because been
+    before being between both but by can could did do does doing down during
+    each few for from further had has have having he her here hers him his
+    how i if in into is it its itself just me more most my no nor not now of
+    off on once only or other our out over own same she should so some such
+    than that the their them then there these they this those through to too
+    under until up very was we were what when where which while who whom why
+    will with would you your film movie story life one two new find finds
+    must gets get takes
+""".split())
+
+
+def tokenize(text):
+    """Lower-cased word tokens with stop words and very short tokens removed."""
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 2 and token not in STOP_WORDS
+    ]
+
+
+def feature_index(token):
+    """Stable hash bucket for a token (``hash()`` is salted per process)."""
+    return zlib.crc32(token.encode('utf-8')) % N_FEATURES
+
+
+def movie_text(overview, tagline):
+    return f'{tagline or ""} {overview or ""}'.strip()
+
+
+def term_counts(texts):
+    """Sparse ``len(texts) × N_FEATURES`` matrix of hashed term counts."""
+    from scipy import sparse
+
+    rows, cols, data = [], [], []
+    for row, text in enumerate(texts):
+        counts = {}
+        for token in tokenize(text):
+            index = feature_index(token)
+            counts[index] = counts.get(index, 0) + 1
+        rows.extend([row] * len(counts))
+        cols.extend(counts.keys())
+        data.extend(counts.values())
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), (rows, cols)),
+        shape=(len(texts), N_FEATURES),
+    )
+
+
+def compute_idf(counts):
+    """Smoothed inverse document frequency per hashed feature."""
+    n_docs = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=N_FEATURES)
+    return (np.log((1 + n_docs) / (1 + df)) + 1.0).astype(np.float32)
+
+
+def tfidf(counts, idf):
+    """Sublinear TF × IDF, L2-normalised per row."""
+    from .neighbors import normalize_rows
+
+    weighted = counts.copy().astype(np.float32)
+    weighted.data = 1.0 + np.log(weighted.data)
+    weighted = weighted.multiply(idf.reshape(1, -1)).tocsr()
+    return normalize_rows(weighted).astype(np.float32)
+
+
+# ----------------------------------------------------------------------
+# Offline build
+# ----------------------------------------------------------------------
+
+def rebuild_text_neighbors(k=DEFAULT_K, block_size=DEFAULT_BLOCK_SIZE,
+                           min_similarity=MIN_SIMILARITY):
+    """
+    Vectorise every movie with overview text, compute top-K neighbours
+    and publish a new ``text_neighbors`` version. Returns counters.
+    """
+    # Rows saved while the catalogue is read are picked up by the next update
+    indexed_through = timezone.now()
+    movie_ids, texts = [], []
+    for movie_id, overview, tagline in (
+        Movie.objects.order_by('id').values_list('id', 'overview', 'tagline').iterator()
+    ):
+        text = movie_text(overview, tagline)
+        if text:
+            movie_ids.append(movie_id)
+            texts.append(text)
+
+    counts = term_counts(texts)
+    idf = compute_idf(counts)
+    matrix = tfidf(counts, idf)
+    movie_ids = np.asarray(movie_ids, dtype=np.int64)
+
+    neighbor_ids = np.zeros((len(movie_ids), k), dtype=np.int64)
+    neighbor_scores = np.zeros((len(movie_ids), k), dtype=np.float32)
+    _fill_top_k(
+        matrix, matrix, movie_ids, 0, neighbor_ids, neighbor_scores,
+        k, block_size, min_similarity,
+    )
+
+    with _publish_lock(wait=PUBLISH_LOCK_TIMEOUT) as locked:
+        if not locked:
+            logger.warning(
+                "Text neighbour publish lock not released; activating rebuild anyway"
+            )
+        version = _publish(
+            movie_ids, neighbor_ids, neighbor_scores, idf, matrix, k, min_similarity,
+            indexed_through,
+        )
+    logger.info(f"Text neighbours rebuilt for {len(movie_ids)} movies ({version})")
+    return {'movies': len(movie_ids), 'k': k, 'version': version}
+
+
+def update_text_neighbors(block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Fold movies saved since the artifact's watermark into it (periodic
+    job). Returns counters; nothing happens before the first rebuild.
+    """
+    artifact = registry.get(ARTIFACT_NAME)
+    if artifact is None:
+        return {'added': 0, 'version': None}
+
+    watermark = _watermark(artifact)
+    changed = Movie.objects.all()
+    if watermark is not None:
+        changed = changed.filter(updated_at__gt=watermark)
+    rows = list(changed.exclude(overview='', tagline='').values_list('id', 'updated_at'))
+    if not rows:
+        return {'added': 0, 'version': artifact.version}
+
+    indexed_through = max(updated_at for _, updated_at in rows)
+    added, version = _add_movies(
+        [movie_id for movie_id, _ in rows], block_size, indexed_through,
+    )
+    return {'added': added, 'version': version}
+
+
+def add_movies(movie_ids, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Fold the given movies into the current artifact.
+
+    New movies get their own top-K lists, and existing movies whose lists
+    the newcomers beat are updated, all against the stored IDF. Publishes a
+    new version and returns the number of movies added (0 if nothing has
+    been built yet — run a full rebuild first — or another publisher got
+    there first; the next update retries).
+    """
+    return _add_movies(movie_ids, block_size)[0]
+
+
+def _watermark(artifact):
+    """Latest ``updated_at`` already considered for this version (None: unknown)."""
+    published = parse_datetime(artifact.metadata.get('indexed_through') or '')
+    scanned = cache.get(_scanned_key(artifact.version))
+    return max(filter(None, [published, scanned]), default=None)
+
+
+def _scanned_key(version):
+    return f'{ARTIFACT_NAME}:scanned:{version}'
+
+
+def _add_movies(movie_ids, block_size, indexed_through=None):
+    with _publish_lock() as locked:
+        if not locked:
+            logger.info("Text neighbour update skipped; another publish is in progress")
+            return 0, None
+        artifact = registry.get(ARTIFACT_NAME)
+        if artifact is None:
+            return 0, None
+        if registry.current_version(ARTIFACT_NAME) != artifact.version:
+            return 0, None  # this worker's mapping is behind; retry once it reloads
+        return _fold_into(artifact, movie_ids, block_size, indexed_through)
+
+
+def _fold_into(artifact, movie_ids, block_size, indexed_through):
+    from scipy import sparse
+
+    known_ids = artifact['movie_ids']
+    new_ids, texts = [], []
+    for movie_id, overview, tagline in (
+        Movie.objects.filter(id__in=movie_ids).order_by('id')
+        .values_list('id', 'overview', 'tagline')
+    ):
+        text = movie_text(overview, tagline)
+        pos = np.searchsorted(known_ids, movie_id)
+        if text and not (pos < len(known_ids) and known_ids[pos] == movie_id):
+            new_ids.append(movie_id)
+            texts.append(text)
+    if not new_ids:
+        if indexed_through is not None:
+            # Nothing to add: remember the scan without publishing a copy
+            cache.set(_scanned_key(artifact.version), indexed_through, None)
+        return 0, artifact.version
+
+    k = int(artifact.metadata['k'])
+    min_similarity = float(artifact.metadata['min_similarity'])
+    idf = np.asarray(artifact['idf'])
+    existing = sparse.csr_matrix(
+        (
+            np.asarray(artifact['data']),
+            np.asarray(artifact['indices']),
+            np.asarray(artifact['indptr']),
+        ),
+        shape=(len(known_ids), N_FEATURES),
+    )
+    added = tfidf(term_counts(texts), idf)
+    matrix = sparse.vstack([existing, added]).tocsr()
+    all_ids = np.concatenate([known_ids, np.asarray(new_ids, dtype=np.int64)])
+
+    neighbor_ids = np.vstack([
+        artifact['neighbor_ids'], np.zeros((len(new_ids), k), dtype=np.int64),
+    ])
+    neighbor_scores = np.vstack([
+        artifact['neighbor_scores'], np.zeros((len(new_ids), k), dtype=np.float32),
+    ])
+
+    # Top-K lists for the new movies against everything
+    _fill_top_k(
+        added, matrix, all_ids, len(known_ids), neighbor_ids, neighbor_scores,
+        k, block_size, min_similarity,
+    )
+
+    # Existing movies that now have a closer neighbour
+    reverse = existing.dot(added.T).tocoo()
+    for row, col, score in zip(reverse.row, reverse.col, reverse.data):
+        if score > min_similarity and score > neighbor_scores[row, -1]:
+            _insert_neighbor(neighbor_ids[row], neighbor_scores[row], new_ids[col], score)
+
+    order = np.argsort(all_ids, kind='stable')
+    version = _publish(
+        all_ids[order], neighbor_ids[order], neighbor_scores[order],
+        idf, matrix[order], k, min_similarity,
+        indexed_through or _watermark(artifact),
+    )
+    logger.info(f"Added {len(new_ids)} movies to text neighbours ({version})")
+    return len(new_ids), version
+
+
+def _fill_top_k(rows_matrix, matrix, movie_ids, row_offset, neighbor_ids, neighbor_scores,
+                k, block_size, min_similarity):
+    from .neighbors import top_k_rows
+
+    transposed = matrix.T.tocsc()
+    for start in range(0, rows_matrix.shape[0], block_size):
+        block = rows_matrix[start:start + block_size].dot(transposed)
+        for row, neighbors in top_k_rows(block, row_offset + start, k, min_similarity):
+            for slot, (col, score) in enumerate(neighbors):
+                neighbor_ids[row, slot] = movie_ids[col]
+                neighbor_scores[row, slot] = score
+
+
+def _insert_neighbor(ids, scores, movie_id, score):
+    """Insert into a descending top-K row in place, dropping the weakest entry."""
+    slot = int(np.searchsorted(-scores, -score, side='right'))
+    ids[slot + 1:] = ids[slot:-1].copy()
+    scores[slot + 1:] = scores[slot:-1].copy()
+    ids[slot], scores[slot] = movie_id, score
+
+
+@contextmanager
+def _publish_lock(wait=0):
+    """Cross-process lock around activating a version; yields whether it was taken."""
+    deadline = time.monotonic() + wait
+    while not cache.add(PUBLISH_LOCK_KEY, True, PUBLISH_LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            yield False
+            return
+        time.sleep(0.5)
+    try:
+        yield True
+    finally:
+        cache.delete(PUBLISH_LOCK_KEY)
+
+
+def _publish(movie_ids, neighbor_ids, neighbor_scores, idf, matrix, k, min_similarity,
+             indexed_through=None):
+    version = registry.publish(
+        ARTIFACT_NAME,
+        {
+            'movie_ids': movie_ids,
+            'neighbor_ids': neighbor_ids,
+            'neighbor_scores': neighbor_scores,
+            'idf': idf,
+            'data': matrix.data.astype(np.float32),
+            'indices': matrix.indices.astype(np.int32),
+            'indptr': matrix.indptr.astype(np.int64),
+        },
+        metadata={
+            'k': k,
+            'min_similarity': min_similarity,
+            'n_features': N_FEATURES,
+            'indexed_through': indexed_through.isoformat() if indexed_through else None,
+        },
+    )
+    registry.prune(ARTIFACT_NAME)
+    return version
+
+
+# ----------------------------------------------------------------------
+# Request-time lookups
+# ----------------------------------------------------------------------
+
+def similar_movie_ids(movie_id, limit=DEFAULT_K):
+    """``[(movie_id, similarity), ...]`` for one movie, best first ([] if unknown)."""
+    return neighbors_of([movie_id], limit).get(movie_id, [])
+
+
+def neighbors_of(movie_ids, limit=DEFAULT_K):
+    """``{movie_id: [(neighbor_id, similarity), ...]}`` read from the mapped artifact."""
+    artifact = registry.get(ARTIFACT_NAME)
+    if artifact is None or not movie_ids:
+        return {}
+
+    known_ids = artifact['movie_ids']
+    lookup = np.asarray(sorted(movie_ids), dtype=np.int64)
+    positions = np.searchsorted(known_ids, lookup)
+    result = {}
+    for movie_id, pos in zip(lookup.tolist(), positions.tolist()):
+        if pos >= len(known_ids) or known_ids[pos] != movie_id:
+            continue
+        ids = artifact['neighbor_ids'][pos, :limit]
+        scores = artifact['neighbor_scores'][pos, :limit]
+        result[movie_id] = [
+            (int(nid), float(score)) for nid, score in zip(ids, scores) if score > 0
+        ]
+    return result
@@ -0,0 +1,107 @@
+"""
+Recommendation payload cache and login warm-up.
+
+The stored feed is serialised once and cached per user
+(``RECOMMENDATION_PAYLOAD_CACHE_TTL``); the list endpoint only blends the
+live session on top. The cache is dropped whenever the engine saves new
+recommendations or the user's suppressions change.
+
+On login and token refresh ``schedule_warm_up`` queues background work
+so the first feed request is a cache hit:
+
+  * nothing stored, or older than ``RECOMMENDATION_STALE_AFTER`` →
+    a refresh job (which fills the cache when it finishes);
+  * otherwise → just fill the payload cache.
+
+Warm-ups are deduplicated and rate-limited per user with ``cache.add``:
+at most one per ``RECOMMENDATION_WARMUP_INTERVAL`` seconds.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.recommendations.models import Recommendation, SuppressedMovie
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def payload_key(user_id):
+    return f'recommendations_payload_{user_id}'
+
+
+def warmup_key(user_id):
+    return f'recommendations_warmup_{user_id}'
+
+
+def stored_recommendations(user):
+    """The user's stored recommendations, minus suppressed movies, best first."""
+    return Recommendation.objects.filter(
+        user=user
+    ).exclude(
+        movie_id__in=SuppressedMovie.objects.filter(user=user).values('movie_id')
+    ).select_related('movie').order_by('-score', '-created_at')
+
+
+def cache_payload(user):
+    """Serialise the stored feed and cache it. Returns the payload."""
+    from apps.recommendations.serializers import RecommendationSerializer
+
+    payload = RecommendationSerializer(stored_recommendations(user), many=True).data
+    if payload:
+        cache.set(payload_key(user.pk), payload, settings.RECOMMENDATION_PAYLOAD_CACHE_TTL)
+    return payload
+
+
+def get_payload(user):
+    """Cached serialised feed, built on a miss ([] if nothing is stored)."""
+    payload = cache.get(payload_key(user.pk))
+    if payload is None:
+        payload = cache_payload(user)
+    return payload
+
+
+def invalidate_payload(user_id):
+    """Drop the cached feed once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(payload_key(user_id)))
+
+
+def invalidate_payloads(user_ids):
+    """Drop several users' cached feeds once the current transaction commits."""
+    keys = [payload_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def schedule_warm_up(user):
+    """Queue a background warm-up unless one ran for this user recently."""
+    if not cache.add(warmup_key(user.pk), True, settings.RECOMMENDATION_WARMUP_INTERVAL):
+        return False
+
+    from .jobs import dispatch
+
+    transaction.on_commit(lambda: dispatch('warm_up_recommendations', warm_up, user.pk))
+    return True
+
+
+def warm_up(user_id):
+    """Make sure the user's feed is fresh and cached. Returns what was done."""
+    from .jobs import enqueue_refresh
+
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return 'missing'
+
+    newest = Recommendation.objects.filter(user=user).aggregate(newest=Max('updated_at'))['newest']
+    stale_before = timezone.now() - timedelta(hours=settings.RECOMMENDATION_STALE_AFTER_HOURS)
+    if newest is None or newest < stale_before:
+        enqueue_refresh(user)
+        return 'refresh_queued'
+
+    cache_payload(user)
+    return 'cached'
@@ -0,0 +1,26 @@
+"""Recommendation signal handlers."""
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.favorites.models import Favorite
+
+from .services import cooccurrence
+
+
+@receiver(post_save, sender=Favorite)
+def favorite_added(sender, instance, created, **kwargs):
+    """Keep item co-occurrence counts in sync with new favourites."""
+    if created:
+        cooccurrence.record_favorite_added(instance.user_id, instance.movie_id)
+
+
+@receiver(pre_delete, sender=Favorite)
+def favorite_removing(sender, instance, origin=None, **kwargs):
+    """Note favourites deleted together so their shared pairs are decremented once."""
+    cooccurrence.favorite_deleting(instance.user_id, instance.movie_id, origin)
+
+
+@receiver(post_delete, sender=Favorite)
+def favorite_removed(sender, instance, origin=None, **kwargs):
+    """Keep item co-occurrence counts in sync with removed favourites."""
+    cooccurrence.record_favorite_removed(instance.user_id, instance.movie_id, origin)
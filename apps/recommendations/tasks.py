@@ -0,0 +1,128 @@
+"""Recommendation Celery tasks."""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='apps.recommendations.tasks.compute_user_neighbors')
+def compute_user_neighbors(k: int = 20, chunk_size: int = 1000):
+    """
+    Recompute user-user neighbour lists for the collaborative signal.
+    Intended to run periodically (e.g. nightly via Celery beat).
+    """
+    from .services.neighbors import compute_user_neighbors as _compute
+
+    try:
+        stats = _compute(k=k, chunk_size=chunk_size)
+        logger.info(f"User neighbours recomputed: {stats}")
+        return {'status': 'success', **stats}
+    except Exception as e:
+        logger.error(f"User neighbour computation failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.recommendations.tasks.prune_cooccurrences')
+def prune_cooccurrences(top_n: int = 100):
+    """Trim item co-occurrence lists to the top-N related movies per movie."""
+    from .services.cooccurrence import prune_cooccurrences as _prune
+
+    try:
+        deleted = _prune(top_n=top_n)
+        return {'status': 'success', 'deleted': deleted}
+    except Exception as e:
+        logger.error(f"Co-occurrence pruning failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.recommendations.tasks.run_recommendation_job')
+def run_recommendation_job(job_id: int):
+    """Run a queued recommendation refresh job (see services.jobs)."""
+    from .services.jobs import run_job
+
+    try:
+        job = run_job(job_id)
+        if job is None:
+            return {'status': 'failed', 'error': f'Job {job_id} not found'}
+        return {'status': 'success', 'job_id': job_id, 'job_status': job.status}
+    except Exception as e:
+        logger.error(f"Recommendation job {job_id} failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.recommendations.tasks.rebuild_text_neighbors')
+def rebuild_text_neighbors(k: int = 20):
+    """
+    Rebuild overview-text neighbours and publish a new artifact version.
+    New movies are added by ``update_text_neighbors`` in between; run this nightly.
+    """
+    from .services.text_similarity import rebuild_text_neighbors as _rebuild
+
+    try:
+        stats = _rebuild(k=k)
+        logger.info(f"Text neighbours rebuilt: {stats}")
+        return {'status': 'success', **stats}
+    except Exception as e:
+        logger.error(f"Text neighbour rebuild failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.recommendations.tasks.update_text_neighbors')
+def update_text_neighbors():
+    """
+    Fold movies created or hydrated since the last publish into the text
+    neighbours; same as ``rebuild_text_neighbors --incremental``, for
+    deployments with a Celery worker. Overlapping runs skip rather than race.
+    """
+    from .services.text_similarity import update_text_neighbors as _update
+
+    try:
+        return {'status': 'success', **_update()}
+    except Exception as e:
+        logger.error(f"Text neighbour update failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.recommendations.tasks.apply_retention')
+def apply_retention():
+    """
+    Cap, purge and archive recommendation data in small throttled batches.
+    Intended to run periodically (e.g. nightly via Celery beat).
+    """
+    from .services.retention import apply_retention as _apply
+
+    try:
+        stats = _apply()
+        return {'status': 'success', **stats}
+    except Exception as e:
+        logger.error(f"Recommendation retention failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.recommendations.tasks.warm_up_recommendations')
+def warm_up_recommendations(user_id: int):
+    """Refresh or re-cache a user's feed ahead of their first request (see services.warmup)."""
+    from .services.warmup import warm_up
+
+    try:
+        return {'status': 'success', 'user_id': user_id, 'action': warm_up(user_id)}
+    except Exception as e:
+        logger.error(f"Recommendation warm-up for user {user_id} failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+@shared_task(name='apps.recommendations.tasks.run_shadow_comparison')
+def run_shadow_comparison(user_id: int, primary_name: str, candidate_name: str, primary_ids: list,
+                          primary_latency_ms: float, primary_queries: int, limit: int = 20):
+    """Shadow-run a candidate engine and record how it compares (see services.engine_registry)."""
+    from .services.engine_registry import run_shadow
+
+    try:
+        comparison = run_shadow(
+            user_id, primary_name, candidate_name, primary_ids,
+            primary_latency_ms, primary_queries, limit,
+        )
+        return {'status': 'success', 'comparison_id': comparison.pk if comparison else None}
+    except Exception as e:
+        logger.error(f"Shadow comparison for user {user_id} failed: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
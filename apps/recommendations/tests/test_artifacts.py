@@ -0,0 +1,58 @@
+"""
+Tests for the versioned artifact registry.
+"""
+import numpy as np
+import pytest
+from apps.recommendations.services.artifacts import ArtifactError, ArtifactRegistry
+
+
+class TestArtifactRegistry:
+    """Test publishing, memory-mapped loading and hot swapping."""
+
+    def test_publish_and_load_memory_mapped(self, tmp_path):
+        """Test published arrays load read-only through mmap with metadata."""
+        registry = ArtifactRegistry(root=tmp_path, check_interval=0)
+        registry.publish('factors', {'items': np.arange(6.0).reshape(3, 2)}, metadata={'k': 2})
+
+        artifact = registry.get('factors')
+
+        assert isinstance(artifact['items'], np.memmap)
+        assert artifact['items'].tolist() == [[0, 1], [2, 3], [4, 5]]
+        assert artifact.metadata['k'] == 2
+        assert artifact.metadata['arrays']['items'] == {'shape': [3, 2], 'dtype': 'float64'}
+        assert not artifact['items'].flags.writeable
+
+    def test_reader_picks_up_new_version_and_rollback(self, tmp_path):
+        """Test a running reader switches versions when CURRENT moves."""
+        reader = ArtifactRegistry(root=tmp_path, check_interval=0)
+        writer = ArtifactRegistry(root=tmp_path)
+        writer.publish('factors', {'items': np.zeros(2)}, version='v1')
+
+        assert reader.get('factors').version == 'v1'
+
+        writer.publish('factors', {'items': np.ones(2)}, version='v2')
+        assert reader.get('factors').version == 'v2'
+        assert reader.get('factors')['items'].tolist() == [1, 1]
+
+        writer.activate('factors', 'v1')
+        assert reader.get('factors')['items'].tolist() == [0, 0]
+
+    def test_missing_artifact_and_version(self, tmp_path):
+        """Test unknown names return None and unknown versions cannot be activated."""
+        registry = ArtifactRegistry(root=tmp_path)
+
+        assert registry.get('nothing') is None
+        with pytest.raises(ArtifactError):
+            registry.activate('nothing', 'v1')
+
+    def test_prune_keeps_active_version(self, tmp_path):
+        """Test pruning removes old versions but never the active one."""
+        registry = ArtifactRegistry(root=tmp_path)
+        for version in ('v1', 'v2', 'v3'):
+            registry.publish('factors', {'items': np.zeros(1)}, version=version)
+        registry.activate('factors', 'v1')
+
+        removed = registry.prune('factors', keep=1)
+
+        assert removed == ['v2']
+        assert registry.versions('factors') == ['v1', 'v3']
@@ -0,0 +1,152 @@
+"""
+Tests for incrementally maintained item co-occurrence counts.
+"""
+import pytest
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from apps.favorites.models import Favorite
+from apps.movies.models import Movie
+from apps.recommendations.models import MovieCooccurrence
+from apps.recommendations.services.cooccurrence import (
+    prune_cooccurrences,
+    rebuild_cooccurrences,
+    related_movie_ids,
+)
+from apps.recommendations.services.recommendation_engine import RecommendationEngine
+from apps.users.models import User
+
+
+def _counts():
+    return {
+        (row.movie_id, row.related_movie_id): row.count
+        for row in MovieCooccurrence.objects.all()
+    }
+
+
+@pytest.mark.django_db
+class TestCooccurrence:
+    """Test incremental maintenance, pruning and rebuilds."""
+
+    def setup_method(self):
+        """Create a few movies and users."""
+        self.movies = [
+            Movie.objects.create(tmdb_id=3000 + i, title=f'Movie {i}', vote_count=100)
+            for i in range(4)
+        ]
+        self.users = [
+            User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@example.com', password='TestPass123!@#'
+            )
+            for i in range(2)
+        ]
+
+    def test_adding_favorites_increments_pairs(self):
+        """Test both directions are counted as favourites are added."""
+        a, b, c, _ = self.movies
+        for user in self.users:
+            Favorite.objects.create(user=user, movie=a)
+            Favorite.objects.create(user=user, movie=b)
+        Favorite.objects.create(user=self.users[0], movie=c)
+
+        counts = _counts()
+        assert counts[(a.id, b.id)] == 2
+        assert counts[(b.id, a.id)] == 2
+        assert counts[(a.id, c.id)] == 1
+        assert related_movie_ids(a.id) == [(b.id, 2), (c.id, 1)]
+
+    def test_removing_favorite_decrements_and_deletes(self):
+        """Test removals decrement counts and drop empty pairs."""
+        a, b, _, _ = self.movies
+        Favorite.objects.create(user=self.users[0], movie=a)
+        favorite = Favorite.objects.create(user=self.users[0], movie=b)
+
+        favorite.delete()
+
+        assert not MovieCooccurrence.objects.exists()
+
+    def test_bulk_and_cascade_deletes_decrement_pairs(self):
+        """Test deleting several favourites at once leaves exact counts."""
+        a, b, c, d = self.movies
+        for user in self.users:
+            for movie in (a, b, c):
+                Favorite.objects.create(user=user, movie=movie)
+        Favorite.objects.create(user=self.users[1], movie=d)
+
+        Favorite.objects.filter(user=self.users[0], movie__in=[a, b]).delete()
+        assert _counts()[(a.id, b.id)] == 1
+        assert _counts()[(b.id, c.id)] == 1
+
+        self.users[1].delete()
+        assert _counts() == {}
+
+    def test_failed_delete_leaves_no_state_behind(self):
+        """Test a delete aborted after pre_delete does not skew later removals."""
+        a, b, c, _ = self.movies
+        for movie in (a, b, c):
+            Favorite.objects.create(user=self.users[0], movie=movie)
+        Favorite.objects.create(user=self.users[1], movie=a)
+        Favorite.objects.create(user=self.users[1], movie=c)
+
+        def fail(sender, **kwargs):
+            raise RuntimeError('delete aborted')
+
+        pre_delete.connect(fail, sender=Favorite)
+        try:
+            with pytest.raises(RuntimeError), transaction.atomic():
+                Favorite.objects.filter(user=self.users[0], movie__in=[a, b]).delete()
+        finally:
+            pre_delete.disconnect(fail, sender=Favorite)
+
+        Favorite.objects.get(user=self.users[0], movie=c).delete()
+        Favorite.objects.get(user=self.users[0], movie=a).delete()
+
+        assert _counts() == {(a.id, c.id): 1, (c.id, a.id): 1}
+
+    def test_pruned_direction_is_restored_on_increment(self):
+        """Test a pair pruned in one direction keeps counting in both."""
+        a, b, _, _ = self.movies
+        Favorite.objects.create(user=self.users[0], movie=a)
+        Favorite.objects.create(user=self.users[0], movie=b)
+        MovieCooccurrence.objects.filter(movie=a, related_movie=b).delete()
+
+        Favorite.objects.create(user=self.users[1], movie=a)
+        Favorite.objects.create(user=self.users[1], movie=b)
+
+        assert _counts() == {(a.id, b.id): 1, (b.id, a.id): 2}
+
+    def test_rebuild_matches_incremental_counts(self):
+        """Test a rebuild reproduces the incrementally maintained table."""
+        a, b, c, d = self.movies
+        for movie in (a, b, c):
+            Favorite.objects.create(user=self.users[0], movie=movie)
+        for movie in (a, b, d):
+            Favorite.objects.create(user=self.users[1], movie=movie)
+        incremental = _counts()
+
+        stats = rebuild_cooccurrences()
+
+        assert _counts() == incremental
+        assert stats['rows'] == len(incremental)
+
+    def test_prune_keeps_top_n(self):
+        """Test pruning keeps the strongest related movies per movie."""
+        a, b, c, d = self.movies
+        for movie in (a, b, c, d):
+            Favorite.objects.create(user=self.users[0], movie=movie)
+        Favorite.objects.create(user=self.users[1], movie=a)
+        Favorite.objects.create(user=self.users[1], movie=d)
+
+        prune_cooccurrences(top_n=1)
+
+        assert related_movie_ids(a.id) == [(d.id, 2)]
+        assert MovieCooccurrence.objects.filter(movie=b).count() == 1
+
+    def test_similar_movies_prefers_cofavorites(self):
+        """Test similar movies come from the co-occurrence list first."""
+        a, b, _, _ = self.movies
+        Favorite.objects.create(user=self.users[0], movie=a)
+        Favorite.objects.create(user=self.users[0], movie=b)
+
+        similar = RecommendationEngine(self.users[1]).get_similar_movies(a.id, limit=5)
+
+        assert similar == [b]
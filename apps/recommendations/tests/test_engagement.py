@@ -0,0 +1,130 @@
+"""
+Tests for the buffered engagement beacon endpoint.
+"""
+import time
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.movies.models import Movie
+from apps.recommendations.models import EngagementCounter, Recommendation
+from apps.recommendations.services.engagement import EngagementBuffer, engagement_buffer
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestEngagementEvents:
+    """Test beacon ingestion and bulk flushing."""
+
+    def setup_method(self):
+        """Create a user with two recommendations."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='clicker', email='clicker@example.com', password='TestPass123!@#'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.recs = [
+            Recommendation.objects.create(
+                user=self.user,
+                movie=Movie.objects.create(tmdb_id=5000 + i, title=f'Movie {i}'),
+                recommendation_type='content_based',
+                score=0.5,
+            )
+            for i in range(2)
+        ]
+        self.url = reverse('api_v1:recommendations:recommendation-events')
+        engagement_buffer.flush()
+
+    def test_events_are_buffered_then_flushed_in_bulk(self):
+        """Test beacons only hit the database on flush."""
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='TestPass123!@#'
+        )
+        foreign = Recommendation.objects.create(
+            user=other, movie=self.recs[0].movie, score=0.1
+        )
+        data = {'events': [
+            {'recommendation': self.recs[0].id, 'event': 'impression'},
+            {'recommendation': self.recs[1].id, 'event': 'impression'},
+            {'recommendation': self.recs[0].id, 'event': 'click'},
+            {'recommendation': foreign.id, 'event': 'click'},
+        ]}
+
+        response = self.client.post(self.url, data, format='json')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data == {'accepted': 3, 'ignored': 1}
+        self.recs[0].refresh_from_db()
+        assert self.recs[0].is_clicked is False
+
+        assert engagement_buffer.flush() == 3
+
+        self.recs[0].refresh_from_db()
+        foreign.refresh_from_db()
+        assert self.recs[0].is_clicked is True
+        assert foreign.is_clicked is False
+        counter = EngagementCounter.objects.get(
+            day=timezone.now().date(), recommendation_type='content_based'
+        )
+        assert (counter.impressions, counter.clicks, counter.rates) == (2, 1, 0)
+
+    def test_counters_accumulate_across_flushes(self):
+        """Test repeated flushes increment the same aggregate row."""
+        buffer = EngagementBuffer(max_events=100, interval=60)
+        buffer.record([(self.recs[0].id, 'content_based', 'impression')])
+        buffer.flush()
+        buffer.record([(self.recs[1].id, 'content_based', 'impression')])
+        buffer.flush()
+
+        assert EngagementCounter.objects.get().impressions == 2
+
+    def test_events_without_recommendation_id_are_ignored(self):
+        """Test beacons for session-blended items (id null) do not fail the batch."""
+        data = {'events': [
+            {'recommendation': self.recs[0].id, 'event': 'impression'},
+            {'recommendation': None, 'event': 'impression'},
+            {'recommendation': 0, 'event': 'click'},
+        ]}
+
+        response = self.client.post(self.url, data, format='json')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data == {'accepted': 1, 'ignored': 2}
+
+    def test_failed_flush_keeps_events_for_retry(self):
+        """Test events survive a failed flush, and overflow is counted as lost."""
+        buffer = EngagementBuffer(max_events=100, interval=60, max_retained=3)
+        buffer.record([(self.recs[0].id, 'content_based', 'click')] * 2)
+
+        with mock.patch.object(buffer, '_write_counters', side_effect=RuntimeError('db down')):
+            with pytest.raises(RuntimeError):
+                buffer.flush()
+            assert len(buffer) == 2
+            buffer.record([(self.recs[1].id, 'content_based', 'impression')] * 2)
+            with pytest.raises(RuntimeError):
+                buffer.flush()
+
+        assert (len(buffer), buffer.lost) == (0, 4)
+        buffer.record([(self.recs[0].id, 'content_based', 'click')])
+        assert buffer.flush() == 1
+
+    def test_one_size_triggered_flush_at_a_time(self):
+        """Test beacons arriving over the limit do not each start a flush thread."""
+        buffer = EngagementBuffer(max_events=1, interval=60)
+
+        # Stands in for a flush that is still running
+        with mock.patch.object(buffer, '_flush_from_size_trigger') as flush:
+            for _ in range(3):
+                buffer.record([(self.recs[0].id, 'content_based', 'impression')])
+            time.sleep(0.1)
+
+        assert flush.call_count == 1
+
+    def test_empty_batch_rejected(self):
+        """Test an empty batch is a validation error."""
+        response = self.client.post(self.url, {'events': []}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
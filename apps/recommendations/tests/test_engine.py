@@ -0,0 +1,105 @@
+"""
+Tests for the recommendation engine.
+"""
+from unittest import mock
+
+import pytest
+from apps.favorites.models import Favorite
+from apps.movies.models import Genre, Movie
+from apps.recommendations.models import Recommendation
+from apps.recommendations.services.recommendation_engine import RecommendationEngine
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestDeadline:
+    """Test latency-budgeted generation."""
+
+    def setup_method(self):
+        """Create a catalogue and a user who likes one genre."""
+        self.drama = Genre.objects.create(tmdb_id=18, name='Drama')
+        self.movies = []
+        for i in range(12):
+            movie = Movie.objects.create(
+                tmdb_id=7000 + i, title=f'Movie {i}',
+                vote_count=100, vote_average=6.0, popularity=100.0 - i,
+            )
+            if i % 2 == 0:
+                movie.genres.add(self.drama)
+            self.movies.append(movie)
+        self.user = User.objects.create_user(
+            username='hurried', email='hurried@example.com', password='TestPass123!@#'
+        )
+        Favorite.objects.create(user=self.user, movie=self.movies[0])
+
+    def test_without_deadline_run_is_complete(self):
+        """Test an unbounded run is never flagged partial."""
+        engine = RecommendationEngine(self.user)
+        recs = engine.generate_recommendations(limit=5)
+
+        assert engine.is_partial is False
+        assert len(recs) == 5
+
+    def test_generous_deadline_matches_unbounded_run(self):
+        """Test priority ordering does not change a run that finishes in time."""
+        unbounded = RecommendationEngine(self.user).generate_recommendations(
+            limit=5, persist=False,
+        )
+        bounded_engine = RecommendationEngine(self.user)
+        bounded = bounded_engine.generate_recommendations(
+            limit=5, persist=False, deadline=60,
+        )
+
+        assert bounded_engine.is_partial is False
+        assert [r['movie'].id for r in bounded] == [r['movie'].id for r in unbounded]
+
+    @mock.patch('apps.recommendations.services.recommendation_engine.queue_full_regeneration')
+    def test_expired_deadline_returns_partial_and_queues_full_run(self, queue):
+        """Test an exhausted budget still returns results and queues a full run."""
+        engine = RecommendationEngine(self.user)
+        recs = engine.generate_recommendations(limit=5, deadline=1e-9)
+
+        assert engine.is_partial is True
+        assert len(recs) == 5  # padded from popular filler
+        assert Recommendation.objects.filter(user=self.user).count() == 5
+        queue.assert_called_once_with(self.user, 5)
+
+
+class TestDiversify:
+    """Test the MMR diversity re-ranker."""
+
+    @staticmethod
+    def _item(name, score, genre_ids):
+        return {'movie': name, 'score': score, 'genre_ids': frozenset(genre_ids)}
+
+    def test_lambda_one_is_pure_relevance(self):
+        """Test λ = 1 keeps the score order."""
+        scored = [
+            self._item('a', 0.9, {1}),
+            self._item('b', 0.8, {1}),
+            self._item('c', 0.7, {2}),
+        ]
+
+        result = RecommendationEngine._diversify(scored, 3, diversity_lambda=1.0)
+
+        assert [r['movie'] for r in result] == ['a', 'b', 'c']
+
+    def test_low_lambda_promotes_other_genres(self):
+        """Test a lower λ pulls a different genre above a same-genre item."""
+        scored = [
+            self._item('a', 0.9, {1}),
+            self._item('b', 0.85, {1}),
+            self._item('c', 0.7, {2}),
+        ]
+
+        result = RecommendationEngine._diversify(scored, 2, diversity_lambda=0.5)
+
+        assert [r['movie'] for r in result] == ['a', 'c']
+
+    def test_reranking_issues_no_queries(self):
+        """Test re-ranking works purely on in-memory genre vectors (no DB access here)."""
+        scored = [self._item(str(i), 1.0 - i / 100, {i % 3}) for i in range(50)]
+
+        result = RecommendationEngine._diversify(scored, 10)
+
+        assert len(result) == 10
@@ -0,0 +1,112 @@
+"""
+Tests for the engine registry, cohort routing and shadow comparisons.
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.movies.models import Movie
+from apps.recommendations.checks import check_engine_settings
+from apps.recommendations.models import EngineComparison, RecommendationJob
+from apps.recommendations.services import engine_registry
+from apps.users.models import User
+
+DEFAULT_ENGINE = 'apps.recommendations.services.recommendation_engine.RecommendationEngine'
+
+
+class PopularityEngine:
+    """Minimal candidate engine: the most popular movies, nothing persisted."""
+
+    def __init__(self, user):
+        self.user = user
+        self.is_partial = False
+
+    def generate_recommendations(self, limit=20, persist=True, deadline=None, on_progress=None):
+        return [
+            {'movie': movie, 'score': 1.0, 'reason': 'Popular'}
+            for movie in Movie.objects.order_by('-popularity')[:limit]
+        ]
+
+
+@pytest.mark.django_db
+class TestEngineRegistry:
+    """Test engine selection and shadow scoring."""
+
+    @pytest.fixture(autouse=True)
+    def _engines(self, settings):
+        settings.RECOMMENDATION_JOB_BACKEND = 'inline'
+        settings.RECOMMENDATION_ENGINES = {
+            'default': DEFAULT_ENGINE,
+            'popular': f'{__name__}.PopularityEngine',
+        }
+        self.settings = settings
+
+    def setup_method(self):
+        """Create a user and a small catalogue."""
+        self.user = User.objects.create_user(
+            username='routed', email='routed@example.com', password='TestPass123!@#'
+        )
+        for i in range(4):
+            Movie.objects.create(
+                tmdb_id=9500 + i, title=f'Movie {i}',
+                vote_count=100, vote_average=6.0, popularity=10.0 + i,
+            )
+
+    def test_cohorts_route_a_stable_share_of_users(self):
+        """Test cohort percentages map users deterministically onto engines."""
+        self.settings.RECOMMENDATION_ENGINE_COHORTS = {'popular': 100}
+        assert engine_registry.engine_name_for(self.user) == 'popular'
+
+        self.settings.RECOMMENDATION_ENGINE_COHORTS = {'popular': 30}
+        routed = {
+            uid: engine_registry.cohort_bucket(uid) < 30 for uid in range(1000)
+        }
+        assert 200 < sum(routed.values()) < 400
+        assert engine_registry.cohort_bucket(42) == engine_registry.cohort_bucket(42)
+
+    def test_explicit_engine_wins_and_unknown_is_rejected(self):
+        """Test a requested engine overrides the cohort; unknown names raise."""
+        assert engine_registry.engine_name_for(self.user, 'popular') == 'popular'
+        with pytest.raises(engine_registry.UnknownEngine):
+            engine_registry.engine_name_for(self.user, 'nope')
+
+    def test_shadow_run_records_comparison(self):
+        """Test a sampled generation shadow-runs the candidate and stores metrics."""
+        self.settings.RECOMMENDATION_SHADOW_ENGINE = 'popular'
+        self.settings.RECOMMENDATION_SHADOW_SAMPLE_RATE = 1.0
+
+        _engine, recs = engine_registry.generate(self.user, limit=4)
+
+        comparison = EngineComparison.objects.get()
+        assert (comparison.primary_engine, comparison.candidate_engine) == ('default', 'popular')
+        assert comparison.primary_queries > 0
+        assert comparison.candidate_queries == 1
+        assert comparison.overlap == 1.0  # both return the whole 4-movie catalogue
+        summary = engine_registry.summarize()
+        assert summary[0]['runs'] == 1 and summary[0]['overlap'] == 1.0
+
+    def test_staff_can_pick_engine_per_request(self):
+        """Test ?engine= is honoured for staff and validated."""
+        self.user.is_staff = True
+        self.user.save()
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse('api_v1:recommendations:recommendation-refresh')
+
+        response = client.post(f'{url}?engine=popular')
+        bad = client.post(f'{url}?engine=nope')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert RecommendationJob.objects.get().engine == 'popular'
+        assert bad.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_engine_setting_names_are_checked(self):
+        """Test the system check reports unregistered engine names."""
+        assert check_engine_settings(None) == []
+
+        self.settings.RECOMMENDATION_ENGINE_COHORTS = {'popluar': 10}
+        self.settings.RECOMMENDATION_SHADOW_ENGINE = 'missing'
+
+        assert [error.id for error in check_engine_settings(None)] == [
+            'recommendations.E002', 'recommendations.E003',
+        ]
@@ -0,0 +1,117 @@
+"""
+Tests for the offline recommendation evaluation harness.
+"""
+from unittest import mock
+
+import pytest
+from apps.favorites.models import Favorite, Rating
+from apps.movies.models import Genre, Movie
+from apps.recommendations.models import Recommendation, UserNeighbor
+from apps.recommendations.services.evaluation import (
+    RecommenderEvaluator,
+    ndcg_at_k,
+    percentile,
+    precision_at_k,
+    recall_at_k,
+)
+from apps.recommendations.services.neighbors import compute_user_neighbors
+from apps.recommendations.services.recommendation_engine import RecommendationEngine
+from apps.users.models import User
+
+
+class TestRankingMetrics:
+    """Test metric helpers."""
+
+    def test_precision_and_recall(self):
+        """Test precision@k and recall@k on a simple ranking."""
+        recommended = [1, 2, 3, 4]
+        relevant = {2, 4, 9}
+
+        assert precision_at_k(recommended, relevant, 2) == 0.5
+        assert recall_at_k(recommended, relevant, 4) == pytest.approx(2 / 3)
+
+    def test_ndcg_perfect_ranking(self):
+        """Test NDCG is 1.0 when relevant items are ranked first."""
+        assert ndcg_at_k([5, 6, 7], {5, 6}, 3) == pytest.approx(1.0)
+        assert ndcg_at_k([7, 5, 6], {5, 6}, 3) < 1.0
+
+    def test_metrics_with_no_relevant_items(self):
+        """Test metrics degrade to zero without relevant items."""
+        assert recall_at_k([1, 2], set(), 2) == 0.0
+        assert ndcg_at_k([1, 2], set(), 2) == 0.0
+
+    def test_percentile(self):
+        """Test interpolated percentiles."""
+        assert percentile([], 50) == 0.0
+        assert percentile([10, 20, 30, 40], 50) == 25
+        assert percentile([10, 20, 30, 40], 100) == 40
+
+
+@pytest.mark.django_db
+class TestRecommenderEvaluator:
+    """Test the evaluation run end to end."""
+
+    def setup_method(self):
+        """Create a small catalogue and a user with some history."""
+        action = Genre.objects.create(tmdb_id=28, name='Action')
+        self.movies = []
+        for i in range(8):
+            movie = Movie.objects.create(
+                tmdb_id=1000 + i, title=f'Movie {i}',
+                vote_count=100, vote_average=7.0, popularity=50.0 - i,
+            )
+            movie.genres.add(action)
+            self.movies.append(movie)
+
+        self.user = User.objects.create_user(
+            username='evaluser', email='eval@example.com', password='TestPass123!@#'
+        )
+        for movie in self.movies[:3]:
+            Favorite.objects.create(user=self.user, movie=movie)
+        Rating.objects.create(user=self.user, movie=self.movies[3], rating=9)
+
+    def test_run_reports_metrics_and_leaves_db_untouched(self):
+        """Test the report shape and that hold-out deletions are rolled back."""
+        report = RecommenderEvaluator(
+            configs=[{'name': 'baseline'}, {'name': 'genre-heavy', 'weights': {'genre': 0.9}}],
+            k=5,
+            holdout=2,
+        ).run()
+
+        assert report['users'] == 1
+        assert [c['name'] for c in report['configs']] == ['baseline', 'genre-heavy']
+        baseline = report['configs'][0]
+        assert baseline['evaluated_users'] == 1
+        assert set(baseline['metrics']) == {'precision@5', 'recall@5', 'ndcg@5', 'coverage'}
+        assert baseline['queries']['max'] > 0
+        assert report['configs'][1]['weights']['genre'] == 0.9
+
+        assert Favorite.objects.filter(user=self.user).count() == 3
+        assert Rating.objects.filter(user=self.user).count() == 1
+        assert not Recommendation.objects.filter(user=self.user).exists()
+
+    def test_neighbours_are_recomputed_without_held_out_likes(self):
+        """Test a neighbour who only shares the held-out likes does not count."""
+        twin = User.objects.create_user(
+            username='twin', email='twin@example.com', password='TestPass123!@#'
+        )
+        Favorite.objects.create(user=twin, movie=self.movies[3])  # the user's latest (rating)
+        Favorite.objects.create(user=twin, movie=self.movies[7])
+        compute_user_neighbors()
+        assert UserNeighbor.objects.filter(user=self.user, neighbor=twin).exists()
+
+        seen = []
+        original = RecommendationEngine.generate_recommendations
+
+        def spy(engine, *args, **kwargs):
+            if engine.user == self.user:
+                seen.append(list(UserNeighbor.objects.filter(user=self.user).values_list(
+                    'neighbor_id', flat=True,
+                )))
+            return original(engine, *args, **kwargs)
+
+        with mock.patch.object(RecommendationEngine, 'generate_recommendations', spy):
+            RecommenderEvaluator(k=5, holdout=1).run()
+
+        assert seen == [[]]
+        assert UserNeighbor.objects.filter(user=self.user, neighbor=twin).exists()
@@ -0,0 +1,142 @@
+"""
+Tests for asynchronous recommendation refresh jobs.
+"""
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.movies.models import Movie
+from apps.recommendations.models import Recommendation, RecommendationJob
+from apps.recommendations.services import recommendation_engine
+from apps.recommendations.services.jobs import enqueue_refresh, run_job
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestRecommendationJobs:
+    """Test refresh enqueueing and status polling."""
+
+    @pytest.fixture(autouse=True)
+    def _inline_jobs(self, settings):
+        settings.RECOMMENDATION_JOB_BACKEND = 'inline'
+
+    def setup_method(self):
+        """Create a user and a small catalogue."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='jobber', email='jobber@example.com', password='TestPass123!@#'
+        )
+        self.client.force_authenticate(user=self.user)
+        for i in range(5):
+            Movie.objects.create(
+                tmdb_id=7000 + i, title=f'Movie {i}',
+                vote_count=100, vote_average=6.0, popularity=10.0 + i,
+            )
+        self.url = reverse('api_v1:recommendations:recommendation-refresh')
+
+    def test_refresh_returns_job_and_status_reports_result(
+        self, django_capture_on_commit_callbacks
+    ):
+        """Test refresh returns 202 immediately and the job finishes in the background."""
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(self.url)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == 'pending'
+        assert response.data['status_url'].endswith(f'/jobs/{response.data["id"]}/')
+
+        status_response = self.client.get(response.data['status_url'])
+
+        assert status_response.status_code == status.HTTP_200_OK
+        assert status_response.data['status'] == 'succeeded'
+        assert status_response.data['progress'] == 100
+        assert status_response.data['result'] == {'count': 5, 'partial': False}
+        assert len(status_response.data['recommendations']) == 5
+
+    def test_scoring_heartbeats_the_running_job(self):
+        """Test progress is reported from inside the scoring loop, not only between stages."""
+        fractions = []
+        engine = recommendation_engine.RecommendationEngine(self.user)
+
+        with mock.patch.object(recommendation_engine, 'PROGRESS_EVERY', 2):
+            engine.generate_recommendations(persist=False, on_progress=fractions.append)
+
+        assert len([f for f in fractions if 0.1 < f < 0.7]) == 2  # 5 candidates, every 2
+        assert fractions == sorted(fractions)
+
+    def test_active_job_is_reused(self):
+        """Test enqueueing twice while a job is pending returns the same job."""
+        first = enqueue_refresh(self.user)
+        second = enqueue_refresh(self.user)
+
+        assert first.pk == second.pk
+        assert RecommendationJob.objects.count() == 1
+
+    def test_stale_active_job_no_longer_blocks_refresh(self, settings):
+        """Test a job lost with its worker is expired and a new one is created."""
+        settings.RECOMMENDATION_JOB_STALE_AFTER = 60
+        lost = enqueue_refresh(self.user)
+        RecommendationJob.objects.filter(pk=lost.pk).update(
+            status='running', updated_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        job = enqueue_refresh(self.user)
+
+        lost.refresh_from_db()
+        assert job.pk != lost.pk
+        assert lost.status == 'failed'
+
+    def test_only_one_active_job_per_user(self):
+        """Test the database rejects a second active job for the same user."""
+        RecommendationJob.objects.create(user=self.user)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            RecommendationJob.objects.create(user=self.user, status='running')
+
+    def test_job_runs_once_when_dispatched_twice(self):
+        """Test a runner only works on a job it claimed from pending."""
+        job = RecommendationJob.objects.create(user=self.user)
+
+        with mock.patch(
+            'apps.recommendations.services.engine_registry.generate',
+            return_value=(mock.Mock(is_partial=False), []),
+        ) as generate:
+            run_job(job.pk)
+            run_job(job.pk)
+            RecommendationJob.objects.filter(pk=job.pk).update(status='running')
+            run_job(job.pk)
+
+        assert generate.call_count == 1
+
+    def test_failure_is_recorded(self):
+        """Test an engine error marks the job failed instead of raising."""
+        job = RecommendationJob.objects.create(user=self.user)
+
+        with mock.patch(
+            'apps.recommendations.services.recommendation_engine.'
+            'RecommendationEngine.generate_recommendations',
+            side_effect=RuntimeError('boom'),
+        ):
+            run_job(job.pk)
+
+        job.refresh_from_db()
+        assert job.status == 'failed'
+        assert job.error == 'boom'
+        assert Recommendation.objects.filter(user=self.user).count() == 0
+
+    def test_other_users_jobs_are_hidden(self):
+        """Test a user cannot poll someone else's job."""
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='TestPass123!@#'
+        )
+        job = RecommendationJob.objects.create(user=other)
+        url = reverse('api_v1:recommendations:recommendation-job-status', args=[job.pk])
+
+        response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,75 @@
+"""
+Tests for precomputed user-user neighbours.
+"""
+import pytest
+from apps.favorites.models import Favorite, Rating
+from apps.movies.models import Movie
+from apps.recommendations.models import UserNeighbor
+from apps.recommendations.services.neighbors import compute_user_neighbors
+from apps.recommendations.services.recommendation_engine import RecommendationEngine
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestComputeUserNeighbors:
+    """Test neighbour computation and its use by the engine."""
+
+    def setup_method(self):
+        """Create three users with overlapping taste."""
+        self.movies = [
+            Movie.objects.create(tmdb_id=2000 + i, title=f'Movie {i}', vote_count=100)
+            for i in range(6)
+        ]
+        self.alice = User.objects.create_user(
+            username='alice', email='alice@example.com', password='TestPass123!@#'
+        )
+        self.bob = User.objects.create_user(
+            username='bob', email='bob@example.com', password='TestPass123!@#'
+        )
+        self.carol = User.objects.create_user(
+            username='carol', email='carol@example.com', password='TestPass123!@#'
+        )
+        for i in (0, 1, 2):
+            Favorite.objects.create(user=self.alice, movie=self.movies[i])
+        for i in (0, 1, 3):
+            Favorite.objects.create(user=self.bob, movie=self.movies[i])
+        Favorite.objects.create(user=self.carol, movie=self.movies[2])
+        Rating.objects.create(user=self.carol, movie=self.movies[4], rating=10)
+
+    def test_neighbors_are_ranked_by_similarity(self):
+        """Test the closest user comes first and self is excluded."""
+        stats = compute_user_neighbors(k=5)
+
+        assert stats['users'] == 3
+        neighbors = list(
+            UserNeighbor.objects.filter(user=self.alice)
+            .order_by('-similarity')
+            .values_list('neighbor_id', flat=True)
+        )
+        assert neighbors == [self.bob.id, self.carol.id]
+        assert not UserNeighbor.objects.filter(user=self.alice, neighbor=self.alice).exists()
+
+    def test_k_limits_neighbors(self):
+        """Test only the top-K neighbours are stored."""
+        compute_user_neighbors(k=1)
+
+        assert UserNeighbor.objects.filter(user=self.alice).count() == 1
+
+    def test_recompute_removes_users_without_history(self):
+        """Test stale neighbour lists are dropped on recompute."""
+        compute_user_neighbors(k=5)
+        Favorite.objects.filter(user=self.carol).delete()
+        Rating.objects.filter(user=self.carol).delete()
+
+        compute_user_neighbors(k=5)
+
+        assert not UserNeighbor.objects.filter(user=self.carol).exists()
+
+    def test_engine_boost_is_similarity_weighted(self):
+        """Test the engine boosts neighbours' likes in similarity order."""
+        compute_user_neighbors(k=5)
+
+        boost = RecommendationEngine(self.alice)._collaborative_boost_map({})
+
+        assert boost[self.movies[3].id] == 1.0  # liked by bob, the closest neighbour
+        assert 0 < boost[self.movies[4].id] < 1.0  # rated highly by carol
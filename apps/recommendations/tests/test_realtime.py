@@ -0,0 +1,76 @@
+"""
+Tests for session-aware real-time recommendations.
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.favorites.models import Favorite
+from apps.movies.models import Movie, WatchHistory
+from apps.recommendations.models import Recommendation
+from apps.recommendations.services.realtime import SessionRecommender
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestSessionRecommender:
+    """Test blending of session candidates into stored recommendations."""
+
+    def setup_method(self):
+        """Create movies, co-favourite history and a viewer."""
+        self.movies = [
+            Movie.objects.create(tmdb_id=4000 + i, title=f'Movie {i}', vote_count=100)
+            for i in range(5)
+        ]
+        fan = User.objects.create_user(
+            username='fan', email='fan@example.com', password='TestPass123!@#'
+        )
+        for i in (0, 1, 2):
+            Favorite.objects.create(user=fan, movie=self.movies[i])
+
+        self.user = User.objects.create_user(
+            username='viewer', email='viewer@example.com', password='TestPass123!@#'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_no_session_returns_stored_items(self):
+        """Test the stored list is untouched without recent views."""
+        stored = [{'movie': self.movies[3].id, 'score': 0.5}]
+
+        assert SessionRecommender(self.user).blend(stored) == stored
+
+    def test_recent_views_inject_neighbours(self):
+        """Test co-favourited neighbours of a watched movie enter the feed."""
+        WatchHistory.objects.create(user=self.user, movie=self.movies[0])
+        stored = [
+            {'movie': self.movies[3].id, 'score': 0.8},
+            {'movie': self.movies[1].id, 'score': 0.2},
+        ]
+
+        blended = SessionRecommender(self.user).blend(stored, limit=5)
+        by_movie = {item['movie']: item for item in blended}
+
+        assert self.movies[0].id not in by_movie  # the watched movie itself
+        assert by_movie[self.movies[1].id]['score'] > 0.2  # stored item boosted
+        assert by_movie[self.movies[2].id]['recommendation_type'] == 'session'
+
+    def test_list_endpoint_blends_session(self):
+        """Test the feed endpoint reacts to a recorded view."""
+        Recommendation.objects.create(
+            user=self.user, movie=self.movies[4], score=0.9, reason='Stored'
+        )
+        Recommendation.objects.create(
+            user=self.user, movie=self.movies[3], score=0.1, reason='Stored'
+        )
+        watched_url = reverse('api_v1:movies:movie-watched', args=[self.movies[0].id])
+        response = self.client.post(watched_url)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = self.client.get(reverse('api_v1:recommendations:recommendation-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        movie_ids = [item['movie'] for item in response.data]
+        assert len(movie_ids) == 2  # feed length follows the stored list
+        assert movie_ids[0] == self.movies[4].id
+        assert movie_ids[1] == self.movies[1].id  # session item displaces the weakest
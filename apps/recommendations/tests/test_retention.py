@@ -0,0 +1,124 @@
+"""
+Tests for recommendation retention and compaction.
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.movies.models import Movie
+from apps.recommendations.models import (
+    FeedbackAggregate,
+    Recommendation,
+    RecommendationFeedback,
+    SuppressedMovie,
+)
+from apps.recommendations.services.retention import RetentionPolicy
+from apps.recommendations.services.warmup import payload_key
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestRetention:
+    """Test the cap, inactivity purge and feedback archive passes."""
+
+    def setup_method(self):
+        """Create an active user with five recommendations."""
+        self.policy = RetentionPolicy(
+            max_per_type=3, inactive_days=30, feedback_days=30, batch_size=2, pause=0,
+        )
+        self.user = User.objects.create_user(
+            username='keeper', email='keeper@example.com', password='TestPass123!@#'
+        )
+        User.objects.filter(pk=self.user.pk).update(last_login=timezone.now())
+        self.movies = [Movie.objects.create(tmdb_id=8000 + i, title=f'Movie {i}') for i in range(5)]
+        self.recs = [
+            Recommendation.objects.create(
+                user=self.user, movie=movie, recommendation_type='content_based', score=i / 10,
+            )
+            for i, movie in enumerate(self.movies)
+        ]
+
+    def test_cap_keeps_best_scored_rows(self):
+        """Test each user/type keeps only its top rows."""
+        assert self.policy.cap_recommendations() == 2
+
+        kept = Recommendation.objects.filter(user=self.user).values_list('score', flat=True)
+        assert sorted(kept) == [0.2, 0.3, 0.4]
+
+    def test_trimmed_users_lose_their_cached_feed(self, django_capture_on_commit_callbacks):
+        """Test the cap evicts the cached payload of users it trimmed."""
+        cache.set(payload_key(self.user.pk), ['stale'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.policy.cap_recommendations()
+
+        assert cache.get(payload_key(self.user.pk)) is None
+
+    def test_explicit_zero_is_not_the_default(self):
+        """Test a zero override is honoured instead of falling back to settings."""
+        policy = RetentionPolicy(max_per_type=0, pause=0)
+
+        assert policy.max_per_type == 0
+        assert policy.cap_recommendations() == 5
+
+    def test_inactive_users_are_purged(self, django_capture_on_commit_callbacks):
+        """Test stored recommendations of long-absent users are deleted in batches."""
+        idle = User.objects.create_user(
+            username='idle', email='idle@example.com', password='TestPass123!@#'
+        )
+        User.objects.filter(pk=idle.pk).update(last_login=timezone.now() - timedelta(days=60))
+        for movie in self.movies:
+            Recommendation.objects.create(user=idle, movie=movie, score=0.5)
+
+        cache.set(payload_key(idle.pk), ['stale'])
+        cache.set(payload_key(self.user.pk), ['kept'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert self.policy.purge_inactive_users() == 5
+
+        assert cache.get(payload_key(idle.pk)) is None
+        assert cache.get(payload_key(self.user.pk)) == ['kept']
+
+        assert not Recommendation.objects.filter(user=idle).exists()
+        assert Recommendation.objects.filter(user=self.user).count() == 5
+
+    def test_token_refresh_counts_as_activity(self, settings):
+        """Test a user who only refreshes tokens is not purged as inactive."""
+        settings.RECOMMENDATION_JOB_BACKEND = 'inline'
+        User.objects.filter(pk=self.user.pk).update(
+            last_login=timezone.now() - timedelta(days=60)
+        )
+        refresh = str(RefreshToken.for_user(self.user))
+
+        response = APIClient().post(
+            reverse('api_v1:users:token_refresh'), {'refresh': refresh}, format='json'
+        )
+
+        assert response.status_code == 200
+        assert self.policy.purge_inactive_users() == 0
+        assert Recommendation.objects.filter(user=self.user).count() == 5
+
+    def test_old_feedback_is_archived(self):
+        """Test old feedback becomes daily counts while suppressions survive."""
+        old_day = timezone.now() - timedelta(days=40)
+        for rec, feedback_type in zip(self.recs, ['like', 'dislike', 'dislike']):
+            feedback = RecommendationFeedback.objects.create(
+                user=self.user, recommendation=rec, movie=rec.movie, feedback_type=feedback_type,
+            )
+            RecommendationFeedback.objects.filter(pk=feedback.pk).update(created_at=old_day)
+        SuppressedMovie.objects.create(user=self.user, movie=self.movies[1])
+        recent = RecommendationFeedback.objects.create(
+            user=self.user, recommendation=self.recs[3], movie=self.movies[3], feedback_type='like',
+        )
+
+        assert self.policy.archive_feedback() == 3
+
+        assert list(RecommendationFeedback.objects.values_list('id', flat=True)) == [recent.id]
+        counts = dict(FeedbackAggregate.objects.values_list('feedback_type', 'count'))
+        assert counts == {'like': 1, 'dislike': 2}
+        assert FeedbackAggregate.objects.filter(recommendation_type='content_based').count() == 2
+        assert SuppressedMovie.objects.filter(user=self.user).count() == 1
@@ -0,0 +1,74 @@
+"""
+Tests for the durable "not interested" suppression list.
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.movies.models import Movie
+from apps.recommendations.models import Recommendation, RecommendationFeedback, SuppressedMovie
+from apps.recommendations.services.recommendation_engine import RecommendationEngine
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestSuppression:
+    """Test that dismissals survive recommendation refreshes."""
+
+    def setup_method(self):
+        """Create a user and a small catalogue."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='picky', email='picky@example.com', password='TestPass123!@#'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.movies = [
+            Movie.objects.create(
+                tmdb_id=6000 + i, title=f'Movie {i}',
+                vote_count=100, vote_average=7.0, popularity=90.0 - i,
+            )
+            for i in range(4)
+        ]
+
+    def test_dismissal_survives_refresh(self):
+        """Test a not_interested movie never comes back after regeneration."""
+        RecommendationEngine(self.user).generate_recommendations(limit=4)
+        rec = Recommendation.objects.get(user=self.user, movie=self.movies[0])
+
+        response = self.client.post(
+            reverse('api_v1:recommendations:recommendation-feedback'),
+            {'recommendation': rec.id, 'feedback_type': 'not_interested'},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert SuppressedMovie.objects.filter(user=self.user, movie=self.movies[0]).exists()
+
+        RecommendationEngine(self.user).generate_recommendations(limit=4)
+        RecommendationEngine(self.user).generate_recommendations(limit=4)
+
+        recommended = set(
+            Recommendation.objects.filter(user=self.user).values_list('movie_id', flat=True)
+        )
+        assert self.movies[0].id not in recommended
+        feedback = RecommendationFeedback.objects.get(user=self.user)
+        assert feedback.movie_id == self.movies[0].id
+        assert feedback.recommendation_id is None
+
+    def test_refresh_keeps_surviving_rows(self):
+        """Test unchanged recommendations are updated in place, not recreated."""
+        RecommendationEngine(self.user).generate_recommendations(limit=4)
+        rec = Recommendation.objects.get(user=self.user, movie=self.movies[1])
+        Recommendation.objects.filter(id=rec.id).update(is_clicked=True)
+
+        RecommendationEngine(self.user).generate_recommendations(limit=4)
+
+        rec.refresh_from_db()
+        assert rec.is_clicked is True
+
+    def test_like_lifts_suppression(self):
+        """Test changing feedback to like removes the suppression."""
+        rec = Recommendation.objects.create(user=self.user, movie=self.movies[2], score=0.5)
+        url = reverse('api_v1:recommendations:recommendation-feedback')
+        self.client.post(url, {'recommendation': rec.id, 'feedback_type': 'dislike'})
+        self.client.post(url, {'recommendation': rec.id, 'feedback_type': 'like'})
+
+        assert not SuppressedMovie.objects.filter(user=self.user).exists()
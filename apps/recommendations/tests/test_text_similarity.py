@@ -0,0 +1,141 @@
+"""
+Tests for overview-text content similarity.
+"""
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from apps.favorites.models import Favorite
+from apps.movies.models import Movie
+from apps.recommendations.services import text_similarity
+from apps.recommendations.services.artifacts import KEEP_VERSIONS, ArtifactRegistry
+from apps.recommendations.services.recommendation_engine import RecommendationEngine
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+class TestTextSimilarity:
+    """Test hashed TF-IDF neighbours and their use by the engine."""
+
+    @pytest.fixture(autouse=True)
+    def _registry(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            text_similarity, 'registry', ArtifactRegistry(root=tmp_path, check_interval=0)
+        )
+
+    def setup_method(self):
+        """Create movies with two clearly different kinds of plot."""
+        def movie(tmdb_id, title, overview):
+            return Movie.objects.create(
+                tmdb_id=tmdb_id, title=title, overview=overview,
+                vote_count=100, vote_average=6.0, popularity=10.0,
+            )
+
+        self.heist = movie(1, 'Heist', 'A crew of thieves plans a daring bank heist in Paris.')
+        self.heist2 = movie(2, 'Heist 2', 'Veteran thieves reunite for one last bank heist.')
+        self.space = movie(3, 'Space', 'Astronauts stranded on Mars fight to survive.')
+        self.space2 = movie(4, 'Space 2', 'A lone astronaut must survive alone on Mars.')
+        self.silent = movie(5, 'Silent', '')
+
+    def test_neighbours_follow_overview_text(self):
+        """Test each movie's nearest neighbour shares its plot vocabulary."""
+        stats = text_similarity.rebuild_text_neighbors(k=2)
+
+        assert stats['movies'] == 4  # movies without text are skipped
+        assert text_similarity.similar_movie_ids(self.heist.id)[0][0] == self.heist2.id
+        assert text_similarity.similar_movie_ids(self.space.id)[0][0] == self.space2.id
+        assert text_similarity.similar_movie_ids(self.silent.id) == []
+
+    def test_new_movies_are_added_incrementally(self):
+        """Test add_movies gives new movies neighbours and updates existing lists."""
+        text_similarity.rebuild_text_neighbors(k=2)
+        sequel = Movie.objects.create(
+            tmdb_id=6, title='Heist 3', overview='The thieves plan a bank heist in Rome.',
+        )
+
+        assert text_similarity.add_movies([sequel.id, self.heist.id]) == 1
+
+        assert text_similarity.similar_movie_ids(sequel.id)[0][0] in {self.heist.id, self.heist2.id}
+        assert sequel.id in {mid for mid, _ in text_similarity.similar_movie_ids(self.heist.id)}
+
+    def test_update_folds_new_and_hydrated_movies(self):
+        """Test the periodic update picks up rows saved since the last publish."""
+        text_similarity.rebuild_text_neighbors(k=2)
+        sequel = Movie.objects.create(
+            tmdb_id=6, title='Heist 3', overview='The thieves plan a bank heist in Rome.',
+        )
+        # A stub imported without text and hydrated later is saved as an update
+        self.silent.overview = 'Astronauts survive a storm on Mars.'
+        self.silent.save()
+
+        stats = text_similarity.update_text_neighbors()
+
+        assert stats['added'] == 2
+        assert sequel.id in {mid for mid, _ in text_similarity.similar_movie_ids(self.heist.id)}
+        assert text_similarity.similar_movie_ids(self.silent.id)
+        assert text_similarity.update_text_neighbors()['added'] == 0
+
+    def test_command_incremental_mode_folds_new_movies(self):
+        """Test rebuild_text_neighbors --incremental adds movies without a full rebuild."""
+        out = StringIO()
+        call_command('rebuild_text_neighbors', incremental=True, stdout=out)
+        assert 'run a full rebuild first' in out.getvalue()
+
+        text_similarity.rebuild_text_neighbors(k=2)
+        sequel = Movie.objects.create(
+            tmdb_id=6, title='Heist 3', overview='The thieves plan a bank heist in Rome.',
+        )
+        command = 'apps.recommendations.management.commands.rebuild_text_neighbors'
+        with mock.patch(f'{command}.rebuild_text_neighbors') as rebuild:
+            call_command('rebuild_text_neighbors', incremental=True, stdout=out)
+
+        rebuild.assert_not_called()
+        assert '1 movies folded' in out.getvalue()
+        assert sequel.id in {mid for mid, _ in text_similarity.similar_movie_ids(self.heist.id)}
+
+    def test_update_skips_when_base_version_is_not_current(self):
+        """Test an update never activates over a version it did not start from."""
+        text_similarity.rebuild_text_neighbors(k=2)
+        base = text_similarity.registry.get(text_similarity.ARTIFACT_NAME)
+        text_similarity.rebuild_text_neighbors(k=2)
+        newest = text_similarity.registry.current_version(text_similarity.ARTIFACT_NAME)
+        Movie.objects.create(tmdb_id=6, title='Heist 3', overview='Thieves plan a heist.')
+
+        with mock.patch.object(text_similarity.registry, 'get', return_value=base):
+            assert text_similarity.update_text_neighbors()['added'] == 0
+
+        assert text_similarity.registry.current_version(text_similarity.ARTIFACT_NAME) == newest
+
+    def test_update_skips_while_another_publish_holds_the_lock(self):
+        """Test overlapping publishers do not run concurrently."""
+        text_similarity.rebuild_text_neighbors(k=2)
+        Movie.objects.create(tmdb_id=6, title='Heist 3', overview='Thieves plan a heist.')
+        cache.add(text_similarity.PUBLISH_LOCK_KEY, True)
+
+        assert text_similarity.update_text_neighbors()['added'] == 0
+
+    def test_old_versions_are_pruned_after_publishing(self):
+        """Test repeated publishes keep a bounded number of versions on disk."""
+        for _ in range(KEEP_VERSIONS + 2):
+            text_similarity.rebuild_text_neighbors(k=2)
+
+        versions = text_similarity.registry.versions(text_similarity.ARTIFACT_NAME)
+        assert len(versions) == KEEP_VERSIONS
+
+    def test_engine_uses_text_neighbours(self):
+        """Test similar movies and the content signal read the artifact."""
+        text_similarity.rebuild_text_neighbors(k=2)
+        user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='TestPass123!@#'
+        )
+        Favorite.objects.create(user=user, movie=self.space)
+        engine = RecommendationEngine(user)
+
+        similar = engine.get_similar_movies(self.heist.id, limit=1)
+        recs = engine.generate_recommendations(limit=1, persist=False)
+
+        assert similar == [self.heist2]
+        assert recs[0]['movie'] == self.space2
+        assert 'Similar story' in recs[0]['reason']
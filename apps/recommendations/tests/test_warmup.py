@@ -0,0 +1,104 @@
+"""
+Tests for the recommendation payload cache and login warm-up.
+"""
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.movies.models import Movie
+from apps.recommendations.models import Recommendation, RecommendationJob
+from apps.recommendations.services import warmup
+from apps.recommendations.services.recommendation_engine import RecommendationEngine
+from apps.users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWarmUp:
+    """Test that login and token refresh prepare the feed in the background."""
+
+    @pytest.fixture(autouse=True)
+    def _inline_jobs(self, settings):
+        settings.RECOMMENDATION_JOB_BACKEND = 'inline'
+
+    def setup_method(self):
+        """Create a user and a small catalogue."""
+        self.client = APIClient()
+        self.password = 'TestPass123!@#'
+        self.user = User.objects.create_user(
+            username='early', email='early@example.com', password=self.password
+        )
+        self.movies = [
+            Movie.objects.create(
+                tmdb_id=9000 + i, title=f'Movie {i}',
+                vote_count=100, vote_average=6.0, popularity=10.0 + i,
+            )
+            for i in range(3)
+        ]
+        self.login_url = reverse('api_v1:users:user-login')
+
+    def _login(self):
+        return self.client.post(
+            self.login_url, {'email': self.user.email, 'password': self.password}, format='json'
+        )
+
+    def test_login_generates_and_caches_feed(self):
+        """Test login with nothing stored runs a refresh job and caches its payload."""
+        response = self._login()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert RecommendationJob.objects.get(user=self.user).status == 'succeeded'
+        cached = warmup.cache.get(warmup.payload_key(self.user.pk))
+        assert len(cached) == 3
+
+        self.user.refresh_from_db()
+        assert self.user.last_login is not None
+
+    def test_warm_up_is_rate_limited(self):
+        """Test repeated logins within the interval schedule a single warm-up."""
+        assert warmup.schedule_warm_up(self.user) is True
+        assert warmup.schedule_warm_up(self.user) is False
+
+    def test_fresh_feed_is_only_cached(self):
+        """Test a fresh stored feed is re-cached without queueing a job."""
+        Recommendation.objects.create(user=self.user, movie=self.movies[0], score=0.5)
+
+        assert warmup.warm_up(self.user.pk) == 'cached'
+        assert not RecommendationJob.objects.exists()
+
+        Recommendation.objects.filter(user=self.user).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+        assert warmup.warm_up(self.user.pk) == 'refresh_queued'
+
+    def test_token_refresh_schedules_warm_up(self):
+        """Test a successful token refresh warms the refreshed user's feed."""
+        tokens = self._login().data['tokens']
+        warmup.cache.clear()
+
+        response = self.client.post(
+            reverse('api_v1:users:token_refresh'), {'refresh': tokens['refresh']}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert warmup.cache.get(warmup.warmup_key(self.user.pk)) is True
+
+    def test_list_serves_cached_payload_until_recommendations_change(
+        self, django_assert_max_num_queries,
+    ):
+        """Test the list endpoint reuses the cached payload and sees new saves."""
+        Recommendation.objects.create(user=self.user, movie=self.movies[0], score=0.5)
+        self.client.force_authenticate(user=self.user)
+        url = reverse('api_v1:recommendations:recommendation-list')
+        self.client.get(url)
+
+        with django_assert_max_num_queries(2):  # session lookups only
+            response = self.client.get(url)
+        assert [item['movie'] for item in response.data] == [self.movies[0].id]
+
+        RecommendationEngine(self.user).generate_recommendations(limit=3)
+
+        response = self.client.get(url)
+        assert len(response.data) == 3
@@ -1,17 +1,43 @@
 """Recommendation views."""
+from django.conf import settings
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status, mixins
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from .models import Recommendation, RecommendationFeedback
-from .serializers import RecommendationSerializer, RecommendationFeedbackSerializer
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from .models import Recommendation, RecommendationFeedback, RecommendationJob
+from .serializers import (
+    EngagementBatchSerializer,
+    RecommendationSerializer,
+    RecommendationFeedbackSerializer,
+    RecommendationJobSerializer,
+)
+from .services import engine_registry
+from .services.engagement import engagement_buffer
+from .services.jobs import enqueue_refresh
 from .services.recommendation_engine import RecommendationEngine
+from .services.realtime import SessionRecommender
+from .services.warmup import get_payload, stored_recommendations
 from apps.movies.serializers import MovieListSerializer
 
+# Set on responses whose recommendations were cut short by the deadline;
+# a full set is being generated in the background.
+PARTIAL_HEADER = 'X-Recommendations-Partial'
+
+
+ENGINE_PARAMETER = OpenApiParameter(
+    'engine', str, description='Registered engine to use (staff only; default: cohort)',
+)
+
 
 @extend_schema_view(
-    list=extend_schema(tags=['Recommendations'], summary='Get user recommendations'),
+    list=extend_schema(
+        tags=['Recommendations'],
+        summary='Get user recommendations',
+        parameters=[ENGINE_PARAMETER],
+    ),
 )
 class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for movie recommendations."""
@@ -19,42 +45,77 @@ class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Recommendation.objects.filter(
-            user=self.request.user
-        ).select_related('movie').order_by('-score', '-created_at')
+        return stored_recommendations(self.request.user)
 
     def list(self, request, *args, **kwargs):
-        """Get recommendations for user."""
-        # Check if we have recent recommendations
-        existing_recs = self.get_queryset()
+        """Get recommendations for user, blended with the current viewing session."""
+        # Stored recommendations, serialised once and cached per user
+        payload = get_payload(request.user)
 
-        if not existing_recs.exists():
-            # Generate new recommendations
-            engine = RecommendationEngine(request.user)
-            engine.generate_recommendations(limit=20)
-            existing_recs = self.get_queryset()
+        is_partial = False
+        if not payload:
+            # Generate new recommendations within the request's time budget
+            engine, _recs = engine_registry.generate(
+                request.user,
+                limit=20,
+                deadline=settings.RECOMMENDATION_REQUEST_DEADLINE,
+                engine_name=self._requested_engine(request),
+            )
+            is_partial = engine.is_partial
+            payload = get_payload(request.user)
 
-        serializer = self.get_serializer(existing_recs, many=True)
-        return Response(serializer.data)
+        response = Response(SessionRecommender(request.user).blend(payload))
+        if is_partial:
+            response[PARTIAL_HEADER] = 'true'
+        return response
 
     @extend_schema(
         tags=['Recommendations'],
         summary='Refresh recommendations',
-        responses={200: RecommendationSerializer(many=True)}
+        parameters=[ENGINE_PARAMETER],
+        request=None,
+        responses={202: RecommendationJobSerializer}
     )
     @action(detail=False, methods=['post'])
     def refresh(self, request):
-        """Force refresh recommendations."""
-        engine = RecommendationEngine(request.user)
-        engine.generate_recommendations(limit=20)
+        """
+        Queue a recommendation refresh.
+
+        Returns the job straight away; poll ``jobs/<id>/`` for progress
+        and the refreshed recommendations.
+        """
+        job = enqueue_refresh(
+            request.user, limit=20, engine=self._requested_engine(request) or '',
+        )
+        data = RecommendationJobSerializer(job).data
+        data['status_url'] = self.reverse_action('job-status', args=[job.pk])
+        return Response(data, status=status.HTTP_202_ACCEPTED)
 
-        recommendations = self.get_queryset()
-        serializer = self.get_serializer(recommendations, many=True)
+    @staticmethod
+    def _requested_engine(request):
+        """Engine explicitly chosen for this request (staff only), validated."""
+        name = request.query_params.get('engine')
+        if not name or not request.user.is_staff:
+            return None
+        if name not in engine_registry.engine_names():
+            raise ValidationError({'engine': f'Unknown engine "{name}".'})
+        return name
 
-        return Response({
-            'message': f'Generated {recommendations.count()} recommendations',
-            'recommendations': serializer.data
-        })
+    @extend_schema(
+        tags=['Recommendations'],
+        summary='Get refresh job status',
+        responses={200: RecommendationJobSerializer}
+    )
+    @action(
+        detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>\d+)', url_name='job-status'
+    )
+    def job_status(self, request, job_id=None):
+        """Report a refresh job's progress, with the recommendations once it succeeds."""
+        job = get_object_or_404(RecommendationJob, pk=job_id, user=request.user)
+        data = RecommendationJobSerializer(job).data
+        if job.status == 'succeeded':
+            data['recommendations'] = self.get_serializer(self.get_queryset(), many=True).data
+        return Response(data)
 
     @extend_schema(
         tags=['Recommendations'],
@@ -97,8 +158,48 @@ class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
         """List all feedback entries for the current user."""
         feedbacks = RecommendationFeedback.objects.filter(
             user=request.user
-        ).select_related('recommendation__movie').order_by('-created_at')
+        ).select_related('movie').order_by('-created_at')
 
         serializer = RecommendationFeedbackSerializer(feedbacks, many=True)
         return Response(serializer.data)
 
+    # ── Engagement beacons ──────────────────────────────────────────
+    @extend_schema(
+        tags=['Recommendations'],
+        summary='Report impressions / clicks on recommendations',
+        request=EngagementBatchSerializer,
+        responses={202: {'type': 'object', 'properties': {
+            'accepted': {'type': 'integer'}, 'ignored': {'type': 'integer'},
+        }}},
+    )
+    @action(detail=False, methods=['post'])
+    def events(self, request):
+        """
+        Accept a batch of engagement events.
+
+        Events are buffered in memory and written in bulk, so this
+        endpoint costs one read query per batch regardless of its size.
+        """
+        serializer = EngagementBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        events = serializer.validated_data['events']
+
+        rec_types = dict(
+            Recommendation.objects
+            .filter(
+                user=request.user,
+                id__in={e['recommendation'] for e in events if e['recommendation']},
+            )
+            .values_list('id', 'recommendation_type')
+        )
+        accepted = [
+            (e['recommendation'], rec_types[e['recommendation']], e['event'])
+            for e in events
+            if e['recommendation'] in rec_types
+        ]
+        engagement_buffer.record(accepted)
+
+        return Response(
+            {'accepted': len(accepted), 'ignored': len(events) - len(accepted)},
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -1,7 +1,7 @@
 """User URL configuration."""
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
+from rest_framework_simplejwt.views import TokenVerifyView
 from . import views
 
 app_name = 'users'
@@ -15,6 +15,6 @@ urlpatterns = [
     path('', include(router.urls)),
 
     # JWT Token endpoints
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', views.WarmingTokenRefreshView.as_view(), name='token_refresh'),
     path('token/verify/', TokenVerifyView.as_view(), name='token_verify'),
 ]
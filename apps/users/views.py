@@ -3,9 +3,12 @@ from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.views import TokenRefreshView
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 from .models import User, UserProfile
 from .serializers import (
@@ -16,6 +19,7 @@ from .serializers import (
     ChangePasswordSerializer,
     LoginSerializer
 )
+from apps.recommendations.services.warmup import schedule_warm_up
 
 
 @extend_schema_view(
@@ -86,6 +90,10 @@ class UserViewSet(viewsets.ModelViewSet):
 
         user = serializer.validated_data['user']
         refresh = RefreshToken.for_user(user)
+        update_last_login(None, user)
+
+        # Have the recommendation feed ready by the time the client asks
+        schedule_warm_up(user)
 
         return Response({
             'message': 'Login successful',
@@ -217,3 +225,22 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data)
+
+
+class WarmingTokenRefreshView(TokenRefreshView):
+    """
+    Token refresh that records activity and warms the user's recommendations
+    in the background. Clients stay signed in through refreshes alone, so
+    ``last_login`` is bumped here too (retention treats it as last seen).
+    """
+
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            # The old refresh token may already be blacklisted; read the new access token
+            user_id = AccessToken(response.data['access']).get(jwt_settings.USER_ID_CLAIM)
+            user = User.objects.filter(pk=user_id).first()
+            if user is not None:
+                update_last_login(None, user)
+                schedule_warm_up(user)
+        return response
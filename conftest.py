@@ -67,3 +67,10 @@ def authenticated_client(api_client, create_user_with_profile):
     api_client.force_authenticate(user=user)
     api_client.user = user
     return api_client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache (LocMem outlives test transactions)."""
+    from django.core.cache import cache
+    cache.clear()
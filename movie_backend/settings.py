@@ -265,6 +265,76 @@ SPECTACULAR_SETTINGS = {
 TMDB_API_KEY = config('TMDB_API_KEY', default='')
 TMDB_BASE_URL = 'https://api.themoviedb.org/3'
 TMDB_IMAGE_BASE_URL = 'https://image.tmdb.org/t/p'
-
-# ML Model Configuration (for later)
+# Process-wide request budget shared by every TMDb call (requests/second,
+# burst size), and the default worker count for sync_tmdb.
+TMDB_RATE_LIMIT = config('TMDB_RATE_LIMIT', default=40.0, cast=float)
+TMDB_RATE_BURST = config('TMDB_RATE_BURST', default=20, cast=int)
+TMDB_FETCH_CONCURRENCY = config('TMDB_FETCH_CONCURRENCY', default=8, cast=int)
+# Circuit breaker around TMDb calls: open on this failure (or slow-call)
+# rate, then skip upstream for OPEN_SECONDS before a half-open probe.
+# Proxy endpoints answer from the local catalogue meanwhile.
+TMDB_REQUEST_TIMEOUT = config('TMDB_REQUEST_TIMEOUT', default=10.0, cast=float)
+TMDB_BREAKER_FAILURE_RATE = config('TMDB_BREAKER_FAILURE_RATE', default=0.5, cast=float)
+TMDB_BREAKER_SLOW_CALL_SECONDS = config('TMDB_BREAKER_SLOW_CALL_SECONDS', default=3.0, cast=float)
+TMDB_BREAKER_OPEN_SECONDS = config('TMDB_BREAKER_OPEN_SECONDS', default=30.0, cast=float)
+# Movie search answers from the local catalogue when it has at least this
+# many strong matches (title contains every term or closely resembles the
+# query), and only asks TMDb otherwise.
+LOCAL_SEARCH_MIN_RESULTS = config('LOCAL_SEARCH_MIN_RESULTS', default=5, cast=int)
+# Probabilistic early refresh of hot TMDb cache entries (XFetch beta;
+# higher refreshes earlier, 0 disables). See services/tmdb_cache.py.
+TMDB_CACHE_EARLY_REFRESH_BETA = config('TMDB_CACHE_EARLY_REFRESH_BETA', default=1.0, cast=float)
+# Background persistence of TMDb payloads served by the movie endpoints:
+# 'thread' (bounded per-process worker) or 'inline' (synchronous).
+MOVIE_PERSIST_BACKEND = config('MOVIE_PERSIST_BACKEND', default='thread')
+MOVIE_PERSIST_MAX_PENDING = config('MOVIE_PERSIST_MAX_PENDING', default=5000, cast=int)
+MOVIE_PERSIST_BATCH_SIZE = config('MOVIE_PERSIST_BATCH_SIZE', default=500, cast=int)
+MOVIE_PERSIST_FLUSH_INTERVAL = config('MOVIE_PERSIST_FLUSH_INTERVAL', default=1.0, cast=float)
+MOVIE_PERSIST_DRAIN_TIMEOUT = config('MOVIE_PERSIST_DRAIN_TIMEOUT', default=10.0, cast=float)
+
+# ML Model Configuration
+# Versioned, memory-mapped artifacts (see apps/recommendations/services/artifacts.py)
 ML_MODELS_DIR = BASE_DIR / 'ml' / 'models'
+
+# Recommendation engine
+# Time budget (seconds) for recommendations generated inside a request;
+# slower runs return partial results and finish in the background.
+RECOMMENDATION_REQUEST_DEADLINE = config('RECOMMENDATION_REQUEST_DEADLINE', default=2.0, cast=float)
+# Where refresh jobs run: 'celery' (dedicated workers), 'thread' (local
+# worker pool, no broker needed) or 'inline' (synchronous).
+RECOMMENDATION_JOB_BACKEND = config('RECOMMENDATION_JOB_BACKEND', default='thread')
+RECOMMENDATION_JOB_WORKERS = config('RECOMMENDATION_JOB_WORKERS', default=2, cast=int)
+# Active jobs without progress for this many seconds are treated as lost
+RECOMMENDATION_JOB_STALE_AFTER = config('RECOMMENDATION_JOB_STALE_AFTER', default=600, cast=int)
+# Serialised feed cache, and login / token-refresh warm-up: stored
+# recommendations older than RECOMMENDATION_STALE_AFTER_HOURS are
+# regenerated in the background, at most once per warm-up interval.
+RECOMMENDATION_PAYLOAD_CACHE_TTL = config('RECOMMENDATION_PAYLOAD_CACHE_TTL', default=600, cast=int)
+RECOMMENDATION_STALE_AFTER_HOURS = config('RECOMMENDATION_STALE_AFTER_HOURS', default=24, cast=int)
+RECOMMENDATION_WARMUP_INTERVAL = config('RECOMMENDATION_WARMUP_INTERVAL', default=300, cast=int)
+# Retention job (apply_retention): per-(user, type) row cap, inactivity
+# purge, feedback archiving, and batch throttling.
+RECOMMENDATION_MAX_PER_TYPE = config('RECOMMENDATION_MAX_PER_TYPE', default=50, cast=int)
+RECOMMENDATION_INACTIVE_DAYS = config('RECOMMENDATION_INACTIVE_DAYS', default=180, cast=int)
+FEEDBACK_ARCHIVE_DAYS = config('FEEDBACK_ARCHIVE_DAYS', default=365, cast=int)
+RETENTION_BATCH_SIZE = config('RETENTION_BATCH_SIZE', default=1000, cast=int)
+RETENTION_BATCH_PAUSE = config('RETENTION_BATCH_PAUSE', default=0.1, cast=float)
+# Engine registry: name -> engine class. Cohorts route a percentage of
+# users to other engines ("fast:10,experimental:5"); a shadow engine runs
+# on a sample of generations for comparison (see compare_engines).
+RECOMMENDATION_ENGINES = {
+    'default': 'apps.recommendations.services.recommendation_engine.RecommendationEngine',
+}
+RECOMMENDATION_ENGINE_DEFAULT = config('RECOMMENDATION_ENGINE_DEFAULT', default='default')
+RECOMMENDATION_ENGINE_COHORTS = config(
+    'RECOMMENDATION_ENGINE_COHORTS',
+    default='',
+    cast=lambda v: {
+        name.strip(): int(percent)
+        for name, percent in (entry.split(':') for entry in v.split(',') if entry.strip())
+    }
+)
+RECOMMENDATION_SHADOW_ENGINE = config('RECOMMENDATION_SHADOW_ENGINE', default='')
+RECOMMENDATION_SHADOW_SAMPLE_RATE = config(
+    'RECOMMENDATION_SHADOW_SAMPLE_RATE', default=0.01, cast=float
+)